@@ -2,3 +2,4 @@
 
 from .weather import set_weather
 from .time import set_time
+from .reorder import reorder
@@ -0,0 +1,111 @@
+# coding=utf-8
+
+import glob
+import json
+import os
+import time
+
+import click
+
+from emft.core.logging import make_logger
+from emft.core.path import Path
+from emft.core.progress import Progress
+from emft.core.threadpool import get_process_executor
+from emft.miz.miz import Miz
+from emft.miz.reorder_ledger import ReorderLedger
+
+LOGGER = make_logger(__name__)
+
+
+def _find_miz_files(source: str) -> list:
+    if os.path.isdir(source):
+        source = os.path.join(source, '*.miz')
+    return sorted(
+        str(Path(x).abspath()) for x in glob.glob(source, recursive=True)
+        if os.path.isfile(x) and x.lower().endswith('.miz')
+    )
+
+
+def _reorder_one(miz_file: str, target_dir: str, skip_options_file: bool) -> dict:
+    result = {
+        'from': miz_file,
+        'to': target_dir,
+    }
+    start = time.perf_counter()
+    try:
+        report = Miz.reorder(miz_file, target_dir, skip_options_file)
+    except Exception:
+        LOGGER.exception(f'failed to reorder: {miz_file}')
+        # Workers are re-used for the next files, do not leave a progress started by the failed one behind
+        if Progress.started:
+            Progress.done()
+        result['status'] = 'failed'
+        result['error'] = f'unable to reorder {miz_file}, please check the log'
+    else:
+        result['status'] = 'success'
+        result['files_copied'] = len(report.files_copied)
+        result['bytes_copied'] = report.bytes_copied
+        result['files_deleted'] = len(report.files_deleted)
+    result['duration'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _reorder(source: str, output_dir: str, skip_options_file: bool, jobs: int, force: bool = False) -> dict:
+    start = time.perf_counter()
+    miz_files = _find_miz_files(source)
+    LOGGER.debug(f'found {len(miz_files)} MIZ file(s) in {source}')
+
+    # Each MIZ file is mirrored in its own sub-folder of the output directory
+    target_dirs = [os.path.join(output_dir, os.path.splitext(os.path.basename(x))[0]) for x in miz_files]
+    if len(set(target_dirs)) != len(target_dirs):
+        raise click.BadParameter('several MIZ files have the same name', param_hint='SOURCE')
+
+    # The ledger is only read and written here, worker processes never touch it
+    ledger = ReorderLedger()
+    entries = [ReorderLedger.make_entry(x, y, skip_options_file) for x, y in zip(miz_files, target_dirs)]
+    results = {}
+    todo = []
+    for miz_file, target_dir, entry in zip(miz_files, target_dirs, entries):
+        if not force and ledger.is_up_to_date(entry):
+            LOGGER.debug(f'skipping unchanged MIZ file: {miz_file}')
+            results[miz_file] = {'from': miz_file, 'to': target_dir, 'status': 'skipped', 'duration': 0}
+        else:
+            todo.append((miz_file, target_dir, entry))
+
+    args = ([x[0] for x in todo], [x[1] for x in todo], [skip_options_file] * len(todo))
+    if jobs == 1 or len(todo) < 2:
+        done = list(map(_reorder_one, *args))
+    else:
+        done = list(get_process_executor(jobs).map(_reorder_one, *args))
+
+    for (miz_file, _, entry), result in zip(todo, done):
+        results[miz_file] = result
+        if result['status'] == 'success':
+            ledger.record(entry)
+
+    results = [results[x] for x in miz_files]
+    return {
+        'source': source,
+        'output_dir': output_dir,
+        'total': len(results),
+        'success': len([x for x in results if x['status'] == 'success']),
+        'skipped': len([x for x in results if x['status'] == 'skipped']),
+        'failed': len([x for x in results if x['status'] == 'failed']),
+        'duration': round(time.perf_counter() - start, 3),
+        'files': results,
+    }
+
+
+@click.command(help='Reorders all MIZ files matching SOURCE (a folder or a glob pattern) into OUTPUT_DIR')
+@click.argument('source', type=str)
+@click.argument('output_dir', type=click.Path(file_okay=False, writable=True))
+@click.option('-s', '--skip-options-file', is_flag=True, help='Do not write the "options" file')
+@click.option('-f', '--force', is_flag=True, help='Reorder files even if they did not change since the last reorder')
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=os.cpu_count() or 1, show_default=True,
+              help='Number of worker processes')
+@click.pass_context
+def reorder(ctx, source, output_dir, skip_options_file, force, jobs):
+    summary = _reorder(source, output_dir, skip_options_file, jobs, force)
+    click.secho(json.dumps(summary, indent=2))
+    if summary['failed']:
+        ctx.exit(1)
@@ -1,15 +1,27 @@
 # coding=utf-8
 
+import datetime
+
 import click
 
+from emft.miz.mission_time import MissionTime
 
-@click.command(help='test')
-def _set_time():
-    pass
+
+def _set_time(time, date, in_file, out_file):
+    now = datetime.datetime.now()
+    moment = datetime.datetime.strptime(
+        '{} {}'.format(date or now.strftime('%d/%m/%Y'), time or now.strftime('%H:%M:%S')), '%d/%m/%Y %H:%M:%S'
+    )
+    MissionTime(moment).apply_to_miz(in_file, out_file)
+    return moment.strftime('%d/%m/%Y %H:%M:%S')
 
 
 @click.command(help='test')
-@click.option('-t', '--time', help='Time of day', type=str, required=False)
-@click.option('-d', '--date', help='Date', required=False)
-def set_time(time, date):
-    click.secho(_set_time(time, date))
+@click.option('-t', '--time', help='Time of day (HH:MM:SS, defaults to now)', type=str, required=False)
+@click.option('-d', '--date', help='Date (DD/MM/YYYY, defaults to today)', required=False)
+@click.option('-i', '--in-file', help='Mission file to update', required=True,
+              type=click.Path(exists=True, dir_okay=False, readable=True))
+@click.option('-o', '--out-file', help='Mission file to write (defaults to same file)', required=False,
+              type=click.Path(dir_okay=False, writable=True))
+def set_time(time, date, in_file, out_file):
+    click.secho(_set_time(time, date, in_file, out_file))
@@ -22,6 +22,8 @@ LINK_REPO = r'''https://github.com/132nd-etcher/EMFT'''
 
 PATH_LOG_FILE = 'emft.debug'
 PATH_CONFIG_FILE = 'emft.config'
+PATH_REORDER_LEDGER_FILE = 'emft.reorder'
+PATH_MIRROR_MANIFESTS_DIR = 'emft.mirror'
 
 APP_SHORT_NAME = 'EMFT'
 APP_FULL_NAME = 'Etcher\'s Mission Files Tools'
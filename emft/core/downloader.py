@@ -2,6 +2,7 @@
 
 import hashlib
 import os
+import tempfile
 import time
 
 import certifi
@@ -10,24 +11,29 @@ import urllib3
 
 from emft.core.logging import make_logger
 from emft.core.progress import Progress
-from emft.core.threadpool import ThreadPool
 
 LOGGER = make_logger(__name__)
 
 
-def get_hash(data, method: str = 'md5'):
-    if not isinstance(data, bytes):
-        data = bytes(data, 'utf-8')
-
+def _new_hash(method: str = 'md5'):
     try:
         func = getattr(hashlib, method)
     except AttributeError:
         raise RuntimeError('cannot find method "{}" in hashlib'.format(method))
     else:
-        hash_ = func(data).hexdigest()
-        LOGGER.debug('hash for binary data: %s', hash_)
+        return func()
 
-        return hash_
+
+def get_hash(data, method: str = 'md5'):
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data, 'utf-8')
+
+    hash_ = _new_hash(method)
+    hash_.update(data)
+    hash_ = hash_.hexdigest()
+    LOGGER.debug('hash for binary data: %s', hash_)
+
+    return hash_
 
 
 def get_http_pool():
@@ -41,14 +47,12 @@ class Downloader:
                  filename: str,
                  content_length: int = None,
                  hexdigest=None,
-                 concurrent_download: int = 1,
                  download_retries: int = 3,
                  block_size: int = 4096 * 4,
                  progress_hooks: list = None,
                  hash_method: str = 'md5',
                  ):
 
-        self.pool = ThreadPool(_num_threads=concurrent_download, _basename='download', _daemon=True)
         self.url = url
         self.filename = filename
         self.content_length = content_length
@@ -189,7 +193,12 @@ class Downloader:
                 LOGGER.debug('Exception in callback: %s', ph.__name__)
                 LOGGER.debug(err, exc_info=True)
 
-    def download_to_memory(self):
+    def _download(self, write: callable):
+        """
+        Reads the resource block by block, passing each block to write
+
+        :return: the hash (see hash_method) of the data that has been read, None if the resource could not be reached
+        """
 
         data = self._create_response()
 
@@ -203,12 +212,14 @@ class Downloader:
             LOGGER.debug('callbacks will not show time left '
                          'or percent downloaded.')
 
+        hash_ = _new_hash(self.hash_method)
         received_data = 0
 
         start_download = time.time()
         block = data.read(1)
         received_data += len(block)
-        self.file_binary_data = block
+        write(block)
+        hash_.update(block)
         percent = self._calc_progress_percent(0, self.content_length)
         while 1:
 
@@ -223,7 +234,8 @@ class Downloader:
 
             self.block_size = self._best_block_size(end_block - start_block, len(block))
             LOGGER.debug('Block size: %s', self.block_size)
-            self.file_binary_data += block
+            write(block)
+            hash_.update(block)
 
             received_data += len(block)
 
@@ -250,13 +262,62 @@ class Downloader:
 
         self._call_progress_hooks(status)
         LOGGER.debug('Download Complete')
+        return hash_
+
+    def download_to_memory(self):
+        """Downloads the resource into file_binary_data (a bytearray, that grows in amortized constant time)"""
+
+        buffer = bytearray()
+        if self._download(buffer.extend) is not None:
+            self.file_binary_data = buffer
+
+    def download_to_file(self):
+        """
+        Streams the resource to disk, so that memory use does not depend on its size
+
+        Blocks are written to a temporary file next to filename and hashed on the way; the temporary file replaces
+        filename only if the hash matches.
+        :return: True if the file has been downloaded (and verified), False otherwise
+        """
+
+        fd, temp_file = tempfile.mkstemp(
+            prefix='.EMFT_', suffix='.part', dir=os.path.dirname(os.path.abspath(self.filename))
+        )
+        try:
+            with os.fdopen(fd, mode='wb') as stream:
+                hash_ = self._download(stream.write)
+
+            if hash_ is not None and self.hexdigest in (None, hash_.hexdigest()):
+                LOGGER.debug('file hash verified' if self.hexdigest else 'no hash to verify')
+                os.replace(temp_file, self.filename)
+                return True
+
+            LOGGER.debug('cannot verify file hash')
+            if os.path.exists(self.filename):
+                try:
+                    os.remove(self.filename)
+                except OSError:
+                    pass
+            return False
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def download(self, in_memory: bool = False):
+        """
+        Downloads the resource to filename, removing filename if the download fails or cannot be verified
+
+        :param in_memory: download the whole resource to memory (file_binary_data) before writing it
+        """
 
-    def download(self):
+        if not in_memory:
+            LOGGER.debug('downloading to file')
+            return self.download_to_file()
 
         LOGGER.debug('downloading to memory')
         self.download_to_memory()
 
-        check = self._check_hash()
+        check = self._check_hash() if self.file_binary_data is not None else False
 
         if check is True or check is None:
             LOGGER.debug('writing to file')
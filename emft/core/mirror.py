@@ -0,0 +1,209 @@
+# coding=utf-8
+"""
+Mirrors a directory onto another one, using a manifest to avoid re-reading unchanged files
+
+The manifest of a target directory is kept in EMFT's own folder (see constant.PATH_MIRROR_MANIFESTS_DIR), under a
+name derived from the absolute path of the target, so that it never ends up in the target or in a repository around
+it. For each mirrored file, it records the hash of its content along with the size and modification time of both the
+source file and the target copy; on the next run, files whose size and mtime still match are trusted without being
+read.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import typing
+
+from emft.core import constant
+from emft.core.logging import make_logger
+from emft.core.path import Path
+
+LOGGER = make_logger(__name__)
+
+MANIFEST_VERSION = 2
+CHUNK_SIZE = 1024 * 1024
+
+
+def manifest_path(target_dir: str) -> Path:
+    """Returns the path of the manifest for a target directory"""
+    target_dir = os.path.normcase(str(Path(target_dir).abspath()))
+    name = hashlib.sha256(target_dir.encode('utf8')).hexdigest()[:32]
+    return Path(constant.PATH_MIRROR_MANIFESTS_DIR).abspath().joinpath('{}.json'.format(name))
+
+
+def hash_file(file_path: str) -> str:
+    sha = hashlib.sha256()
+    with open(file_path, mode='rb') as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class MirrorReport:
+    def __init__(self):
+        self.files_copied = []
+        self.files_deleted = []
+        self.files_unchanged = 0
+        self.bytes_copied = 0
+
+    def __repr__(self):
+        return 'MirrorReport(copied={} ({} bytes), deleted={}, unchanged={})'.format(
+            len(self.files_copied), self.bytes_copied, len(self.files_deleted), self.files_unchanged
+        )
+
+
+class Manifest:
+    def __init__(self, path: str, entries: dict = None):
+        self.path = Path(path)
+        self.entries = entries or {}
+
+    @staticmethod
+    def load(path: str) -> 'Manifest':
+        path = Path(path)
+        if not path.exists():
+            return Manifest(path)
+        try:
+            with open(path, encoding='utf8') as stream:
+                data = json.load(stream)
+            if data.get('version') != MANIFEST_VERSION:
+                raise ValueError('unknown manifest version: {}'.format(data.get('version')))
+            return Manifest(path, data['entries'])
+        except (ValueError, KeyError, AttributeError):
+            LOGGER.warning('discarding unreadable mirror manifest: {}'.format(path.abspath()))
+            return Manifest(path)
+
+    def save(self):
+        os.makedirs(self.path.dirname(), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.EMFT_', suffix='.json', dir=self.path.dirname())
+        try:
+            with os.fdopen(fd, mode='w', encoding='utf8') as stream:
+                json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, stream, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _recorded_hash(self, rel_path: str, file_path: str, prefix: str) -> typing.Optional[str]:
+        entry = self.entries.get(rel_path)
+        if not entry:
+            return None
+        stat = os.stat(file_path)
+        if entry[prefix + 'size'] == stat.st_size and entry[prefix + 'mtime_ns'] == stat.st_mtime_ns:
+            return entry['hash']
+        return None
+
+    def source_hash(self, rel_path: str, source_file: str) -> str:
+        """Returns the hash of a source file, read from the manifest if the file is unchanged since it was recorded"""
+        hash_ = self._recorded_hash(rel_path, source_file, 'source_')
+        if hash_ is None:
+            LOGGER.debug('hashing source file: {}'.format(rel_path))
+            hash_ = hash_file(source_file)
+        return hash_
+
+    def target_hash(self, rel_path: str, target_file: str) -> typing.Optional[str]:
+        """Returns the hash of a target file, read from the manifest if the file is unchanged since it was recorded"""
+        if not os.path.isfile(target_file):
+            return None
+        hash_ = self._recorded_hash(rel_path, target_file, '')
+        if hash_ is None:
+            LOGGER.debug('hashing target file: {}'.format(rel_path))
+            hash_ = hash_file(target_file)
+        return hash_
+
+    def record(self, rel_path: str, source_file: str, target_file: str, hash_: str):
+        source_stat, target_stat = os.stat(source_file), os.stat(target_file)
+        self.entries[rel_path] = {
+            'hash': hash_,
+            'size': target_stat.st_size,
+            'mtime_ns': target_stat.st_mtime_ns,
+            'source_size': source_stat.st_size,
+            'source_mtime_ns': source_stat.st_mtime_ns,
+        }
+
+
+def mirror_digest(target_dir: str) -> typing.Optional[str]:
+    """
+    Returns a digest of the files last mirrored onto target_dir
+
+    :return: digest, or None if nothing was mirrored there, or if any of the mirrored files was edited or removed since
+    """
+    target_dir = str(Path(target_dir).abspath())
+    manifest = Manifest.load(manifest_path(target_dir))
+    if not manifest.entries:
+        return None
+    hashes = {}
+    for rel_path in sorted(manifest.entries):
+        target_file = os.path.join(target_dir, *rel_path.split('/'))
+        hashes[rel_path] = manifest.entries[rel_path]['hash']
+        if manifest.target_hash(rel_path, target_file) != hashes[rel_path]:
+            LOGGER.debug('mirrored file changed: {}'.format(target_file))
+            return None
+    return hashlib.sha256(json.dumps(hashes, sort_keys=True).encode('utf8')).hexdigest()
+
+
+def _walk_files(src_dir: str, ignore: typing.Iterable[str]) -> typing.Iterator[str]:
+    """Yields the relative path, with forward slashes, of every file in a directory"""
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if d not in ignore)
+        rel_root = os.path.relpath(root, src_dir)
+        for file in sorted(files):
+            if file in ignore:
+                continue
+            yield file if rel_root == '.' else '/'.join(rel_root.split(os.sep) + [file])
+
+
+def _remove_empty_parents(target_file: str, target_dir: str):
+    parent = os.path.dirname(target_file)
+    while os.path.normcase(parent) != os.path.normcase(target_dir) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+
+def mirror_dir(src_dir: str, target_dir: str, ignore: typing.Iterable[str] = None) -> MirrorReport:
+    """
+    Mirrors the files of src_dir onto target_dir
+
+    Only files whose content differs are copied. Files that were mirrored previously but are no longer in src_dir are
+    removed; files of target_dir that were never mirrored (e.g. git metadata) are left alone, and so are ignored names.
+    """
+    ignore = set(ignore or [])
+    src_dir = str(Path(src_dir).abspath())
+    target_dir = str(Path(target_dir).abspath())
+    LOGGER.debug('mirroring {} -> {}'.format(src_dir, target_dir))
+
+    report = MirrorReport()
+    manifest = Manifest.load(manifest_path(target_dir))
+    previous_entries = set(manifest.entries)
+    mirrored = set()
+
+    for rel_path in _walk_files(src_dir, ignore):
+        mirrored.add(rel_path)
+        source_file = os.path.join(src_dir, *rel_path.split('/'))
+        target_file = os.path.join(target_dir, *rel_path.split('/'))
+        source_hash = manifest.source_hash(rel_path, source_file)
+
+        if manifest.target_hash(rel_path, target_file) == source_hash:
+            report.files_unchanged += 1
+        else:
+            LOGGER.debug('copying: {}'.format(rel_path))
+            os.makedirs(os.path.dirname(target_file), exist_ok=True)
+            Path(source_file).copy2(target_file)
+            report.files_copied.append(rel_path)
+            report.bytes_copied += os.path.getsize(target_file)
+
+        manifest.record(rel_path, source_file, target_file, source_hash)
+
+    for rel_path in sorted(previous_entries - mirrored):
+        del manifest.entries[rel_path]
+        if set(rel_path.split('/')) & ignore:
+            continue
+        target_file = os.path.join(target_dir, *rel_path.split('/'))
+        if os.path.isfile(target_file):
+            LOGGER.debug('removing: {}'.format(rel_path))
+            os.remove(target_file)
+            _remove_empty_parents(target_file, target_dir)
+            report.files_deleted.append(rel_path)
+
+    manifest.save()
+    LOGGER.debug('mirroring done: {}'.format(report))
+    return report
@@ -1,12 +1,24 @@
 # coding=utf-8
 """Simple Lua Python Parser"""
+import functools
+import hashlib
+import io
+import os
+import pickle
 import re
+import tempfile
+import typing
 
 import mpmath
 from natsort import natsorted
 
 from emft.core.logging import make_logger
 
+try:
+    import lupa
+except ImportError:
+    lupa = None
+
 LOGGER = make_logger(__name__)
 
 # noinspection SpellCheckingInspection
@@ -17,8 +29,82 @@ ERRORS = {
     'mfnumber_minus': 'Malformed number (no digits after initial minus).',
     'mfnumber_dec_point': 'Malformed number (no digits after decimal point).',
     'mfnumber_sci': 'Malformed number (bad scientific format).',
+    'unexp_char': 'Unexpected character while parsing Lua string: {!r}',
+    'unknown_engine': 'unknown SLTP engine: {}; valid engines are: {}',
+    'unknown_numbers': 'unknown SLTP number type: {}; valid number types are: {}',
 }
 
+ENGINE_LEGACY = 'legacy'
+ENGINE_SCANNER = 'scanner'
+# Compiled Lua parser, only available if the optional "lupa" package is installed
+ENGINE_LUPA = 'lupa'
+ENGINES = (ENGINE_LEGACY, ENGINE_SCANNER) + ((ENGINE_LUPA,) if lupa is not None else ())
+# lupa is picked automatically when it is installed; texts it would not decode exactly go through the scanner
+DEFAULT_ENGINE = ENGINE_LUPA if lupa is not None else ENGINE_SCANNER
+
+NUMBERS_DECIMAL = 'decimal'
+NUMBERS_MPMATH = 'mpmath'
+NUMBERS = (NUMBERS_DECIMAL, NUMBERS_MPMATH)
+DEFAULT_NUMBERS = NUMBERS_DECIMAL
+
+# Folder of the on-disk decode cache used by all parsers; the cache is disabled if the variable is not set
+ENV_DECODE_CACHE = 'EMFT_SLTP_CACHE'
+DEFAULT_CACHE_SIZE = 128 * 1024 * 1024
+
+RE_QUALIFIER = re.compile(r'^(?P<value>(dictionary|mission|mapResource) = ?)\n')
+
+# Used by the "lupa" engine to detect texts that Lua would not decode like the pure-Python engines do: escape
+# sequences other than \", \\ and line continuations, identifiers (nil, upper-case booleans, ...), single-quoted and
+# long strings, positional table entries and float keys. Such texts are decoded by the "scanner" engine instead.
+RE_LUPA_TABLE_START = re.compile(r'\s*\{')
+RE_LUPA_ESCAPES = re.compile(r'\\[^"\\\n]|\r')
+RE_LUPA_STRINGS_AND_COMMENTS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|--[^\n]*', re.S)
+# Applied once strings, comments and white spaces have been removed, and booleans replaced by "0"
+RE_LUPA_UNSUPPORTED = re.compile(r'[^\d{}\[\]=,.eE+-]|[{,][^\[}]|\[(?:\[|-?\d+[.eE])|(?:^|[{}\[\]=,])-?0\d')
+RE_LUPA_FLOATS = re.compile(r'[^{}\[\]=,]*[.eE][^{}\[\]=,]*')
+# Shortest float literals have at most 17 digits in a row, so longer runs of digits are integers; Lua turns the ones
+# that do not fit in a 64-bit integer into floats
+RE_LUPA_LONG_INTEGERS = re.compile(r'\d{19,}')
+LUA_MAX_INTEGER = 2 ** 63 - 1
+LUPA_LOADER = '''
+function(text)
+    local env = setmetatable({}, {__index = function(_, name) error("unknown identifier: " .. name) end})
+    local chunk = load("return " .. text, "=sltp", "t", env)
+    if chunk == nil then
+        return nil
+    end
+    local ok, value = pcall(chunk)
+    if ok then
+        return value
+    end
+end
+'''
+
+# Master regex used by the "scanner" engine; leading whitespace is swallowed by each match, and each alternative
+# emits one whole token. The "error" alternative guarantees that nothing is ever silently skipped by "finditer".
+RE_TOKENS = re.compile(
+    r'''
+    \s*(?:
+        "(?P<dq_string>[^"\\]*(?:\\.[^"\\]*)*)"
+        |'(?P<sq_string>[^'\\]*(?:\\.[^'\\]*)*)'
+        |\[\[(?P<long_string>.*?)\]\]
+        |(?P<number>0[xX][0-9a-fA-F]*|-?\d+(?:\.\d+)?(?:[eE][+-]\d+)?)
+        |(?P<word>[^\W\d]\w*)
+        |(?P<comment>--\ [^\n]*[^\\\n]$)
+        |(?P<punct>[{}\[\]=,])
+        |(?P<error>\S)
+    )''',
+    re.S | re.M | re.X
+)
+RE_ESCAPED_CHAR = re.compile(r'\\(.)', re.S)
+RE_DIGITS = re.compile(r'(\d+)')
+
+# Used by the lazy decoder to index the entries of the top-level table; this relies on the indentation written by both
+# DCS and SLTP.encode, and every indexed entry is verified when it is decoded.
+RE_TOP_LEVEL_KEY = re.compile(r'^    \[(?:"(?P<str_key>[^"\\\n]*)"|(?P<int_key>\d+))\] =', re.M)
+RE_TOP_LEVEL_END = re.compile(r'^\}', re.M)
+RE_END_OF_TABLE = re.compile(r'^(?P<intro>[ \t]*\}),(?P<comment> -- end of \[.*\])$')
+
 
 class BaseSLTPError(Exception):
     """Base exception for SLTP module"""
@@ -41,29 +127,662 @@ class SLTPEmptyObjectError(BaseSLTPError):
         super().__init__(*args)
 
 
+class DecimalLiteral(float):
+    """
+    Non-integer number decoded from a Lua string
+
+    Behaves like a float, but keeps the literal it was created from whenever the float representation would differ,
+    so that encoding it gives back the exact same text.
+    """
+
+    __slots__ = ('_literal',)
+
+    def __new__(cls, literal: str):
+        self = float.__new__(cls, literal)
+        self._literal = None if float.__repr__(self) == literal else literal
+        return self
+
+    @property
+    def literal(self) -> str:
+        """Text of the number, as written in the Lua string"""
+        return self._literal or float.__repr__(self)
+
+    def __str__(self):
+        return self._literal or float.__repr__(self)
+
+    def __repr__(self):
+        return 'DecimalLiteral({!r})'.format(str(self))
+
+    def __reduce__(self):
+        return self.__class__, (str(self),)
+
+
+@functools.lru_cache(maxsize=2 ** 16)
+def _natural_key(key: str) -> tuple:
+    # Same key as natsort's default one, for ASCII strings
+    parts = RE_DIGITS.split(key)
+    parts[1::2] = map(int, parts[1::2])
+    if parts[-1] == '':
+        parts.pop()
+    return tuple(parts)
+
+
+def sorted_keys(keys, as_str: bool = False) -> list:
+    """
+    Returns the keys of a Lua table in natural order
+
+    This is the order given by natsort.natsorted; the common cases (only non-negative integers, or only ASCII strings)
+    are sorted without going through natsort.
+
+    :param keys: keys of a Lua table
+    :param as_str: compare the keys through their string representation, like the encoder does
+    :return: sorted list of keys
+    """
+    keys = list(keys)
+    key_types = set(map(type, keys))
+    if key_types == {int}:
+        result = sorted(keys)
+        if not as_str or result[0] >= 0:
+            return result
+    elif key_types == {str} and all(map(str.isascii, keys)):
+        return sorted(keys, key=_natural_key)
+    elif not keys:
+        return keys
+    if as_str:
+        return natsorted(keys, key=str)
+    return natsorted(keys)
+
+
+_INLINE_NUMBER_TYPES = frozenset((int, float, bool, DecimalLiteral, mpmath.mpf))
+
+
+def _is_inline_array(array) -> bool:
+    # Arrays made only of numbers and short strings are written on a single line
+    for element in array:
+        element_type = type(element)
+        if element_type is str:
+            if len(element) >= 10:
+                return False
+        elif element_type not in _INLINE_NUMBER_TYPES:
+            if isinstance(element, str):
+                if len(element) >= 10:
+                    return False
+            elif not isinstance(element, (int, float, mpmath.mpf)):
+                return False
+    return True
+
+
+def _is_array(table: dict, numeric_keys: bool) -> bool:
+    if numeric_keys:
+        return False
+    for key in table:
+        if type(key) in (str, float, bool, tuple, mpmath.mpf, DecimalLiteral):
+            return False
+    return True
+
+
+def _array_from_table(table: dict) -> list:
+    array = []
+    for key in table:
+        array.insert(key, table[key])
+    return array
+
+
+def _unescape_dq(match):
+    char = match.group(1)
+    return char if char == '"' else match.group(0)
+
+
+def _unescape_sq(match):
+    char = match.group(1)
+    return char if char == "'" else match.group(0)
+
+
+class _Scanner:
+    """
+    Parser used by the "scanner" engine
+
+    Accepts the same grammar as the legacy character walker, but consumes whole tokens emitted by RE_TOKENS instead
+    of individual characters.
+    """
+
+    def __init__(self, parser: 'SLTP', text: str, pos: int, endpos: int = None):
+        self.parser = parser
+        self.text = text
+        self.tokens = RE_TOKENS.finditer(text, pos, len(text) if endpos is None else endpos)
+        self.tok = None
+        self.kind = None
+        self.lexeme = None
+        self.punct = None
+        self.next_token()
+
+    def next_token(self):
+        """Moves to the next significant token (comments are skipped)"""
+        for tok in self.tokens:
+            kind = tok.lastgroup
+            if kind == 'comment':
+                continue
+            self.tok = tok
+            self.kind = kind
+            self.lexeme = tok.group(kind)
+            self.punct = self.lexeme if kind == 'punct' else None
+            return
+        self.tok = self.kind = self.lexeme = self.punct = None
+
+    def parse(self):
+        """Parses the top-level value"""
+        return self.value()
+
+    def entry(self) -> tuple:
+        """Parses a single '[key] = value' table entry, which must span the whole input"""
+        if self.punct != '[':
+            self._raise_unexpected()
+        self.next_token()
+        key = self.value()
+        for expected in (']', '='):
+            if self.punct != expected:
+                self._raise_unexpected()
+            self.next_token()
+        value = self.value()
+        if self.punct == ',':
+            self.next_token()
+        if self.kind is not None:
+            self._raise_unexpected()
+        return key, value
+
+    def _raise_unexpected(self):
+        char = self.lexeme
+        if char in ('"', "'"):
+            raise SLTPParsingError(ERRORS['unexp_end_string'])
+        if char == '-':
+            raise SLTPParsingError(ERRORS['mfnumber_minus'])
+        raise SLTPParsingError(ERRORS['unexp_char'].format(char))
+
+    def _number(self):
+        end = self.tok.end()
+        next_char = self.text[end:end + 1]
+        if next_char == '.':
+            raise SLTPParsingError(ERRORS['mfnumber_dec_point'])
+        if next_char in ('e', 'E'):
+            raise SLTPParsingError(ERRORS['mfnumber_sci'])
+        return self.parser.number_from_literal(self.lexeme)
+
+    def value(self):  # noqa C901
+        """Parses the value starting at the current token"""
+        kind = self.kind
+        if kind is None:
+            return None
+        if kind == 'punct':
+            if self.punct == '{':
+                table = self.table()
+                if isinstance(table, dict):
+                    return self.parser.ordered_table(table)
+                return table
+            if self.punct == '[':
+                self.next_token()
+                return self.value()
+            self._raise_unexpected()
+        if kind == 'error':
+            self._raise_unexpected()
+        lexeme = self.lexeme
+        if kind == 'number':
+            value = self._number()
+        elif kind == 'dq_string':
+            value = RE_ESCAPED_CHAR.sub(_unescape_dq, lexeme) if '\\' in lexeme else lexeme
+        elif kind == 'sq_string':
+            value = RE_ESCAPED_CHAR.sub(_unescape_sq, lexeme) if '\\' in lexeme else lexeme
+        elif kind == 'word':
+            lowered = lexeme.lower()
+            if lowered == 'true':
+                value = True
+            elif lowered == 'false':
+                value = False
+            elif lexeme == 'nil':
+                value = None
+            else:
+                value = lexeme
+        else:
+            value = lexeme
+        self.next_token()
+        return value
+
+    def table(self):  # noqa C901
+        """Parses the table starting at the current "{" token"""
+        o = dict()
+        k = ''
+        idx = 0
+        numeric_keys = False
+        self.next_token()
+        if self.punct == '}':
+            self.next_token()
+            return o
+        while self.kind is not None:
+            punct = self.punct
+            if punct == '{':
+                o[idx] = self.table()
+                idx += 1
+                continue
+            elif punct == '}':
+                self.next_token()
+                if k:
+                    o[idx] = k
+                if _is_array(o, numeric_keys):
+                    return _array_from_table(o)
+                return o
+            elif punct == ',':
+                self.next_token()
+                continue
+            k = self.value()
+            if self.punct == ']':
+                numeric_keys = True
+                self.next_token()
+            if self.punct == '=':
+                self.next_token()
+                o[k] = self.value()
+                idx += 1
+                k = ''
+            elif self.punct == ',':
+                self.next_token()
+                o[idx] = k
+                idx += 1
+                k = ''
+        raise SLTPParsingError(ERRORS['unexp_end_table'])
+
+
+def _is_shortest_float_literal(literal: str) -> bool:
+    try:
+        return float.__repr__(float(literal)) == literal
+    except ValueError:
+        return False
+
+
+def _lupa_to_python(parser, table) -> dict:
+    result = {}
+    for key, value in table.items():
+        value_type = type(value)
+        if value_type is str:
+            # Lua unescaped the string; give it back in the form the pure-Python engines keep it in
+            value = value.replace('\\', '\\\\').replace('\n', '\\\n')
+        elif value_type is float:
+            value = DecimalLiteral(float.__repr__(value))
+        elif value_type not in (int, bool):
+            value = _lupa_to_python(parser, value)
+        if type(key) is str:
+            key = key.replace('\\', '\\\\').replace('\n', '\\\n')
+        result[key] = value
+    return parser.ordered_table(result)
+
+
+def _decode_with_lupa(parser, text: str, pos: int) -> typing.Optional[dict]:
+    """
+    Decodes a Lua table with the compiled Lua parser of "lupa"
+
+    :return: decoded table, or None if the text has to be decoded by a pure-Python engine
+    """
+    if not RE_LUPA_TABLE_START.match(text, pos) or RE_LUPA_ESCAPES.search(text, pos):
+        return None
+    stripped = ''.join(RE_LUPA_STRINGS_AND_COMMENTS.sub('', text[pos:]).split())
+    stripped = stripped.replace('true', '0').replace('false', '0')
+    if RE_LUPA_UNSUPPORTED.search(stripped):
+        return None
+    # Lua only gives back the value of non-integer numbers, so their literal has to be the shortest representation
+    if not all(map(_is_shortest_float_literal, RE_LUPA_FLOATS.findall(stripped))):
+        return None
+    if any(int(literal) > LUA_MAX_INTEGER for literal in RE_LUPA_LONG_INTEGERS.findall(stripped)):
+        return None
+    runtime = lupa.LuaRuntime(encoding='utf-8')
+    table = runtime.eval(LUPA_LOADER)(text[pos:])
+    if lupa.lua_type(table) != 'table':
+        return None
+    return _lupa_to_python(parser, table)
+
+
+_UNPARSED = object()
+
+
+def _index_top_level(text: str, pos: int) -> typing.Optional[dict]:
+    """
+    Finds the span of every entry of the top-level table in one regex pass
+
+    :return: dictionary of key -> (start, end), or None if the text does not look like a DCS-formatted table
+    """
+    opening = RE_TOKENS.match(text, pos)
+    if opening is None or opening.lastgroup != 'punct' or opening.group('punct') != '{':
+        return None
+    matches = list(RE_TOP_LEVEL_KEY.finditer(text, opening.end()))
+    if not matches or text[opening.end():matches[0].start()].strip():
+        return None
+    closing = RE_TOP_LEVEL_END.search(text, matches[-1].end())
+    if closing is None:
+        return None
+    spans = {}
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        str_key = match.group('str_key')
+        key = int(match.group('int_key')) if str_key is None else str_key
+        if key in spans:
+            return None
+        spans[key] = (match.start(), closing.start() if next_match is None else next_match.start())
+    return spans
+
+
+class LazyTable(dict):
+    """
+    Top-level Lua table that decodes its entries on first access
+
+    The entries of the top-level table are indexed in a single pass; each of them is only decoded when it is first
+    accessed. Entries that are never accessed are written back verbatim by SLTP.encode.
+
+    If an indexed entry turns out to be malformed, the whole text is decoded eagerly instead.
+    """
+
+    def __init__(self, parser: 'SLTP', text: str, pos: int, spans: dict):
+        super().__init__()
+        self._parser = parser
+        self._text = text
+        self._pos = pos
+        self._spans = spans
+        dict.update(self, parser.ordered_table(dict.fromkeys(spans, _UNPARSED)))
+
+    def is_loaded(self, key) -> bool:
+        """
+        :param key: key of a top-level entry
+        :return: True if this entry has already been decoded
+        """
+        return key not in self._spans
+
+    def raw_entry(self, key) -> typing.Optional[str]:
+        """
+        Returns the original text of an entry that has not been decoded yet, without its trailing comma
+
+        :param key: key of a top-level entry
+        :return: entry text, or None if the entry has already been decoded
+        """
+        text = self.raw_text(key)
+        if text is None:
+            return None
+        last_line_start = text.rfind('\n') + 1
+        match = RE_END_OF_TABLE.match(text[last_line_start:])
+        if match:
+            return text[:last_line_start] + match.group('intro') + match.group('comment')
+        return text[:-1]
+
+    def raw_text(self, key) -> typing.Optional[str]:
+        """
+        Returns the original text of an entry that has not been decoded yet, as written by SLTP.encode
+
+        :param key: key of a top-level entry
+        :return: entry text, trailing comma included, or None if the entry has already been decoded
+        """
+        if key not in self._spans:
+            return None
+        start, end = self._spans[key]
+        text = self._text[start:end].rstrip()
+        if text.endswith(',') or RE_END_OF_TABLE.match(text[text.rfind('\n') + 1:]):
+            return text
+        return None
+
+    def load_all(self):
+        """Decodes all remaining entries"""
+        for key in list(self._spans):
+            self._load(key)
+
+    def _load(self, key):
+        start, end = self._spans[key]
+        try:
+            parsed_key, value = _Scanner(self._parser, self._text, start, end).entry()
+        except SLTPParsingError:
+            parsed_key = value = None
+        if parsed_key != key:
+            LOGGER.debug('failed to decode indexed entry "{}", decoding the whole table'.format(key))
+            self._load_from_full_text()
+            return dict.__getitem__(self, key)
+        del self._spans[key]
+        dict.__setitem__(self, key, value)
+        self._release_text()
+        return value
+
+    def _load_from_full_text(self):
+        full = _Scanner(self._parser, self._text, self._pos).parse()
+        current = dict(dict.items(self))
+        dict.clear(self)
+        for key in full:
+            if key in self._spans:
+                dict.__setitem__(self, key, full[key])
+            elif key in current:
+                dict.__setitem__(self, key, current[key])
+        self._spans.clear()
+        self._release_text()
+
+    def _release_text(self):
+        if not self._spans:
+            self._text = None
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is _UNPARSED:
+            return self._load(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._spans.pop(key, None)
+        dict.__setitem__(self, key, value)
+        self._release_text()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._spans.pop(key, None)
+        self._release_text()
+
+    def __iter__(self):
+        return iter(dict.keys(self))
+
+    def __eq__(self, other):
+        self.load_all()
+        if isinstance(other, LazyTable):
+            other.load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        self.load_all()
+        return dict.__repr__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *args):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        self.load_all()
+        return dict.popitem(self)
+
+    def clear(self):
+        dict.clear(self)
+        self._spans.clear()
+        self._release_text()
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def copy(self):
+        self.load_all()
+        return dict(dict.items(self))
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+class DecodeCache:
+    """
+    On-disk cache of decoded Lua tables
+
+    Entries are keyed by a hash of the decoded text and stored as pickle files. Once the total size of the cache
+    exceeds "max_size", the least recently used entries are removed.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry_path(self, text: str, numbers: str) -> str:
+        digest = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        return os.path.join(self.path, '{}.{}.pickle'.format(digest, numbers))
+
+    def _entries(self) -> typing.List[typing.Tuple[str, os.stat_result]]:
+        """Returns the path and stat of every entry; entries removed meanwhile (e.g. by another process) are skipped"""
+        entries = []
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith('.pickle'):
+                continue
+            try:
+                entries.append((entry.path, entry.stat()))
+            except OSError:
+                pass
+        return entries
+
+    def get(self, text: str, numbers: str = DEFAULT_NUMBERS):
+        """
+        Returns the cached decoded value of a text
+
+        :param text: Lua text, qualifier included
+        :param numbers: type of the non-integer numbers of the decoded value
+        :return: decoded value, or None if the text is not in the cache
+        """
+        entry_path = self._entry_path(text, numbers)
+        try:
+            with open(entry_path, 'rb') as stream:
+                value = pickle.load(stream)
+            # The modification time of an entry is the time it was last used at
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError) as exc:
+            LOGGER.warning('discarding unreadable decode cache entry: {}; {}'.format(entry_path, exc))
+            self.misses += 1
+            self._remove(entry_path)
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, text: str, value, numbers: str = DEFAULT_NUMBERS):
+        """
+        Stores the decoded value of a text, and evicts the least recently used entries if needed
+
+        :param text: Lua text, qualifier included
+        :param value: decoded value
+        :param numbers: type of the non-integer numbers of the decoded value
+        """
+        entry_path = self._entry_path(text, numbers)
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.path, suffix='.tmp', delete=False) as stream:
+                pickle.dump(value, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(stream.name, entry_path)
+        except OSError as exc:
+            LOGGER.warning('unable to write decode cache entry: {}; {}'.format(entry_path, exc))
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = self._entries()
+        total_size = sum(stat.st_size for _, stat in entries)
+        for entry_path, stat in sorted(entries, key=lambda x: x[1].st_mtime):
+            if total_size <= self.max_size:
+                break
+            total_size -= stat.st_size
+            self._remove(entry_path)
+            self.evictions += 1
+
+    @staticmethod
+    def _remove(entry_path: str):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Removes all entries"""
+        for entry_path, _ in self._entries():
+            self._remove(entry_path)
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache
+
+        :return: dictionary with the number of hits, misses and evictions, and the current number of entries and size
+        """
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'size': sum(stat.st_size for _, stat in entries),
+        }
+
+
+DECODE_CACHE = DecodeCache(os.environ[ENV_DECODE_CACHE]) if os.environ.get(ENV_DECODE_CACHE) else None
+
+
 class SLTP:
     """Simple Lua Python Parser"""
 
-    def __init__(self):
+    def __init__(self, engine: str = DEFAULT_ENGINE, numbers: str = DEFAULT_NUMBERS, cache: DecodeCache = None):
+        if engine not in ENGINES:
+            raise ValueError(ERRORS['unknown_engine'].format(engine, ', '.join(ENGINES)))
+        if numbers not in NUMBERS:
+            raise ValueError(ERRORS['unknown_numbers'].format(numbers, ', '.join(NUMBERS)))
         LOGGER.debug('instantiating parser')
+        self.engine = engine
+        self.numbers = numbers
+        self._number_type = DecimalLiteral if numbers == NUMBERS_DECIMAL else mpmath.mpf
+        # Falls back to the module-wide DECODE_CACHE
+        self.cache = cache
         self.text = ''
         self.ch = ''
         self.at = 0
         self.len = 0
         self.depth = 0
+        self.__inline_arrays = {}
         self.qual = None
         self.space = re.compile(r'\s', re.M)
         self.alnum = re.compile(r'\w', re.M)
-        self.line_end = re.compile(r'^(?P<intro>[ \t]*\})(?P<comment> -- end of \[.*\]),$')
         self.newline = '\n'
         self.tab = '\t'
         self.tab = '    '
 
-    def decode(self, text):
+    def decode(self, text, lazy: bool = False):
         """Decode a Lua string to an dictionary
         :type text: str
         :rtype: dict
         :param text: string to decode
+        :param lazy: return a LazyTable, whose top-level entries are only decoded when accessed
         :return: dictionary
         """
         LOGGER.debug('decoding text to dictionary')
@@ -72,15 +791,49 @@ class SLTP:
             raise SLTPParsingError(ERRORS['unexp_type_str'])
 
         LOGGER.debug('extracting qualifier')
-        qual = re.compile(r'^(?P<value>(dictionary|mission|mapResource) = ?)\n')
-        match = qual.match(text)
+        match = RE_QUALIFIER.match(text)
 
         if match is None:
             raise ValueError('qualifier not found; first line: {}'.format(text.split('\n')[0]))
 
         self.qual = match.group('value')
-        text = qual.sub('', text)
 
+        if lazy:
+            return self._decode_lazy(text, match.end()), self.qual
+
+        cache = self.cache or DECODE_CACHE
+        if cache is not None:
+            result = cache.get(text, self.numbers)
+            if result is not None:
+                LOGGER.debug('decoded table found in cache')
+                return result, self.qual
+
+        result = self._decode_eager(text, match.end())
+        if cache is not None:
+            cache.put(text, result, self.numbers)
+        return result, self.qual
+
+    def _decode_eager(self, text, pos):
+        if self.engine == ENGINE_LUPA:
+            result = None
+            if self.numbers == NUMBERS_DECIMAL:
+                result = _decode_with_lupa(self, text, pos)
+            if result is None:
+                LOGGER.debug('text not supported by the lupa engine, falling back to the scanner engine')
+                result = _Scanner(self, text, pos).parse()
+            return result
+        if self.engine == ENGINE_SCANNER:
+            return _Scanner(self, text, pos).parse()
+        return self._decode_legacy(text[pos:])
+
+    def _decode_lazy(self, text, pos):
+        spans = _index_top_level(text, pos)
+        if spans is None:
+            LOGGER.debug('unable to index top-level table, decoding eagerly')
+            return _Scanner(self, text, pos).parse()
+        return LazyTable(self, text, pos, spans)
+
+    def _decode_legacy(self, text):
         reg = re.compile(r' -- .*[^\\]$', re.M)
         text = reg.sub('', text)
 
@@ -88,8 +841,35 @@ class SLTP:
         self.at, self.ch, self.depth = 0, '', 0
         self.len = len(text)
         self.next_chr()
-        result = self.value()
-        return result, self.qual
+        return self.value()
+
+    @staticmethod
+    def ordered_table(table: dict) -> dict:
+        """
+        Returns a decoded table with its keys in natural order
+
+        The table itself is returned if its keys already are in order.
+
+        :param table: decoded Lua table
+        :return: ordered dictionary
+        """
+        keys = list(table)
+        ordered_keys = sorted_keys(keys)
+        if ordered_keys == keys:
+            return table
+        return {key: table[key] for key in ordered_keys}
+
+    def number_from_literal(self, literal: str):
+        """
+        Converts a Lua number literal to a Python number
+
+        :param literal: number as found in the Lua text
+        :return: int, or DecimalLiteral (mpmath.mpf if the parser uses mpmath numbers) for non-integer values
+        """
+        try:
+            return int(literal, 0)
+        except ValueError:
+            return self._number_type(literal)
 
     def encode(self, obj, qualifier: str):
         """Encodes a dictionary-like object to a Lua string
@@ -97,73 +877,100 @@ class SLTP:
         :param obj: object to encode
         :return: valid Lua string
         """
+        stream = io.StringIO()
+        self.encode_to_stream(obj, qualifier, stream)
+        return stream.getvalue()
+
+    def encode_to_stream(self, obj, qualifier: str, stream: typing.TextIO):
+        """
+        Encodes a dictionary-like object to a text stream
+
+        The Lua text is written piece by piece, and is never held in memory as a whole.
+
+        :param obj: object to encode
+        :param qualifier: qualifier of the Lua table
+        :param stream: text stream (opened file, io.StringIO, ...)
+        """
         LOGGER.debug('encoding dictionary to text')
+        name = qualifier.replace('=', '').rstrip()
         if not obj:
-            if qualifier.replace('=', '').rstrip() == 'mapResource':
+            if name == 'mapResource':
                 # Accept empty mapResource
-                return '{}\n{{\n}} -- end of {}\n'.format(qualifier, qualifier.replace('=', '').rstrip())
+                stream.write('{}\n{{\n}} -- end of {}\n'.format(qualifier, name))
+                return
             else:
-                LOGGER.error('{}\n{{\n}} -- end of {}\n'.format(qualifier, qualifier.replace('=', '').rstrip()))
+                LOGGER.error('{}\n{{\n}} -- end of {}\n'.format(qualifier, name))
                 raise SLTPEmptyObjectError(qualifier)
-                # return '{}\n{{\n}} -- end of {}\n'.format(qualifier, qualifier.replace('=', '').rstrip())
         self.depth = 0
-        out = []
-        s = self.__encode(obj)
-        lines = s.split(self.newline)
-        for line in lines:
-            m = self.line_end.match(line)
-            if m:
-                out.append('{},{}'.format(m.group('intro'), m.group('comment')))
-            else:
-                out.append(line)
-        return '{}{} -- end of {}\n'.format(qualifier, self.newline.join(out), qualifier.replace('=', '').rstrip())
+        # Inline formatting of arrays, by object id; only valid while the encoded objects are alive
+        self.__inline_arrays = {}
+        write = stream.write
+        try:
+            write(qualifier)
+            self.__write_value(write, obj)
+            write(' -- end of {}\n'.format(name))
+        finally:
+            self.__inline_arrays = {}
 
-    def __encode(self, obj, dict_name=None):  # noqa C901
-        s = ''
-        tab = self.tab
-        newline = self.newline
+    def __write_value(self, write, obj, dict_name=None) -> str:  # noqa C901
+        """
+        Writes a value and returns the comment that goes after the comma following it (only for named tables)
+        """
         if isinstance(obj, str):
-            s += '"%s"' % obj.replace('"', '\\"')
+            write('"%s"' % obj.replace('"', '\\"'))
         elif isinstance(obj, bool):
-            s += str(obj).lower()
+            write(str(obj).lower())
         elif isinstance(obj, (int, float, complex, mpmath.mpf)):
-            s += str(obj)
+            write(str(obj))
         elif isinstance(obj, (list, tuple, dict)):
-            # Ladies and gentlemen, please take a minute to behold the following code.
-            # Breathe slowly, let it sink in for a minute.
-            # Yes, I agree, this sucks *so* much I should hang for it.
-            # Now, deal with it ^^
+            tab = self.tab
+            newline = self.newline
             self.depth += 1
-            # noinspection PyTypeChecker
-            if not isinstance(obj, dict) and len(filter(
-                lambda x: isinstance(x, (int, float, mpmath.mpf)) or (isinstance(x, str) and len(x) < 10), obj
-            )) == len(obj):
+            if not isinstance(obj, dict) and self.__is_inline(obj):
                 newline = tab = ''
             dp = tab * self.depth
-            s += '%s%s{%s' % (newline, tab * (self.depth - 1), newline if len(obj) > 0 else '')
+            write('%s%s{%s' % (newline, tab * (self.depth - 1), newline))
             if isinstance(obj, dict):
-                s += (',%s' % newline).join(
-                    [dp + '[{}] ={}{}'.format(k,
-                                              '' if isinstance(obj[k], (list, tuple, dict)) else ' ',
-                                              self.__encode(obj[k], k)) if type(
-                        k) is int else dp + '["{}"] ={}{}'.format(k, '' if isinstance(obj[k],
-                                                                                      (list, tuple, dict)) else ' ',
-                                                                  self.__encode(obj[k], k))
-                     for k in natsorted(obj.keys(), key=str)])
+                for key in sorted_keys(obj.keys(), as_str=True):
+                    self.__write_entry(write, obj, key, dp, newline)
             else:
-                s += (',%s' % newline).join([dp + self.__encode(el) for el in obj])
+                for element in obj:
+                    write(dp)
+                    self.__write_value(write, element)
+                    write(',' + newline)
             self.depth -= 1
-            if len(obj) > 0:
-                s += ','
-            s += '%s%s}' % (newline, tab * self.depth)
-        if isinstance(obj, dict):
-            try:
-                int(dict_name)
-                s += ' -- end of [{}]'.format(dict_name)
-            except (ValueError, TypeError):
-                if dict_name is not None:
-                    s += ' -- end of ["{}"]'.format(dict_name)
-        return s
+            write('%s}' % (tab * self.depth))
+            if isinstance(obj, dict) and dict_name is not None:
+                try:
+                    int(dict_name)
+                    return ' -- end of [{}]'.format(dict_name)
+                except (ValueError, TypeError):
+                    return ' -- end of ["{}"]'.format(dict_name)
+        return ''
+
+    def __is_inline(self, array) -> bool:
+        try:
+            return self.__inline_arrays[id(array)]
+        except KeyError:
+            inline = self.__inline_arrays[id(array)] = _is_inline_array(array)
+            return inline
+
+    def __write_entry(self, write, obj, key, prefix, newline):
+        if isinstance(obj, LazyTable):
+            raw = obj.raw_text(key)
+            if raw is not None:
+                write(raw)
+                write(newline)
+                return
+        value = obj[key]
+        key_format = '[{}]' if type(key) is int else '["{}"]'
+        write(prefix)
+        write(key_format.format(key))
+        write(' =' if isinstance(value, (list, tuple, dict)) else ' = ')
+        comment = self.__write_value(write, value, key)
+        write(',')
+        write(comment)
+        write(newline)
 
     # noinspection PyMissingOrEmptyDocstring
     def white(self):
@@ -188,11 +995,7 @@ class SLTP:
         if not self.ch:
             return
         if self.ch == '{':
-            o = self.object()
-            ret = dict()
-            for k in natsorted(o.keys()):
-                ret[k] = o[k]
-            return ret
+            return self.ordered_table(self.object())
         if self.ch == '[':
             self.next_chr()
         if self.ch in ['"', "'", '[']:
@@ -245,15 +1048,8 @@ class SLTP:
                     self.next_chr()
                     if k:
                         o[idx] = k
-                    if not numeric_keys and len(
-                        [
-                            key for key in o if type(key) in (str, float, bool, tuple, mpmath.mpf)
-                        ]
-                    ) == 0:
-                        ar = []
-                        for key in o:
-                            ar.insert(key, o[key])
-                        o = ar
+                    if _is_array(o, numeric_keys):
+                        o = _array_from_table(o)
                     return o  # or here
                 else:
                     if self.ch == ',':
@@ -325,10 +1121,7 @@ class SLTP:
                     raise SLTPParsingError(ERRORS['mfnumber_sci'])
                 n += next_digit(ERRORS['mfnumber_sci'])
                 n += self.digit()
-        try:
-            return int(n, 0)
-        except ValueError:
-            return mpmath.mpf(n)
+        return self.number_from_literal(n)
 
     # noinspection PyMissingOrEmptyDocstring
     def digit(self):
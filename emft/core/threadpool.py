@@ -4,9 +4,19 @@ Creates a pool of threads that accepts any function, with or without arguments.
 
 Workers can be linked together
 """
+import contextlib
+import heapq
+import itertools
+import math
+import os
+import queue
+import sys
 import threading
 import time
 import traceback
+import typing
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
 
 from emft.core.logging import make_logger
 
@@ -19,12 +29,63 @@ from emft.core.logging import make_logger
 LOGGER = make_logger(__name__)
 
 SENTRY = None
+TASK_BREADCRUMBS = False
 test_exc = None
 
+# Tasks with a lower priority value run first; tasks with the same priority run in the order they were queued
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
 
-def register_sentry(sentry_client_instance):
-    global SENTRY
+# Number of finished tasks each pool remembers, see ThreadPool.task_stats
+TASK_HISTORY_SIZE = 1000
+
+# What happened to a task: name of the callable, perf_counter() values for when it was queued and started, time it
+# took to run, and outcome ('success', 'error' or 'cancelled'; cancelled tasks never started)
+TaskRecord = namedtuple('TaskRecord', 'name queued started duration outcome')
+
+
+def register_sentry(sentry_client_instance, task_breadcrumbs: bool = False):
+    """
+    :param sentry_client_instance: Sentry client that will receive the exceptions raised by tasks
+    :param task_breadcrumbs: also leave a breadcrumb for each finished task
+    """
+    global SENTRY, TASK_BREADCRUMBS
     SENTRY = sentry_client_instance
+    TASK_BREADCRUMBS = task_breadcrumbs
+
+
+def _task_name(task: callable) -> str:
+    task = getattr(task, 'func', task)  # functools.partial
+    return getattr(task, '__qualname__', None) or type(task).__name__
+
+
+def _percentile(sorted_values: list, percent: float):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, int(math.ceil(percent / 100 * len(sorted_values))) - 1)]
+
+
+def _aggregate(records: list) -> dict:
+    ran = [record for record in records if record.started is not None]
+    waits = sorted(record.started - record.queued for record in ran)
+    durations = sorted(record.duration for record in ran)
+    throughput = None
+    if len(ran) > 1:
+        span = max(record.started + record.duration for record in ran) - min(record.started for record in ran)
+        if span > 0:
+            throughput = len(ran) / span
+    return {
+        'count': len(records),
+        'errors': len([record for record in records if record.outcome == 'error']),
+        'cancelled': len(records) - len(ran),
+        'wait_p50': _percentile(waits, 50),
+        'wait_p95': _percentile(waits, 95),
+        'run_p50': _percentile(durations, 50),
+        'run_p95': _percentile(durations, 95),
+        'throughput': throughput,
+    }
 
 
 class ThreadPool:
@@ -32,17 +93,33 @@ class ThreadPool:
     accepts tasks that will be dispatched to the next available
     thread."""
 
-    def __init__(self, _num_threads, _basename=None, _daemon=None):
-        """Initialize the thread pool with numThreads workers."""
+    def __init__(self, _num_threads, _basename=None, _daemon=None, _max_queue_size=0):
+        """Initialize the thread pool with numThreads workers.  Once
+        _max_queue_size tasks are pending, queueing more blocks until
+        a thread picks one up (0 means no limit)."""
         self.resize_lock = threading.Condition(threading.Lock())
+        # heap of [priority, sequence, future, task, time queued]
         self.tasks = []
+        self.task_history = deque(maxlen=TASK_HISTORY_SIZE)
+        self.max_queue_size = _max_queue_size
+        self._sequence = itertools.count()
         self.basename_suffix = 1
         self.is_daemon = _daemon
         self.threads = []
         self.ongoing_jobs = 0
+        self.active_workers = 0
+        self.tasks_completed = 0
+        self.task_time_total = 0.0
+        self.task_time_max = 0.0
         self.is_joining = False
         self.basename = _basename
-        self.task_lock = threading.Condition(threading.Lock())
+        # Idle threads wait on task_lock until a task is queued or they are killed, join_all waits on tasks_empty
+        # for the queue to be drained, and producers wait on tasks_not_full when the queue is bounded and full.
+        # All conditions share the same lock.
+        lock = threading.Lock()
+        self.task_lock = threading.Condition(lock)
+        self.tasks_empty = threading.Condition(lock)
+        self.tasks_not_full = threading.Condition(lock)
         self.set_thread_count(_num_threads)
 
     def set_thread_count(self, new_num_threads):
@@ -99,10 +176,11 @@ class ThreadPool:
                    _err_callback: callable = None,
                    _err_args: list = None,
                    _err_kwargs: dict = None,
-                   _task_id: str = None
+                   _task_id: str = None,
+                   _priority: int = PRIORITY_NORMAL,
                    ):
         """
-        Inserts a task into the queue
+        Inserts a task into the queue (see submit for a Future-based alternative)
         :param _task_id: gives an ID to the task in order to parse the result against something tangible
         :param task: callable task
         :param args: args for the task as a list
@@ -111,41 +189,174 @@ class ThreadPool:
         :param _err_callback: callable to run in case of an error
         :param _err_args: args to _err_callback
         :param _err_kwargs: kwargs to _err_callback
+        :param _priority: tasks with a lower priority value run first
         """
         if self.is_joining:
             return False
         if task is None or isinstance(task, bool) or not callable(task):
             raise ValueError('task must be a callable, got {}'.format(type(task)))
 
+        self._put(
+            None, (task, args, kwargs, _task_callback, _err_callback, _err_args, _err_kwargs, _task_id), _priority
+        )
+        return True
+
+    def submit(self,
+               task: callable,
+               args: list = None,
+               kwargs: dict = None,
+               priority: int = PRIORITY_NORMAL,
+               block: bool = True,
+               timeout: float = None,
+               ) -> Future:
+        """
+        Inserts a task into the queue, and returns a Future that holds its result
+
+        Cancelling the Future removes the task from the queue, unless a thread already picked it up.
+        :param task: callable task
+        :param args: args for the task as a list
+        :param kwargs: kwargs for the task as a dict
+        :param priority: tasks with a lower priority value run first
+        :param block: if the queue is full, wait for a free slot instead of raising queue.Full
+        :param timeout: how long to wait for a free slot before raising queue.Full
+        """
+        if self.is_joining:
+            raise RuntimeError('cannot submit a task to a pool that is joining')
+        if task is None or isinstance(task, bool) or not callable(task):
+            raise ValueError('task must be a callable, got {}'.format(type(task)))
+
+        future = Future()
+        self._put(future, (task, args, kwargs, None, None, None, None, None), priority, block, timeout)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _put(self, future, task, priority, block=True, timeout=None):
         self.task_lock.acquire()
         try:
-            self.tasks.append((task, args, kwargs, _task_callback, _err_callback, _err_args, _err_kwargs, _task_id))
+            if self.max_queue_size > 0:
+                if not block:
+                    timeout = 0
+                if not self.tasks_not_full.wait_for(lambda: len(self.tasks) < self.max_queue_size, timeout):
+                    raise queue.Full()
+            heapq.heappush(self.tasks, [priority, next(self._sequence), future, task, time.perf_counter()])
             self.ongoing_jobs += 1
-            return True
+            self.task_lock.notify()
+        finally:
+            self.task_lock.release()
+
+    def _discard(self, future: Future):
+        """Removes the task of a cancelled Future from the queue"""
+        if not future.cancelled():
+            return
+        self.task_lock.acquire()
+        try:
+            for i, entry in enumerate(self.tasks):
+                if entry[2] is future:
+                    self.tasks[i] = self.tasks[-1]
+                    self.tasks.pop()
+                    heapq.heapify(self.tasks)
+                    self.ongoing_jobs -= 1
+                    self.task_history.append(TaskRecord(_task_name(entry[3][0]), entry[4], None, None, 'cancelled'))
+                    self._notify_removed()
+                    break
         finally:
             self.task_lock.release()
 
-    def task_done(self):
+    def _notify_removed(self):
+        """Must be called with the task lock held, after a task has been taken off the queue"""
+        self.tasks_not_full.notify()
+        if not self.tasks:
+            self.tasks_empty.notify_all()
+
+    def task_done(self, record: TaskRecord = None):
         """
         Called by worker thread when a task is done (when the function called by the Worker returned)
+        :param record: what happened to the task
         """
         self.task_lock.acquire()
         try:
             if self.ongoing_jobs > 0:
                 self.ongoing_jobs -= 1
+            if self.active_workers > 0:
+                self.active_workers -= 1
+            if record is None:
+                return
+            self.task_history.append(record)
+            if record.duration is not None:
+                self.tasks_completed += 1
+                self.task_time_total += record.duration
+                self.task_time_max = max(self.task_time_max, record.duration)
         finally:
             self.task_lock.release()
 
-    def get_next_task(self):
-        """ Retrieve the next task from the task queue.  For use
-        only by ThreadPoolThread objects contained in the pool."""
+        if SENTRY and TASK_BREADCRUMBS:
+            SENTRY.add_crumb(
+                message='{}: {} {} (waited {:.1f} ms, ran {:.1f} ms)'.format(
+                    self.basename or 'ThreadPool', record.name, record.outcome,
+                    ((record.started or record.queued) - record.queued) * 1000, (record.duration or 0) * 1000,
+                ),
+                category='threadpool',
+                level='error' if record.outcome == 'error' else 'debug',
+            )
+
+    def task_stats(self) -> dict:
+        """
+        Aggregates the recent task history, by task name
 
+        Each entry holds the number of tasks, errors and cancellations, the 50th and 95th percentiles of the time
+        spent waiting in the queue and of the time spent running (in seconds), and the throughput (tasks per second
+        while tasks were running). The None key aggregates all tasks.
+        """
         self.task_lock.acquire()
         try:
-            if not self.tasks:
-                return None, None, None, None, None, None, None, None
-            else:
-                return self.tasks.pop(0)
+            records = list(self.task_history)
+        finally:
+            self.task_lock.release()
+        by_name = defaultdict(list)
+        for record in records:
+            by_name[record.name].append(record)
+        stats = {name: _aggregate(by_name[name]) for name in sorted(by_name)}
+        stats[None] = _aggregate(records)
+        return stats
+
+    def metrics(self) -> dict:
+        self.task_lock.acquire()
+        try:
+            return {
+                'threads': len(self.threads),
+                'queue_depth': len(self.tasks),
+                'active_workers': self.active_workers,
+                'tasks_completed': self.tasks_completed,
+                'task_time_total': round(self.task_time_total, 3),
+                'task_time_max': round(self.task_time_max, 3),
+            }
+        finally:
+            self.task_lock.release()
+
+    def get_next_task(self, thread: 'ThreadPoolThread'):
+        """ Retrieve the next task (as a (future, task, time queued)
+        tuple) from the task queue, waiting for one if the queue is empty.  Returns
+        None once the thread has been killed.  For use only by
+        ThreadPoolThread objects contained in the pool."""
+
+        self.task_lock.acquire()
+        try:
+            while not self.tasks and not thread.is_dying:
+                self.task_lock.wait()
+            if thread.is_dying:
+                return None
+            _, _, future, task, queued = heapq.heappop(self.tasks)
+            self.active_workers += 1
+            self._notify_removed()
+            return future, task, queued
+        finally:
+            self.task_lock.release()
+
+    def wake_threads(self):
+        """Wakes up all idle threads, so that the ones that have been killed can exit"""
+        self.task_lock.acquire()
+        try:
+            self.task_lock.notify_all()
         finally:
             self.task_lock.release()
 
@@ -160,20 +371,24 @@ class ThreadPool:
 
         # Wait for tasks to finish
         if wait_for_pending_tasks:
-            while self.tasks:
-                time.sleep(.1)
+            self.tasks_empty.acquire()
+            try:
+                while self.tasks:
+                    self.tasks_empty.wait()
+            finally:
+                self.tasks_empty.release()
 
         # Tell all the threads to quit
         self.resize_lock.acquire()
         try:
+            threads = list(self.threads)
             self.set_thread_count_no_lock(0)
             self.is_joining = True
 
             # Wait until all threads have exited
             if wait_for_running_tasks:
-                for t in self.threads:
+                for t in threads:
                     t.join()
-                    del t
 
             # Reset the pool for potential reuse
             self.is_joining = False
@@ -191,14 +406,12 @@ class ThreadPool:
 class ThreadPoolThread(threading.Thread):
     """ Pooled thread class. """
 
-    threadSleepTime = 0.1
-
     def __init__(self, _pool, _thread_name, _daemon):
         """ Initialize the thread and remember the pool. """
 
         threading.Thread.__init__(self, name=_thread_name, daemon=_daemon)
         self.__pool = _pool
-        self.__isDying = False
+        self.is_dying = False
         self.exc_info = None
 
     @staticmethod
@@ -212,6 +425,36 @@ class ThreadPoolThread(threading.Thread):
         else:
             return runnable()
 
+    @staticmethod
+    def __log_error(cmd, args, kwargs, exc_info):
+        LOGGER.error(
+            'caught error in worker thread:'
+            '\ncmd: {} args: {} kwargs: {}'
+            '\n{}'
+            '\n{}: {}'.format(
+                cmd, args, kwargs,
+                ''.join([x for x in traceback.format_tb(exc_info[2])]),
+                exc_info[0], exc_info[1]
+            )
+        )
+
+    def __run_future(self, future: Future, cmd, args, kwargs, *_):
+        try:
+            future.set_result(self.__run_with_optional_args(cmd, args, kwargs))
+            return True
+        except BaseException as exc:
+            if isinstance(exc, (SystemExit, KeyboardInterrupt)):
+                future.set_exception(exc)
+                import _thread
+                _thread.interrupt_main()
+            else:
+                # reported like the failures of queue_task; the caller still gets the exception through the Future
+                self.__log_error(cmd, args, kwargs, sys.exc_info())
+                if SENTRY:
+                    SENTRY.captureException(sys.exc_info())
+                future.set_exception(exc)
+            return False
+
     def __run(self, cmd, args, kwargs, callback, err_call_back, err_args, err_kwargs, task_id):
         # noinspection PyBroadException
         try:
@@ -221,6 +464,7 @@ class ThreadPoolThread(threading.Thread):
                     callback((task_id, return_value))
                 else:
                     callback(return_value)
+            return True
         except SystemExit:
             import _thread
             _thread.interrupt_main()
@@ -228,46 +472,159 @@ class ThreadPoolThread(threading.Thread):
             import _thread
             _thread.interrupt_main()
         except:
-            import sys
-
             if hasattr(sys, '_called_from_test'):
                 global test_exc
                 test_exc = sys.exc_info()
 
-            LOGGER.error(
-                'caught error in worker thread:'
-                '\ncmd: {} args: {} kwargs: {}'
-                '\n{}'
-                '\n{}: {}'.format(
-                    cmd, args, kwargs,
-                    ''.join([x for x in traceback.format_tb(sys.exc_info()[2])]),
-                    sys.exc_info()[0], sys.exc_info()[1]
-                )
-            )
+            self.__log_error(cmd, args, kwargs, sys.exc_info())
             if err_call_back:
                 self.__run_with_optional_args(err_call_back, err_args, err_kwargs)
             else:
                 if SENTRY:
                     SENTRY.captureException(sys.exc_info())
-        finally:
-            self.__pool.task_done()
+        return False
 
     def run(self):
         """ Until told to quit, retrieve the next task and execute
         it, calling the callback if any.  """
 
-        while not self.__isDying:
-            cmd, args, kwargs, callback, err_call_back, err_args, err_kwargs, task_id = self.__pool.get_next_task()
-            if cmd is None:
-                time.sleep(ThreadPoolThread.threadSleepTime)
-            else:
-                if SENTRY:
-                    with SENTRY.context:
-                        self.__run(cmd, args, kwargs, callback, err_call_back, err_args, err_kwargs, task_id)
-                else:
-                    self.__run(cmd, args, kwargs, callback, err_call_back, err_args, err_kwargs, task_id)
+        while True:
+            next_task = self.__pool.get_next_task(self)
+            if next_task is None:
+                return
+            future, task, queued = next_task
+            name = _task_name(task[0])
+            # the Future may have been cancelled after the task was taken off the queue
+            if future is not None and not future.set_running_or_notify_cancel():
+                self.__pool.task_done(TaskRecord(name, queued, None, None, 'cancelled'))
+                continue
+            start = time.perf_counter()
+            success = False
+            try:
+                with SENTRY.context if SENTRY else contextlib.suppress():
+                    if future is not None:
+                        success = self.__run_future(future, *task)
+                    else:
+                        success = self.__run(*task)
+            finally:
+                duration = time.perf_counter() - start
+                self.__pool.task_done(TaskRecord(name, queued, start, duration, 'success' if success else 'error'))
 
     def kill(self):
-        """ Exit the run loop next time through."""
+        """ Exit the run loop once the current task, if any, is done."""
+
+        self.is_dying = True
+        self.__pool.wake_threads()
+
 
-        self.__isDying = True
+# ----------------------------------------------
+# Executors shared by the whole process
+# ----------------------------------------------
+
+_EXECUTORS = {}
+_EXECUTORS_SETTINGS = {}
+_EXECUTORS_LOCK = threading.Lock()
+_PROCESS_EXECUTOR = None
+_PROCESS_EXECUTOR_WORKERS = None
+
+
+def configure_executor(name: str, num_threads: int = 1, daemon: bool = True, max_queue_size: int = 0):
+    """
+    Sets up the named thread pool returned by get_executor
+
+    Settings apply when the pool is created; a pool that already exists only changes its number of threads.
+    """
+    with _EXECUTORS_LOCK:
+        _EXECUTORS_SETTINGS[name] = dict(num_threads=num_threads, daemon=daemon, max_queue_size=max_queue_size)
+        if name in _EXECUTORS:
+            _EXECUTORS[name].set_thread_count(num_threads)
+
+
+def get_executor(name: str) -> ThreadPool:
+    """Returns the thread pool (for I/O bound work) registered under name, creating it on first use"""
+    with _EXECUTORS_LOCK:
+        if name not in _EXECUTORS:
+            settings = _EXECUTORS_SETTINGS.get(name, {})
+            _EXECUTORS[name] = ThreadPool(
+                settings.get('num_threads', 1), name, settings.get('daemon', True), settings.get('max_queue_size', 0)
+            )
+        return _EXECUTORS[name]
+
+
+def get_process_executor(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Returns the process pool for CPU bound work (decoding and encoding missions with SLTP, ...)
+
+    The pool is created on first use, and re-created if a different number of workers is asked for.
+    """
+    global _PROCESS_EXECUTOR, _PROCESS_EXECUTOR_WORKERS
+    with _EXECUTORS_LOCK:
+        if _PROCESS_EXECUTOR is not None and max_workers is not None and max_workers != _PROCESS_EXECUTOR_WORKERS:
+            _PROCESS_EXECUTOR.shutdown(wait=True)
+            _PROCESS_EXECUTOR = None
+        if _PROCESS_EXECUTOR is None:
+            _PROCESS_EXECUTOR_WORKERS = max_workers or os.cpu_count() or 1
+            _PROCESS_EXECUTOR = ProcessPoolExecutor(max_workers=_PROCESS_EXECUTOR_WORKERS)
+        return _PROCESS_EXECUTOR
+
+
+def executors_metrics() -> dict:
+    """Returns the metrics of all shared executors that have been created, by name"""
+    with _EXECUTORS_LOCK:
+        executors = dict(_EXECUTORS)
+        process_workers = _PROCESS_EXECUTOR_WORKERS if _PROCESS_EXECUTOR is not None else None
+    metrics = {name: executors[name].metrics() for name in sorted(executors)}
+    if process_workers is not None:
+        metrics['process'] = {'max_workers': process_workers}
+    return metrics
+
+
+def executors_task_stats() -> dict:
+    """Returns ThreadPool.task_stats() for all shared thread pools that have been created, by name"""
+    with _EXECUTORS_LOCK:
+        executors = dict(_EXECUTORS)
+    return {name: executors[name].task_stats() for name in sorted(executors)}
+
+
+def _format_ms(value: float) -> str:
+    return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def format_executors_stats() -> typing.List[str]:
+    """Describes the shared executors and their recent tasks, one line per executor and per task name"""
+    lines = []
+    task_stats = executors_task_stats()
+    for name, metrics in executors_metrics().items():
+        if name not in task_stats:
+            lines.append('{}: {}'.format(name, ', '.join('{}={}'.format(k, v) for k, v in metrics.items())))
+            continue
+        lines.append('{}: {} thread(s), {} queued, {} running'.format(
+            name, metrics['threads'], metrics['queue_depth'], metrics['active_workers']
+        ))
+        for task_name, stats in task_stats[name].items():
+            lines.append('    {}: {} task(s), {} error(s), {} cancelled, wait p50/p95 {}/{} ms, '
+                         'run p50/p95 {}/{} ms, {} task(s)/s'.format(
+                             task_name or 'all', stats['count'], stats['errors'], stats['cancelled'],
+                             _format_ms(stats['wait_p50']), _format_ms(stats['wait_p95']),
+                             _format_ms(stats['run_p50']), _format_ms(stats['run_p95']),
+                             '-' if stats['throughput'] is None else '{:.2f}'.format(stats['throughput']),
+                         ))
+    return lines
+
+
+def log_executors_metrics():
+    for line in format_executors_stats():
+        LOGGER.debug(line)
+
+
+def shutdown_executors(wait: bool = True):
+    """Stops all shared executors; they are created again if needed afterwards"""
+    global _PROCESS_EXECUTOR, _PROCESS_EXECUTOR_WORKERS
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+        process_executor, _PROCESS_EXECUTOR, _PROCESS_EXECUTOR_WORKERS = _PROCESS_EXECUTOR, None, None
+    for executor in executors:
+        executor.join_all(wait_for_pending_tasks=wait, wait_for_running_tasks=wait)
+    if process_executor is not None:
+        process_executor.shutdown(wait=wait)
@@ -2,7 +2,7 @@
 from PyQt5.QtCore import QObject, QThread, pyqtSignal
 
 from emft.core.logging import make_logger
-from emft.core.threadpool import ThreadPool
+from emft.core.threadpool import ThreadPool, configure_executor, get_executor
 from emft.gui.main_ui_threading_adapter import MainUiThreadingAdapter
 
 LOGGER = make_logger(__name__)
@@ -54,11 +54,11 @@ class MainUiThreading(MainUiThreadingAdapter):
             'thread': t,
             'worker': w,
         }
-        self.__pool = ThreadPool(1, 'main_ui', False)
+        configure_executor('main_ui', daemon=False)
 
     @property
     def pool(self) -> ThreadPool:
-        return self.__pool
+        return get_executor('main_ui')
 
     def _do(self, obj_name, func, args, kwargs):
         """
@@ -1,5 +1,6 @@
 # coding=utf-8
 
+import html
 import logging
 import typing
 
@@ -8,6 +9,7 @@ from emft.config import Config
 from emft.core import pastebin
 from emft.core.logging import PersistentLoggingFollower, persistent_logging_handler
 from emft.core.sentry import SENTRY
+from emft.core.threadpool import format_executors_stats
 from emft.gui.base import Combo, GridLayout, HLayout, Label, LineEdit, PlainTextEdit, PushButton, VLayout
 from emft.gui.main_ui_interface import I
 from emft.gui.main_ui_tab_widget import MainUiTabChild
@@ -63,6 +65,7 @@ class TabChildLog(MainUiTabChild, PersistentLoggingFollower, TabLogAdapter):
 
         self.clear_btn = PushButton('Clear log', self._clean)
         self.send_btn = PushButton('Send log', self._send)
+        self.pools_btn = PushButton('Thread pools', self._show_pools)
 
         self.setLayout(
             VLayout(
@@ -73,6 +76,7 @@ class TabChildLog(MainUiTabChild, PersistentLoggingFollower, TabLogAdapter):
                             20,
                             (self.clear_btn, dict(stretch=0)),
                             (self.send_btn, dict(stretch=0)),
+                            (self.pools_btn, dict(stretch=0)),
                         ]
                     ),
                     GridLayout(
@@ -142,6 +146,12 @@ class TabChildLog(MainUiTabChild, PersistentLoggingFollower, TabLogAdapter):
         else:
             self.tab_log_write('Could not send log file')
 
+    def _show_pools(self):
+        """Writes the state of the thread pools and the timings of their recent tasks"""
+        self.tab_log_write('Thread pools:', bold=True)
+        for line in format_executors_stats() or ['no thread pool has been used yet']:
+            self.tab_log_write(html.escape(line).replace(' ', '&nbsp;'))
+
     def _clean(self):
         self.log_text.clear()
         self.log_text.appendHtml('<b>Running EMFT v{}</b>'.format(__version__))
@@ -6,7 +6,7 @@ from emft.config import Config
 from emft.core.filesystem import saved_games_path
 from emft.core.logging import make_logger
 from emft.core.path import Path
-from emft.core.threadpool import ThreadPool
+from emft.core.threadpool import get_executor
 from emft.gui.base import BrowseDialog, HLayout, HSpacer, Label, PushButton, TableModel, TableProxy, TableView, \
     VLayout, VSpacer
 from emft.gui.main_ui_interface import I
@@ -104,8 +104,6 @@ class TabChildRoster(MainUiTabChild, TabRosterAdapter):
         self._roster_last_dir = Config().roster_roster_last_dir if \
             Config().roster_roster_last_dir and Path(Config().roster_roster_last_dir).exists() else None
 
-        self.pool = ThreadPool(1, 'roster_tab', True)
-
     @property
     def selected_left(self) -> typing.Generator[Roster.Pilot, None, None]:
         indexes = self.miz_table.selectedIndexes()
@@ -151,20 +149,6 @@ class TabChildRoster(MainUiTabChild, TabRosterAdapter):
             pilot_name = group.group_name
             aircraft = unit.unit_type
 
-            # line = [group.group_name, unit.unit_type, livery]
-
-            # start_pos = group.group_start_position
-            # # print(group.first_unit().unit_position)
-            # if start_pos == 'From Parking Area':
-            #     start_pos = parking_spots.unit_pos_to_spot(group.first_unit().unit_position)
-            #
-            #     if start_pos:
-            #         line.append('{start_pos.airport}: {start_pos.spot}'.format(start_pos=start_pos))
-            #     else:
-            #         raise Exception(group.group_id)
-            # else:
-            #     line.append(start_pos)
-
             miz_data[pilot_name] = Roster.Pilot(pilot_name, aircraft, livery)
 
         if len(miz_data) == 0:
@@ -238,10 +222,10 @@ class TabChildRoster(MainUiTabChild, TabRosterAdapter):
         self.miz_label.setText(miz.abspath())
 
         def decode_miz():
-            with Miz(miz.abspath()) as m:
+            with Miz(miz.abspath(), in_memory=True) as m:
                 self._miz = m.mission
 
-        self.pool.queue_task(
+        get_executor('roster_tab').queue_task(
             task=decode_miz,
             _task_callback=I.tab_roster_show_data_in_table
         )
@@ -1,6 +1,7 @@
 # coding=utf-8
 # pylint: disable=global-statement
 
+import multiprocessing
 import os
 
 import click
@@ -8,6 +9,7 @@ import click
 # noinspection PyUnresolvedReferences
 import emft.core.filter_warnings  # noqa: F401 # pylint: disable=unused-import
 # from emft import cli
+from emft.cli.reorder import reorder
 from emft.core import nice_exit
 
 LOGGER = None
@@ -90,7 +92,15 @@ def _another_instance_is_running():
     nice_exit()
 
 
-@click.group(invoke_without_command=True, chain=True)
+class _Main(click.Group):
+    def main(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        # Required by the process pool of the "reorder" command in the frozen executable, whichever way EMFT was
+        # started; it has to run before the command line is parsed, worker processes get arguments of their own
+        multiprocessing.freeze_support()
+        return super().main(*args, **kwargs)
+
+
+@click.group(cls=_Main, invoke_without_command=True, chain=True)
 @click.pass_context
 @click.option('-t', '--test', is_flag=True, help='Test and exit')
 @click.option('-p', '--profile', is_flag=True, help='Profile execution')
@@ -101,12 +111,16 @@ def main(ctx, test, profile, verbose, quiet):  # pylint: disable=too-many-locals
     # noinspection PyUnresolvedReferences
     from emft.core.sentry import SENTRY
     from emft.core.threadpool import register_sentry
-    register_sentry(SENTRY)
+    # a breadcrumb per finished task is only worth its cost when debugging
+    register_sentry(SENTRY, task_breadcrumbs=verbose)
 
     try:
         _setup_logger(verbose, quiet)
 
     except PermissionError:
+        if ctx.invoked_subcommand is not None:
+            # sub-commands run headless (e.g. in CI), they do not get a message box
+            raise click.ClickException('another instance of EMFT is already running')
         _another_instance_is_running()
 
     else:
@@ -153,7 +167,7 @@ def main(ctx, test, profile, verbose, quiet):  # pylint: disable=too-many-locals
                 if test:
                     LOGGER.critical('RUNNING IN TEST MODE')
                     import time
-                    from emft.core.threadpool import ThreadPool
+                    from emft.core.threadpool import get_executor
 
                     def test_hook():
                         LOGGER.critical('TEST MODE: waiting 10 seconds')
@@ -162,8 +176,7 @@ def main(ctx, test, profile, verbose, quiet):  # pylint: disable=too-many-locals
                         QT_APP.exit(0)
                         # nice_exit()
 
-                    pool = ThreadPool(1, 'test', _daemon=True)
-                    pool.queue_task(test_hook)
+                    get_executor('test').queue_task(test_hook)
 
                 exit_code = QT_APP.exec()
 
@@ -177,12 +190,16 @@ def main(ctx, test, profile, verbose, quiet):  # pylint: disable=too-many-locals
                 SENTRY.captureException()
                 exit_code = 1
 
+            from emft.core.threadpool import log_executors_metrics
+            log_executors_metrics()
+
             LOGGER.info('bye bye ! =)')
             nice_exit(exit_code)
 
 
 # main.add_command(cli.set_weather)
 # main.add_command(cli.set_time)
+main.add_command(reorder)
 
 if __name__ == '__main__':
     main()  # pylint: disable=no-value-for-parameter
@@ -1 +1,70 @@
-parkings = b'\x80\x03ccollections\ndefaultdict\nq\x00cbuiltins\ndict\nq\x01\x85q\x02Rq\x03(X\x08\x00\x00\x00Kutaisi q\x04}q\x05(K\x01G\xc1\x11[\x90 \x00\x00\x00GA$\xda\xdd\x00\x00\x00\x00\x86q\x06K\x02G\xc1\x11[o\x00\x00\x00\x00GA$\xdb\x16\xa0\x00\x00\x00\x86q\x07K\x03G\xc1\x11[N\x00\x00\x00\x00GA$\xdbP`\x00\x00\x00\x86q\x08K\x04G\xc1\x11[,\xe0\x00\x00\x00GA$\xdb\x8a\x00\x00\x00\x00\x86q\tK\x05G\xc1\x11[\x0b\xe0\x00\x00\x00GA$\xdb\xc3\xc0\x00\x00\x00\x86q\nK\x06G\xc1\x11Z\xea\xc0\x00\x00\x00GA$\xdb\xfd`\x00\x00\x00\x86q\x0bK\x07G\xc1\x11Z\xc9\xc0\x00\x00\x00GA$\xdc7\x00\x00\x00\x00\x86q\x0cK\x08G\xc1\x11Z\xa8\xa0\x00\x00\x00GA$\xdcp\xc0\x00\x00\x00\x86q\rK\tG\xc1\x11Z\x87\x80\x00\x00\x00GA$\xdc\xaa`\x00\x00\x00\x86q\x0eK\nG\xc1\x11Zf`\x00\x00\x00GA$\xdc\xe4 \x00\x00\x00\x86q\x0fK\x0bG\xc1\x11ZE`\x00\x00\x00GA$\xdd\x1d\xc0\x00\x00\x00\x86q\x10K\x0cG\xc1\x11Z$@\x00\x00\x00GA$\xddW`\x00\x00\x00\x86q\x11K\rG\xc1\x11]\x00\x00\x00\x00\x00GA$\xd3\xea\x00\x00\x00\x00\x86q\x12K\x0eG\xc1\x11]\x9e\xa0\x00\x00\x00GA$\xd3\x90\x00\x00\x00\x00\x86q\x13K\x0fG\xc1\x11^=@\x00\x00\x00GA$\xd36\x00\x00\x00\x00\x86q\x14K\x10G\xc1\x11^\xdc\x00\x00\x00\x00GA$\xd2\xdb\xc0\x00\x00\x00\x86q\x15K\x11G\xc1\x11wG\x00\x00\x00\x00GA$\xd8\x8a\xa0\x00\x00\x00\x86q\x16K\x12G\xc1\x11s\xd0\xe0\x00\x00\x00GA$\xd8B\x00\x00\x00\x00\x86q\x17K\x13G\xc1\x11u\xa7\x80\x00\x00\x00GA$\xd6\x92`\x00\x00\x00\x86q\x18K\x14G\xc1\x11sI\xa0\x00\x00\x00GA$\xd5\xe1`\x00\x00\x00\x86q\x19K\x15G\xc1\x11p\xff\xa0\x00\x00\x00GA$\xd7\x80`\x00\x00\x00\x86q\x1aK\x16G\xc1\x11`|\xa0\x00\x00\x00GA$\xd5\x89`\x00\x00\x00\x86q\x1bK\x17G\xc1\x11c\xa1\xc0\x00\x00\x00GA$\xd5\xfc@\x00\x00\x00\x86q\x1cK\x18G\xc1\x11_\xf8@\x00\x00\x00GA$\xd6p\x00\x00\x00\x00\x86q\x1dK\x19G\xc1\x11c\x1d\x80\x00\x00\x00GA$\xd6\xe3\x00\x00\x00\x00\x86q\x1eK\x1aG\xc1\x11_t\x00\x00\x00\x00GA$\xd7V\xc0\x00\x00\x00\x86q\x1fK\x1bG\xc1\x11b\x99 \x00\x00\x00GA$\xd7\xc9\xa0\x00\x00\x00\x86q K\x1cG\xc1\x11^\xcb\xe0\x00\x00\x00GA$\xd8\x1b \x00\x00\x00\x86q!K\x1dG\xc1\x11a?\x80\x00\x00\x00GA$\xd90@\x00\x00\x00\x86q"K\x1eG\xc1\x11]\x8d\xc0\x00\x00\x00GA$\xd8\xce\xe0\x00\x00\x00\x86q#K\x1fG\xc1\x11`\x01`\x00\x00\x00GA$\xd9\xe4\x00\x00\x00\x00\x86q$K G\xc1\x11\\O\xc0\x00\x00\x00GA$\xd9\x82\xa0\x00\x00\x00\x86q%K!G\xc1\x11^\xc3`\x00\x00\x00GA$\xda\x97\xc0\x00\x00\x00\x86q&K"G\xc1\x11]\xee`\x00\x00\x00GA$\xdb3\xc0\x00\x00\x00\x86q\'K#G\xc1\x11]j \x00\x00\x00GA$\xdc\x1a\x80\x00\x00\x00\x86q(K$G\xc1\x11\\\xe5\xc0\x00\x00\x00GA$\xdd\x01 \x00\x00\x00\x86q)K%G\xc1\x11Y\x19`\x00\x00\x00GA$\xdd\xb4\xa0\x00\x00\x00\x86q*K&G\xc1\x11\\>\x80\x00\x00\x00GA$\xde\'\x80\x00\x00\x00\x86q+K\'G\xc1\x11X\x95\x00\x00\x00\x00GA$\xde\x9b@\x00\x00\x00\x86q,K(G\xc1\x11[\xba@\x00\x00\x00GA$\xdf\x0e@\x00\x00\x00\x86q-K)G\xc1\x11X\x10\xc0\x00\x00\x00GA$\xdf\x82\x00\x00\x00\x00\x86q.K*G\xc1\x11[5\xe0\x00\x00\x00GA$\xdf\xf4\xe0\x00\x00\x00\x86q/K+G\xc1\x11W\xf3@\x00\x00\x00GA$\xe0\xf4\xa0\x00\x00\x00\x86q0K,G\xc1\x11[- \x00\x00\x00GA$\xe0\xaf \x00\x00\x00\x86q1K-G\xc1\x11XB\x80\x00\x00\x00GA$\xe1\xe1`\x00\x00\x00\x86q2K.G\xc1\x11[|@\x00\x00\x00GA$\xe1\x9b\xc0\x00\x00\x00\x86q3K/G\xc1\x11X\x91\xc0\x00\x00\x00GA$\xe2\xce\x00\x00\x00\x00\x86q4K0G\xc1\x11[\xcb\xa0\x00\x00\x00GA$\xe2\x88\x80\x00\x00\x00\x86q5K1G\xc1\x11Xk\x00\x00\x00\x00GA$\xe3\x9b@\x00\x00\x00\x86q6K2G\xc1\x11[\x90 \x00\x00\x00GA$\xe4\x0e \x00\x00\x00\x86q7K3G\xc1\x11W\xe6\xa0\x00\x00\x00GA$\xe4\x81\xe0\x00\x00\x00\x86q8K4G\xc1\x11[\x0b\xe0\x00\x00\x00GA$\xe4\xf4\xe0\x00\x00\x00\x86q9K5G\xc1\x11Wb`\x00\x00\x00GA$\xe5h\xa0\x00\x00\x00\x86q:K6G\xc1\x11Z\x87\x80\x00\x00\x00GA$\xe5\xdb\x80\x00\x00\x00\x86q;K7G\xc1\x11X\xef`\x00\x00\x00GA$\xe8\x18 \x00\x00\x00\x86q<K8G\xc1\x11UW\xc0\x00\x00\x00GA$\xe7L`\x00\x00\x00\x86q=K9G\xc1\x11Wl \x00\x00\x00GA$\xe8\xf3 \x00\x00\x00\x86q>K:G\xc1\x11T\xc6\xa0\x00\x00\x00GA$\xe9\x07\x80\x00\x00\x00\x86q?uX\t\x00\x00\x00Soganlug q@}qA(K\x01G\xc1\x13q\x02@\x00\x00\x00GA+Vm\x80\x00\x00\x00\x86qBK\x02G\xc1\x13i\x8f \x00\x00\x00GA+S\x89`\x00\x00\x00\x86qCK\x03G\xc1\x13i\x01 \x00\x00\x00GA+S;\xe0\x00\x00\x00\x86qDK\x04G\xc1\x13h\x9f`\x00\x00\x00GA+S\x0e\x80\x00\x00\x00\x86qEK\x05G\xc1\x13Z\xfa \x00\x00\x00GA+I\xc4\x80\x00\x00\x00\x86qFuX\x08\x00\x00\x00Vaziani qG}qH(K\x01G\xc1\x13i\x81\x80\x00\x00\x00GA+\x8a\x97 \x00\x00\x00\x86qIK\x02G\xc1\x13j#\xc0\x00\x00\x00GA+\x8a\xe4\xe0\x00\x00\x00\x86qJK\x03G\xc1\x13j\xb3\x00\x00\x00\x00GA+\x8b*`\x00\x00\x00\x86qKK\x04G\xc1\x13k]@\x00\x00\x00GA+\x8b\x7f\xe0\x00\x00\x00\x86qLK\x05G\xc1\x13\x85\xca \x00\x00\x00GA+\x97\xbe\x00\x00\x00\x00\x86qMK\x06G\xc1\x13\x85\x80\x80\x00\x00\x00GA+\x97\xee\xc0\x00\x00\x00\x86qNK\x07G\xc1\x13\x854@\x00\x00\x00GA+\x98\x1e@\x00\x00\x00\x86qOK\x08G\xc1\x13\x84\x9e@\x00\x00\x00GA+\x98_ \x00\x00\x00\x86qPK\tG\xc1\x13\x84%\x00\x00\x00\x00GA+\x98\xa6`\x00\x00\x00\x86qQK\nG\xc1\x13i\xae \x00\x00\x00GA+\x8b\xdf`\x00\x00\x00\x86qRK\x0bG\xc1\x13h\xa7`\x00\x00\x00GA+\x8ck\xc0\x00\x00\x00\x86qSK\x0cG\xc1\x13g\x8c@\x00\x00\x00GA+\x8b\xa2\xa0\x00\x00\x00\x86qTK\rG\xc1\x13g\xbf\xa0\x00\x00\x00GA+\x8cu\xe0\x00\x00\x00\x86qUK\x0eG\xc1\x13f\xb1 \x00\x00\x00GA+\x8bw@\x00\x00\x00\x86qVK\x0fG\xc1\x13f\xe6\xa0\x00\x00\x00GA+\x8dA`\x00\x00\x00\x86qWK\x10G\xc1\x13g\xef@\x00\x00\x00GA+\x8d\xba`\x00\x00\x00\x86qXK\x11G\xc1\x13f\xd8\xe0\x00\x00\x00GA+\x8d\xff@\x00\x00\x00\x86qYK\x12G\xc1\x13f7`\x00\x00\x00GA+\x8d\xe0\xe0\x00\x00\x00\x86qZK\x13G\xc1\x13d\xa5\xa0\x00\x00\x00GA+\x8d?\xe0\x00\x00\x00\x86q[K\x14G\xc1\x13d\x00\x00\x00\x00\x00GA+\x8d\'\x80\x00\x00\x00\x86q\\K\x15G\xc1\x13b\xf4\x80\x00\x00\x00GA+\x8dv`\x00\x00\x00\x86q]K\x16G\xc1\x13d\r\xe0\x00\x00\x00GA+\x8d\xe5 \x00\x00\x00\x86q^K\x17G\xc1\x13b\xed\xc0\x00\x00\x00GA+\x90\x1c@\x00\x00\x00\x86q_K\x18G\xc1\x13bH\x00\x00\x00\x00GA+\x90\x03\xe0\x00\x00\x00\x86q`K\x19G\xc1\x13a<\xa0\x00\x00\x00GA+\x90R\xc0\x00\x00\x00\x86qaK\x1aG\xc1\x13bU\xe0\x00\x00\x00GA+\x90\xc1\x80\x00\x00\x00\x86qbK\x1bG\xc1\x13e\x1b\xe0\x00\x00\x00GA+\x90\xe0`\x00\x00\x00\x86qcK\x1cG\xc1\x13f|\xc0\x00\x00\x00GA+\x90\xbf\xe0\x00\x00\x00\x86qdK\x1dG\xc1\x13e\xda@\x00\x00\x00GA+\x90<\x00\x00\x00\x00\x86qeK\x1eG\xc1\x13e0`\x00\x00\x00GA+\x90*\xa0\x00\x00\x00\x86qfK\x1fG\xc1\x13ko\x80\x00\x00\x00GA+\x8cu\xa0\x00\x00\x00\x86qgK G\xc1\x13l\xa4\xe0\x00\x00\x00GA+\x8c\xa2\xa0\x00\x00\x00\x86qhK!G\xc1\x13kF \x00\x00\x00GA+\x8dt\x80\x00\x00\x00\x86qiK"G\xc1\x13m\xb6\x00\x00\x00\x00GA+\x8dz`\x00\x00\x00\x86qjK#G\xc1\x13lz\x80\x00\x00\x00GA+\x8d\xf0 \x00\x00\x00\x86qkK$G\xc1\x13n\x91@\x00\x00\x00GA+\x8d\xc9@\x00\x00\x00\x86qlK%G\xc1\x13m\x8e\xe0\x00\x00\x00GA+\x8ex@\x00\x00\x00\x86qmK&G\xc1\x13p\t\xc0\x00\x00\x00GA+\x8e\xa5 \x00\x00\x00\x86qnK\'G\xc1\x13n\xd0\xa0\x00\x00\x00GA+\x8f_\xe0\x00\x00\x00\x86qoK(G\xc1\x13p\xcf\xe0\x00\x00\x00GA+\x8f\x83\x00\x00\x00\x00\x86qpK)G\xc1\x13n\xad`\x00\x00\x00GA+\x8f\xef@\x00\x00\x00\x86qqK*G\xc1\x13o\xfb\xc0\x00\x00\x00GA+\x90Q@\x00\x00\x00\x86qrK+G\xc1\x13s\x9c\x80\x00\x00\x00GA+\x90\x9f\xc0\x00\x00\x00\x86qsK,G\xc1\x13r\x8e\xc0\x00\x00\x00GA+\x90\x98\xc0\x00\x00\x00\x86qtK-G\xc1\x13r\x12\xe0\x00\x00\x00GA+\x90O`\x00\x00\x00\x86quK.G\xc1\x13r\x04\xc0\x00\x00\x00GA+\x911\xa0\x00\x00\x00\x86qvK/G\xc1\x13p= \x00\x00\x00GA+\x90\xea\xe0\x00\x00\x00\x86qwK0G\xc1\x13r/\x00\x00\x00\x00GA+\x91\xec\x00\x00\x00\x00\x86qxK1G\xc1\x13p[\x80\x00\x00\x00GA+\x91\xa4\xa0\x00\x00\x00\x86qyK2G\xc1\x13pf`\x00\x00\x00GA+\x92\xa9\xa0\x00\x00\x00\x86qzK3G\xc1\x13q\xaa\xa0\x00\x00\x00GA+\x93\x19\x00\x00\x00\x00\x86q{K4G\xc1\x13r\xe7\xc0\x00\x00\x00GA+\x93\xfe \x00\x00\x00\x86q|K5G\xc1\x13s\xdf\xa0\x00\x00\x00GA+\x93\x00\xc0\x00\x00\x00\x86q}K6G\xc1\x13t\x83\xc0\x00\x00\x00GA+\x92\xb2\xa0\x00\x00\x00\x86q~K7G\xc1\x13u\xc3 \x00\x00\x00GA+\x92\xfe\x80\x00\x00\x00\x86q\x7fK8G\xc1\x13u;\x00\x00\x00\x00GA+\x93Z\xa0\x00\x00\x00\x86q\x80K9G\xc1\x13u\x98\xa0\x00\x00\x00GA+\x93\xb8`\x00\x00\x00\x86q\x81K:G\xc1\x13t\xe3\x00\x00\x00\x00GA+\x94\x8c\x00\x00\x00\x00\x86q\x82K;G\xc1\x13v\xfb`\x00\x00\x00GA+\x94\x15\xe0\x00\x00\x00\x86q\x83K<G\xc1\x13u\xf5 \x00\x00\x00GA+\x95\x0e \x00\x00\x00\x86q\x84K=G\xc1\x13w\x04@\x00\x00\x00GA+\x95]`\x00\x00\x00\x86q\x85K>G\xc1\x13w\xa3\xc0\x00\x00\x00GA+\x94\xb9\x80\x00\x00\x00\x86q\x86K?G\xc1\x13x\x8b\x80\x00\x00\x00GA+\x94\xac\x80\x00\x00\x00\x86q\x87K@G\xc1\x13y\x83 \x00\x00\x00GA+\x94\xbb\x00\x00\x00\x00\x86q\x88KAG\xc1\x13x\xcd\x00\x00\x00\x00GA+\x95\xcd@\x00\x00\x00\x86q\x89KBG\xc1\x13zT\xe0\x00\x00\x00GA+\x95\x92\x00\x00\x00\x00\x86q\x8aKCG\xc1\x13z}\x00\x00\x00\x00GA+\x94\xda\xa0\x00\x00\x00\x86q\x8bKDG\xc1\x13{a \x00\x00\x00GA+\x95\x00@\x00\x00\x00\x86q\x8cKEG\xc1\x13{\xde\xc0\x00\x00\x00GA+\x95\xc4 \x00\x00\x00\x86q\x8dKFG\xc1\x13|\xd1\xe0\x00\x00\x00GA+\x95=\xc0\x00\x00\x00\x86q\x8eKGG\xc1\x13}\xb3\xe0\x00\x00\x00GA+\x95w\x80\x00\x00\x00\x86q\x8fKHG\xc1\x13~n`\x00\x00\x00GA+\x95\xcb\xa0\x00\x00\x00\x86q\x90KIG\xc1\x13\x7f\x10`\x00\x00\x00GA+\x96- \x00\x00\x00\x86q\x91KJG\xc1\x13\x81\x1f@\x00\x00\x00GA+\x97>\xc0\x00\x00\x00\x86q\x92KKG\xc1\x13\x7f\xfc \x00\x00\x00GA+\x96\xc3@\x00\x00\x00\x86q\x93KLG\xc1\x13\x7fP\xe0\x00\x00\x00GA+\x97* \x00\x00\x00\x86q\x94KMG\xc1\x13\x80e\x00\x00\x00\x00GA+\x97\xac`\x00\x00\x00\x86q\x95KNG\xc1\x13\x81\xbc\xa0\x00\x00\x00GA+\x98<\xc0\x00\x00\x00\x86q\x96KOG\xc1\x13\x82\x1c@\x00\x00\x00GA+\x98b\x80\x00\x00\x00\x86q\x97KPG\xc1\x13x\xcb`\x00\x00\x00GA+\x96]\xc0\x00\x00\x00\x86q\x98KQG\xc1\x13z@\xa0\x00\x00\x00GA+\x96\xce@\x00\x00\x00\x86q\x99KRG\xc1\x13z\xf1\x00\x00\x00\x00GA+\x96\xcd\xa0\x00\x00\x00\x86q\x9aKSG\xc1\x13{\xbb\x00\x00\x00\x00GA+\x96\xeb\xa0\x00\x00\x00\x86q\x9bKTG\xc1\x13|\xeb \x00\x00\x00GA+\x97J\xe0\x00\x00\x00\x86q\x9cKUG\xc1\x13|F\xe0\x00\x00\x00GA+\x97\x98\xc0\x00\x00\x00\x86q\x9dKVG\xc1\x13{@\xc0\x00\x00\x00GA+\x97\xbc\x00\x00\x00\x00\x86q\x9eKWG\xc1\x13zs@\x00\x00\x00GA+\x97\x81 \x00\x00\x00\x86q\x9fKXG\xc1\x13z<\x00\x00\x00\x00GA+\x97\xea\x80\x00\x00\x00\x86q\xa0KYG\xc1\x13y\xe1\x00\x00\x00\x00GA+\x98H\x00\x00\x00\x00\x86q\xa1KZG\xc1\x13y\x11 \x00\x00\x00GA+\x98\xde\xe0\x00\x00\x00\x86q\xa2K[G\xc1\x13xI\xa0\x00\x00\x00GA+\x98\x85\xc0\x00\x00\x00\x86q\xa3K\\G\xc1\x13}\x02`\x00\x00\x00GA+\x968\xa0\x00\x00\x00\x86q\xa4uX\x08\x00\x00\x00Tbilisi q\xa5}q\xa6(K\x01G\xc1\x138$`\x00\x00\x00GA+\\T\x00\x00\x00\x00\x86q\xa7K\x02G\xc1\x137\xae \x00\x00\x00GA+\\|\x80\x00\x00\x00\x86q\xa8K\x03G\xc1\x1377\xe0\x00\x00\x00GA+\\\xa5\x00\x00\x00\x00\x86q\xa9K\x04G\xc1\x136\xc1\xa0\x00\x00\x00GA+\\\xcd\x80\x00\x00\x00\x86q\xaaK\x05G\xc1\x136K`\x00\x00\x00GA+\\\xf6\x00\x00\x00\x00\x86q\xabK\x06G\xc1\x137-`\x00\x00\x00GA+]\x9a\xe0\x00\x00\x00\x86q\xacK\x07G\xc1\x137\xa3\xa0\x00\x00\x00GA+]r`\x00\x00\x00\x86q\xadK\x08G\xc1\x138\x90 \x00\x00\x00GA+]!`\x00\x00\x00\x86q\xaeK\tG\xc1\x138\x19\xe0\x00\x00\x00GA+]I\xe0\x00\x00\x00\x86q\xafK\nG\xc1\x139\x06`\x00\x00\x00GA+\\\xf8\xe0\x00\x00\x00\x86q\xb0K\x0bG\xc1\x138\x0f`\x00\x00\x00GA+^?\xe0\x00\x00\x00\x86q\xb1K\x0cG\xc1\x138\x85\xa0\x00\x00\x00GA+^\x17`\x00\x00\x00\x86q\xb2K\rG\xc1\x139r \x00\x00\x00GA+]\xc6`\x00\x00\x00\x86q\xb3K\x0eG\xc1\x138\xfb\xe0\x00\x00\x00GA+]\xee\xe0\x00\x00\x00\x86q\xb4K\x0fG\xc1\x139\xe8`\x00\x00\x00GA+]\x9d\xe0\x00\x00\x00\x86q\xb5K\x10G\xc1\x138\xf1\x80\x00\x00\x00GA+^\xe4\xe0\x00\x00\x00\x86q\xb6K\x11G\xc1\x139g\xc0\x00\x00\x00GA+^\xbc`\x00\x00\x00\x86q\xb7K\x12G\xc1\x13:T@\x00\x00\x00GA+^k`\x00\x00\x00\x86q\xb8K\x13G\xc1\x139\xde\x00\x00\x00\x00GA+^\x93\xe0\x00\x00\x00\x86q\xb9K\x14G\xc1\x13:\xca\x80\x00\x00\x00GA+^B\xe0\x00\x00\x00\x86q\xbaK\x15G\xc1\x139\xd3\x80\x00\x00\x00GA+_\x89\xe0\x00\x00\x00\x86q\xbbK\x16G\xc1\x13:I\xc0\x00\x00\x00GA+_a`\x00\x00\x00\x86q\xbcK\x17G\xc1\x13;6@\x00\x00\x00GA+_\x10`\x00\x00\x00\x86q\xbdK\x18G\xc1\x13:\xc0\x00\x00\x00\x00GA+_8\xe0\x00\x00\x00\x86q\xbeK\x19G\xc1\x13;\xac\x80\x00\x00\x00GA+^\xe7\xe0\x00\x00\x00\x86q\xbfK\x1aG\xc1\x13:\xb5\x80\x00\x00\x00GA+`/\x00\x00\x00\x00\x86q\xc0K\x1bG\xc1\x13;+\xc0\x00\x00\x00GA+`\x06\x80\x00\x00\x00\x86q\xc1K\x1cG\xc1\x13<\x18@\x00\x00\x00GA+_\xb5\x80\x00\x00\x00\x86q\xc2K\x1dG\xc1\x13;\xa2\x00\x00\x00\x00GA+_\xde\x00\x00\x00\x00\x86q\xc3K\x1eG\xc1\x13<\x8e\x80\x00\x00\x00GA+_\x8d\x00\x00\x00\x00\x86q\xc4K\x1fG\xc1\x13;\x97\xa0\x00\x00\x00GA+`\xd4\x00\x00\x00\x00\x86q\xc5K G\xc1\x13<\r\xe0\x00\x00\x00GA+`\xab\x80\x00\x00\x00\x86q\xc6K!G\xc1\x13<\xfa`\x00\x00\x00GA+`Z\x80\x00\x00\x00\x86q\xc7K"G\xc1\x13<\x84 \x00\x00\x00GA+`\x83\x00\x00\x00\x00\x86q\xc8K#G\xc1\x13=p\xa0\x00\x00\x00GA+`2\x00\x00\x00\x00\x86q\xc9K$G\xc1\x13<y\xa0\x00\x00\x00GA+ay\x00\x00\x00\x00\x86q\xcaK%G\xc1\x13<\xef\xe0\x00\x00\x00GA+aP\x80\x00\x00\x00\x86q\xcbK&G\xc1\x13=\xdc`\x00\x00\x00GA+`\xff\x80\x00\x00\x00\x86q\xccK\'G\xc1\x13=f \x00\x00\x00GA+a(\x00\x00\x00\x00\x86q\xcdK*G\xc1\x139\xbb\xa0\x00\x00\x00GA+\\V\x00\x00\x00\x00\x86q\xceK+G\xc1\x13: \x80\x00\x00\x00GA+\\7\x80\x00\x00\x00\x86q\xcfK,G\xc1\x139\x9d@\x00\x00\x00GA+[\xa6 \x00\x00\x00\x86q\xd0K-G\xc1\x139;\xe0\x00\x00\x00GA+[\xc5\xc0\x00\x00\x00\x86q\xd1K.G\xc1\x138\xf1`\x00\x00\x00GA+[\x0b\xe0\x00\x00\x00\x86q\xd2K/G\xc1\x138T \x00\x00\x00GA+[?`\x00\x00\x00\x86q\xd3K0G\xc1\x13:\x88\x00\x00\x00\x00GA+\\\x1b\x00\x00\x00\x00\x86q\xd4K1G\xc1\x136Q \x00\x00\x00GA+[\xef\x00\x00\x00\x00\x86q\xd5K2G\xc1\x135\xda\xe0\x00\x00\x00GA+\\\x17\x80\x00\x00\x00\x86q\xd6K3G\xc1\x135d\x80\x00\x00\x00GA+\\?\xe0\x00\x00\x00\x86q\xd7K4G\xc1\x13.C`\x00\x00\x00GA+X#\xe0\x00\x00\x00\x86q\xd8K5G\xc1\x13.\x86\xa0\x00\x00\x00GA+W_\xe0\x00\x00\x00\x86q\xd9K6G\xc1\x13/\x19\x00\x00\x00\x00GA+W)`\x00\x00\x00\x86q\xdaK7G\xc1\x13/\x99 \x00\x00\x00GA+V\xec@\x00\x00\x00\x86q\xdbK8G\xc1\x130D`\x00\x00\x00GA+V\xa6\x80\x00\x00\x00\x86q\xdcK9G\xc1\x130\xda\x00\x00\x00\x00GA+V\x19\x80\x00\x00\x00\x86q\xddK:G\xc1\x131\xca \x00\x00\x00GA+V\xa0\xe0\x00\x00\x00\x86q\xdeK?G\xc1\x13/\xa4@\x00\x00\x00GA+U%\x00\x00\x00\x00\x86q\xdfK@G\xc1\x130\x0e\xc0\x00\x00\x00GA+T\xfb\xa0\x00\x00\x00\x86q\xe0KAG\xc1\x130k\xc0\x00\x00\x00GA+T\xd6@\x00\x00\x00\x86q\xe1KBG\xc1\x130\xd3\xe0\x00\x00\x00GA+T\xad\x80\x00\x00\x00\x86q\xe2KCG\xc1\x130\x08\x80\x00\x00\x00GA+Tb\xa0\x00\x00\x00\x86q\xe3KDG\xc1\x13/X\xa0\x00\x00\x00GA+T4\xc0\x00\x00\x00\x86q\xe4KEG\xc1\x13.%\x80\x00\x00\x00GA+S\xec@\x00\x00\x00\x86q\xe5KFG\xc1\x13/P`\x00\x00\x00GA+V\x03\xc0\x00\x00\x00\x86q\xe6KGG\xc1\x13.\xf5\x00\x00\x00\x00GA+V/\xe0\x00\x00\x00\x86q\xe7KHG\xc1\x13.i\xa0\x00\x00\x00GA+Vk\xa0\x00\x00\x00\x86q\xe8KIG\xc1\x13.\n \x00\x00\x00GA+W\x95\x00\x00\x00\x00\x86q\xe9KJG\xc1\x13/\x82\x80\x00\x00\x00GA+W\xe7@\x00\x00\x00\x86q\xeaKMG\xc1\x130\x93\x00\x00\x00\x00GA+Wt`\x00\x00\x00\x86q\xebKNG\xc1\x130\x14\x80\x00\x00\x00GA+W\xb5 \x00\x00\x00\x86q\xecuX\x07\x00\x00\x00Senaki q\xed}q\xee(K\x01G\xc1\x110L \x00\x00\x00GA#\xb9\xe3@\x00\x00\x00\x86q\xefK\x02G\xc1\x11/\xa6 \x00\x00\x00GA#\xba=\xa0\x00\x00\x00\x86q\xf0K\x03G\xc1\x11/\t \x00\x00\x00GA#\xba\x94\xe0\x00\x00\x00\x86q\xf1K\x04G\xc1\x11._\xa0\x00\x00\x00GA#\xba\xf1 \x00\x00\x00\x86q\xf2K\x05G\xc1\x11-\xc6\x00\x00\x00\x00GA#\xbbF`\x00\x00\x00\x86q\xf3K\x06G\xc1\x11-\xeb\xa0\x00\x00\x00GA#\xb9\xf9\x00\x00\x00\x00\x86q\xf4K\x07G\xc1\x11,\xbd`\x00\x00\x00GA#\xb8P\x00\x00\x00\x00\x86q\xf5K\x08G\xc1\x11,\x1b\xe0\x00\x00\x00GA#\xb7\xaa@\x00\x00\x00\x86q\xf6K\tG\xc1\x11+A`\x00\x00\x00GA#\xb8^\x00\x00\x00\x00\x86q\xf7K\nG\xc1\x11*> \x00\x00\x00GA#\xb8\x82\xc0\x00\x00\x00\x86q\xf8K\x0bG\xc1\x11)\xf1\x00\x00\x00\x00GA#\xb8\xd1\xc0\x00\x00\x00\x86q\xf9K\x0cG\xc1\x11)\xf6\xa0\x00\x00\x00GA#\xb9y@\x00\x00\x00\x86q\xfaK\rG\xc1\x11*\xf5\x00\x00\x00\x00GA#\xb9\xaf\xa0\x00\x00\x00\x86q\xfbK\x0eG\xc1\x11,T\xc0\x00\x00\x00GA#\xbb\x9b\xc0\x00\x00\x00\x86q\xfcK\x0fG\xc1\x11+\xe7\xe0\x00\x00\x00GA#\xbcL\x80\x00\x00\x00\x86q\xfdK\x10G\xc1\x11,\x8d\x80\x00\x00\x00GA#\xbc\xc9`\x00\x00\x00\x86q\xfeK\x11G\xc1\x11*\xfc\xa0\x00\x00\x00GA#\xbc\xcd\xe0\x00\x00\x00\x86q\xffK\x12G\xc1\x11)\xb9\xc0\x00\x00\x00GA#\xbc\xd4\xe0\x00\x00\x00\x86r\x00\x01\x00\x00K\x13G\xc1\x11)\x9e@\x00\x00\x00GA#\xbd\x8e@\x00\x00\x00\x86r\x01\x01\x00\x00K\x14G\xc1\x11(i\xc0\x00\x00\x00GA#\xbd\xb1 \x00\x00\x00\x86r\x02\x01\x00\x00K\x15G\xc1\x11&\xd2\xa0\x00\x00\x00GA#\xbeO\x80\x00\x00\x00\x86r\x03\x01\x00\x00K\x16G\xc1\x11)P\xe0\x00\x00\x00GA#\xbf+@\x00\x00\x00\x86r\x04\x01\x00\x00K\x17G\xc1\x11)\xe1\xe0\x00\x00\x00GA#\xbe\x9a@\x00\x00\x00\x86r\x05\x01\x00\x00K\x18G\xc1\x11*]\xa0\x00\x00\x00GA#\xbd\xfd \x00\x00\x00\x86r\x06\x01\x00\x00K\x19G\xc1\x11+(\x80\x00\x00\x00GA#\xbe\x96\xe0\x00\x00\x00\x86r\x07\x01\x00\x00K\x1aG\xc1\x11+\xde\x80\x00\x00\x00GA#\xbe\x80\xa0\x00\x00\x00\x86r\x08\x01\x00\x00K\x1bG\xc1\x11,\xa7 \x00\x00\x00GA#\xbe\x18`\x00\x00\x00\x86r\t\x01\x00\x00K\x1cG\xc1\x11, `\x00\x00\x00GA#\xbd\xbf\xc0\x00\x00\x00\x86r\n\x01\x00\x00K\x1dG\xc1\x11.\x8a \x00\x00\x00GA#\xbc\x98\xa0\x00\x00\x00\x86r\x0b\x01\x00\x00K\x1eG\xc1\x11,\xcc@\x00\x00\x00GA#\xbdq\xc0\x00\x00\x00\x86r\x0c\x01\x00\x00K\x1fG\xc1\x11-t\xc0\x00\x00\x00GA#\xc2M \x00\x00\x00\x86r\r\x01\x00\x00K G\xc1\x11,\xc1@\x00\x00\x00GA#\xc3\x01`\x00\x00\x00\x86r\x0e\x01\x00\x00K!G\xc1\x11,\xb8\xa0\x00\x00\x00GA#\xc1\xe3`\x00\x00\x00\x86r\x0f\x01\x00\x00K"G\xc1\x11+I\xe0\x00\x00\x00GA#\xc2H`\x00\x00\x00\x86r\x10\x01\x00\x00K#G\xc1\x11+\xf2\x00\x00\x00\x00GA#\xc1\xb6\xc0\x00\x00\x00\x86r\x11\x01\x00\x00K$G\xc1\x11,p\xc0\x00\x00\x00GA#\xc1n\xa0\x00\x00\x00\x86r\x12\x01\x00\x00K&G\xc1\x11+\xce\xa0\x00\x00\x00GA#\xc0\xb8@\x00\x00\x00\x86r\x13\x01\x00\x00K\'G\xc1\x11*\x8c@\x00\x00\x00GA#\xc2\t@\x00\x00\x00\x86r\x14\x01\x00\x00K(G\xc1\x11)\x13\xa0\x00\x00\x00GA#\xc1d`\x00\x00\x00\x86r\x15\x01\x00\x00K)G\xc1\x11*\x83\xa0\x00\x00\x00GA#\xc0\xeb@\x00\x00\x00\x86r\x16\x01\x00\x00K*G\xc1\x11(A\x80\x00\x00\x00GA#\xc1\x17\x80\x00\x00\x00\x86r\x17\x01\x00\x00K+G\xc1\x11(\xbc \x00\x00\x00GA#\xc0X`\x00\x00\x00\x86r\x18\x01\x00\x00K,G\xc1\x11)!`\x00\x00\x00GA#\xbf\xfa\x80\x00\x00\x00\x86r\x19\x01\x00\x00K-G\xc1\x11)\xc7`\x00\x00\x00GA#\xbf\xae@\x00\x00\x00\x86r\x1a\x01\x00\x00K.G\xc1\x11*\xc5\xa0\x00\x00\x00GA#\xbf\xa8\xe0\x00\x00\x00\x86r\x1b\x01\x00\x00K/G\xc1\x11*\x9c`\x00\x00\x00GA#\xc0H\x00\x00\x00\x00\x86r\x1c\x01\x00\x00K0G\xc1\x11-p\x80\x00\x00\x00GA#\xc3\xa2`\x00\x00\x00\x86r\x1d\x01\x00\x00K1G\xc1\x11/\x8a\xa0\x00\x00\x00GA#\xc3\xe2 \x00\x00\x00\x86r\x1e\x01\x00\x00K2G\xc1\x11-\xdc`\x00\x00\x00GA#\xc4\x01 \x00\x00\x00\x86r\x1f\x01\x00\x00K3G\xc1\x110\x15\x80\x00\x00\x00GA#\xc4E@\x00\x00\x00\x86r \x01\x00\x00K4G\xc1\x11-\xad\x80\x00\x00\x00GA#\xc5\x15 \x00\x00\x00\x86r!\x01\x00\x00K5G\xc1\x11/\xc6\xe0\x00\x00\x00GA#\xc5P\xe0\x00\x00\x00\x86r"\x01\x00\x00K6G\xc1\x110\x1b`\x00\x00\x00GA#\xc4\xfb\xa0\x00\x00\x00\x86r#\x01\x00\x00K7G\xc1\x11.!`\x00\x00\x00GA#\xc5\x7f \x00\x00\x00\x86r$\x01\x00\x00K8G\xc1\x110j\xa0\x00\x00\x00GA#\xc5\xb9\x00\x00\x00\x00\x86r%\x01\x00\x00K9G\xc1\x11.2\xe0\x00\x00\x00GA#\xc6\x88\xe0\x00\x00\x00\x86r&\x01\x00\x00K:G\xc1\x110(\x80\x00\x00\x00GA#\xc6p@\x00\x00\x00\x86r\'\x01\x00\x00K;G\xc1\x110Q\xc0\x00\x00\x00GA#\xc7k`\x00\x00\x00\x86r(\x01\x00\x00K<G\xc1\x11.\x93 \x00\x00\x00GA#\xc8@\x80\x00\x00\x00\x86r)\x01\x00\x00K=G\xc1\x1107\x00\x00\x00\x00GA#\xc9T@\x00\x00\x00\x86r*\x01\x00\x00K>G\xc1\x11.\xc5\xe0\x00\x00\x00GA#\xc7I\xc0\x00\x00\x00\x86r+\x01\x00\x00K?G\xc1\x11-\x1f \x00\x00\x00GA#\xc7S\xe0\x00\x00\x00\x86r,\x01\x00\x00K@G\xc1\x110\x91 \x00\x00\x00GA#\xc7\x0b\x00\x00\x00\x00\x86r-\x01\x00\x00KAG\xc1\x111\x04\x00\x00\x00\x00GA#\xc7\x04\x80\x00\x00\x00\x86r.\x01\x00\x00KBG\xc1\x111t@\x00\x00\x00GA#\xc6\xfe\xa0\x00\x00\x00\x86r/\x01\x00\x00KCG\xc1\x111\xf2\xc0\x00\x00\x00GA#\xc6\xf9\x80\x00\x00\x00\x86r0\x01\x00\x00KDG\xc1\x11+\xe2 \x00\x00\x00GA#\xc2\xa5\x00\x00\x00\x00\x86r1\x01\x00\x00KEG\xc1\x11,\xb1`\x00\x00\x00GA#\xc0\xd0\xc0\x00\x00\x00\x86r2\x01\x00\x00uu.'
+# coding=utf-8
+# Generated by emft.miz.parse_parking_spots, do not edit; see emft.miz.parking_spots.encode_theatre
+
+VERSION = 1
+
+THEATRES = {
+    'Caucasus': (
+        (
+            'Kutaisi ',
+            'Soganlug ',
+            'Vaziani ',
+            'Tbilisi ',
+            'Senaki ',
+        ),
+        (
+            'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
+            'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABAAEAAQABAAEAAgACAAIAAgACAAIAAgACAAIAAgACAAIA'
+            'AgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgAC'
+            'AAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIAAgACAAIA'
+            'AgACAAIAAgACAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwAD'
+            'AAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMAAwADAAMA'
+            'BAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAE'
+            'AAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAAQABAAEAA=='
+        ),
+        (
+            'AQACAAMABAAFAAYABwAIAAkACgALAAwADQAOAA8AEAARABIAEwAUABUAFgAXABgAGQAaABsAHAAdAB4AHwAgACEAIgAjACQAJQAm'
+            'ACcAKAApACoAKwAsAC0ALgAvADAAMQAyADMANAA1ADYANwA4ADkAOgABAAIAAwAEAAUAAQACAAMABAAFAAYABwAIAAkACgALAAwA'
+            'DQAOAA8AEAARABIAEwAUABUAFgAXABgAGQAaABsAHAAdAB4AHwAgACEAIgAjACQAJQAmACcAKAApACoAKwAsAC0ALgAvADAAMQAy'
+            'ADMANAA1ADYANwA4ADkAOgA7ADwAPQA+AD8AQABBAEIAQwBEAEUARgBHAEgASQBKAEsATABNAE4ATwBQAFEAUgBTAFQAVQBWAFcA'
+            'WABZAFoAWwBcAAEAAgADAAQABQAGAAcACAAJAAoACwAMAA0ADgAPABAAEQASABMAFAAVABYAFwAYABkAGgAbABwAHQAeAB8AIAAh'
+            'ACIAIwAkACUAJgAnACoAKwAsAC0ALgAvADAAMQAyADMANAA1ADYANwA4ADkAOgA/AEAAQQBCAEMARABFAEYARwBIAEkASgBNAE4A'
+            'AQACAAMABAAFAAYABwAIAAkACgALAAwADQAOAA8AEAARABIAEwAUABUAFgAXABgAGQAaABsAHAAdAB4AHwAgACEAIgAjACQAJgAn'
+            'ACgAKQAqACsALAAtAC4ALwAwADEAMgAzADQANQA2ADcAOAA5ADoAOwA8AD0APgA/AEAAQQBCAEMARABFAA=='
+        ),
+        (
+            'gdyKyOjWJkl424rItdgmSXDaisiD2iZJZ9mKyFDcJklf2IrIHt4mSVbXisjr3yZJTtaKyLjhJklF1YrIhuMmSTzUishT5SZJM9OK'
+            'yCHnJkkr0orI7ugmSSLRisi76iZJAOiKyFCfJkn17IrIgJwmSerxisiwmSZJ4PaKyN6WJkk4uovIVcQmSYeei8gQwiZJPK2LyJO0'
+            'JklNmovIC68mSf2Hi8gDvCZJ5QOLyEusJkkOHYvI4q8mScL/isiAsyZJ7BiLyBi3Jkmg+4rItromSckUi8hNviZJX/aKyNnAJkn8'
+            'CYvIgskmSW7sish3xiZJCwCLyCDPJkl+4orIFcwmSRv2isi+1CZJc++KyJ7ZJklR64rI1OAmSS7nisgJ6CZJy8iKyKXtJkn04YrI'
+            'PPEmSajEisja9CZJ0t2KyHL4JkmGwIrIEPwmSa/Zisin/yZJmr+KyKUHJ0lp2YrIeQUnSRTCisgLDydJ4tuKyN4MJ0mOxIrIcBYn'
+            'SV3eishEFCdJWMOKyNocJ0mB3IrIcSAnSTW/isgPJCdJX9iKyKcnJ0kTu4rIRSsnSTzUisjcLidJe8eKyMFAJ0m+qorIYzonSWG7'
+            'isiZRydJNaaKyDxIJ0kSiJvIbLNaSXlMm8hLnFpJCUibyN+ZWkn7RJvIdJhaSdHXmsgkTlpJDEybyLlUXEkeUZvIJ1dcSZhVm8hT'
+            'WVxJ6lqbyP9bXElRLpzI8L1cSQQsnMh2v1xJoimcyPLAXEnyJJzI+cJcSSghnMgzxVxJcU2byPteXEk7RZvIXmNcSWI8m8gVXVxJ'
+            '/T2byK9jXEmJNZvIultcSTU3m8gLalxJej+byNNtXEnHNpvI+m9cSbsxm8gHb1xJLSWbyP9pXEkAIJvIPGlcSaQXm8iza1xJbyCb'
+            'yClvXEluF5vI4oBcSUASm8gfgFxJ5QmbyJaCXEmvEpvIDIZcSd8om8gDh1xJ5jObyP+FXEnSLpvI4IFcSYMpm8hVgVxJfFubyK1j'
+            'XEknZZvIFWVcSTFam8ika1xJsG2byNNrXEnUY5vIgW9cSYp0m8hKblxJd2ybyMJzXElOgJvIKXVcSYV2m8j/elxJf4abyBh8XElr'
+            'dZvIen9cSd5/m8iKglxJ5JybyP6EXEl2lJvIxoRcSZeQm8h7glxJJpCbyI2JXEnpgZvIV4dcSXiRm8hgj1xJ3IKbyCWNXEkzg5vI'
+            'TZVcSVWNm8jImFxJPpebyPGfXEn9npvIBphcSR6km8iVlVxJGa6byPSXXEnYqZvI1ZpcScWsm8jDnVxJGKebyGCkXEnbt5vIr6Bc'
+            'Samvm8hxqFxJIribyOuqXEkevZvIzKVcSVzEm8hkpVxJGcybyNilXEloxpvIaq5cSafSm8iQrFxJ6NObyNWmXEkJ25vIAqhcSfbe'
+            'm8ghrlxJj+abyO6pXEmf7ZvIvKtcSXPzm8hdrlxJg/ibyGmxXEn6CJzI9rlcSeH/m8gatlxJh/qbyFG5XEkoA5zIY71cSeUNnMjm'
+            'wVxJ4hCcyBTDXElbxpvI7rJcSQXSm8hytlxJiNebyG22XEnY3ZvIXbdcSVnnm8hXulxJN+KbyMa8XEkG2pvI4L1cSZrTm8gJvFxJ'
+            '4NGbyFS/XEkIz5vIQMJcSYnIm8j3xlxJTcKbyC7EXEkT6JvIxbFcSSPBmcig4lpJcb2ZyOTjWkm/uZnIKOVaSQ22mchs5lpJW7KZ'
+            'yLDnWklruZnI1+xaSR29mciT61pJgcSZyAvpWknPwJnIT+paSTPImcjH51pJe8CZyP/xWkktxJnIu/BaSZHLmcgz7lpJ38eZyHfv'
+            'WklDz5nI7+xaSYzHmcgn91pJPsuZyOP1Wkmi0pnIW/NaSfDOmcif9FpJVNaZyBfyWkmczpnIT/xaSU7SmcgL+1pJstmZyIP4WkkA'
+            '1pnIx/laSWTdmcg/91pJrNWZyHgBW0le2ZnINABbScLgmcis/VpJEN2ZyPD+Wkl05JnIaPxaSb3cmcigBltJb+CZyFwFW0nT55nI'
+            '1AJbSSHkmcgYBFtJheuZyJABW0nN45nIyAtbSX/nmciECltJ4+6ZyPwHW0kx65nIQAlbSd3Nmciw4lpJBNGZyLzhWknqzJnIMd1a'
+            'Sd/Jmcgu3lpJi8eZyF/YWkmhwpnI+9laSUDUmcjY4FpJibKZyHjfWknXrpnIvOBaSSSrmcj/4VpJG3KZyB/BWkk1dJnI/7paSch4'
+            'mchLuVpJyXyZyGK3WkkjgpnINLVaSdCGmcjMsFpJUY6ZyAe1WkkifZnIKKlaSXaAmcjdp1pJXoOZyLKmWkmfhpnIbKVaSUSAmcgV'
+            'o1pJxXqZyKahWkkscZnIYp9aSYN6mcgesFpJqHeZyH+xWklNc5nIXbNaSVFwmciovFpJFHyZyDq/WkmYhJnIo7taSaSAmcipvVpJ'
+            'YYKJyBrPHUkxfYnI7dEdSUl4icin1B1J/XKJyInXHUkwbonIM9odSV1vicjIzx1J62WJyIDCHUnfYInIUr0dSQtaicjwwh1J8VGJ'
+            'yBbEHUmIT4nIjsYdSbVPicjKyx1JqFeJyH3NHUmmYonI3twdST9fichk4h1JbGSJyEvmHUnlV4nIb+YdSc5Nicin5h1J8kyJyHLs'
+            'HUlOQ4nIie0dSZU2ich88h1Jh0qJyFr5HUkPT4nI0vQdSe1Sicjp7x1JRFmJyLf0HUn0XonIBfQdSTllicjD8B1JA2GJyP7tHUlR'
+            'dInIxeQdSWJmiciO6x1JpmuJyGkSHkkKZonICxgeScVlicgbDx5JT1qJyEMSHkmQX4nItg0eSYZjich1Cx5JdV6JyMIFHkliVInI'
+            'ShAeSZ1IicgjCx5JHVSJyFoHHkkMQonIvAgeSeFFicjDAh5JC0mJyNT/HUk7TonIcv0dSS1WichH/R1J41SJyEACHkmEa4nIEx0e'
+            'SVV8icgRHx5J426JyAkgHkmsgInIKiIeSWxticipKB5JN36JyIcqHknbgInI3SceSQtxicj5Kx5JVYOJyMgtHkmXcYnIRzQeSUSB'
+            'iciCMx5JjoKJyFs7HkmZdInIBEIeSbiBiciiSh5JL3aJyE46Hkn5aInInzoeSYmEichYOB5JIIiJyCQ4Hkmii4nI9TceSZaPicjM'
+            'Nx5JEV+JyCgVHkmLZYnIhgYeSQ=='
+        ),
+    ),
+}
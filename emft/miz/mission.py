@@ -1,20 +1,232 @@
 # coding=utf-8
 
 import typing
+import weakref
 from calendar import timegm
-from itertools import chain
+from collections import namedtuple
 from time import gmtime, strftime, strptime
 
 from emft.core.logging import Logged, make_logger
 from emft.core.validator import Validator, valid_bool, valid_float, valid_int, valid_positive_int, valid_str
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 EPOCH_DELTA = 1306886400
 
 LOGGER = make_logger(__name__)
 
+# Parallel arrays describing every unit of a mission, see Mission.get_units_positions
+UnitsPositions = namedtuple('UnitsPositions', 'ids x y heading coalition category')
+
 validator_group_or_unit_name = Validator(_type=str, _regex=r'[a-zA-Z0-9\_\-\#]+',
                                          exc=ValueError, logger=LOGGER)
 
+# The Mission that owns a mission dict (the first one built over it), by id of the dict; objects built straight from
+# a mission dict use it instead of an index of their own, and changes made through other Missions invalidate it
+_OWNERS = weakref.WeakValueDictionary()
+
+
+def _owning_mission(mission_dict: dict) -> typing.Optional['Mission']:
+    owner = _OWNERS.get(id(mission_dict))
+    # the id of a freed dict can be reused
+    return owner if owner is not None and owner.d is mission_dict else None
+
+
+def _mission_of(mission_dict: dict, l10n: dict) -> 'Mission':
+    owner = _owning_mission(mission_dict)
+    return owner if owner is not None else Mission(mission_dict, l10n)
+
+
+class MissionIndex:
+    """
+    Lookup tables for the groups and units of a mission
+
+    Tables are built lazily, in one pass over the mission; renaming or re-numbering a group or unit through its
+    setters updates them in place, and adding or removing one through Country or Group invalidates them.
+    """
+
+    def __init__(self, mission: 'Mission'):
+        self.mission = mission
+        self._built = False
+        self._ordinals = {}
+        self._groups = {}
+        self._units = {}
+        self._groups_by_category = {}
+        self._units_by_category = {}
+        self._client_groups = []
+
+    def invalidate(self):
+        self._built = False
+
+    @staticmethod
+    def _add(table: dict, key, ordinal: int, obj):
+        entries = table.setdefault(key, [])
+        entries.append((ordinal, obj))
+        if len(entries) > 1:
+            entries.sort(key=lambda entry: entry[0])
+
+    @staticmethod
+    def _remove(table: dict, key, ordinal: int):
+        entries = table.get(key, [])
+        for i, entry in enumerate(entries):
+            if entry[0] == ordinal:
+                del entries[i]
+                if not entries:
+                    del table[key]
+                return entry[1]
+        return None
+
+    def _build(self):
+        self._ordinals = {}
+        self._groups = {'id': {}, 'name': {}}
+        self._units = {'id': {}, 'name': {}}
+        self._groups_by_category = {category: [] for category in Mission.valid_group_categories}
+        self._units_by_category = {category: [] for category in Mission.valid_group_categories}
+        self._client_groups = []
+        unit_ordinal = 0
+        for group_ordinal, group in enumerate(self.mission.groups):
+            self._ordinals[id(group._section_group)] = group_ordinal
+            self._add(self._groups['id'], group.group_id, group_ordinal, group)
+            self._add(self._groups['name'], group.group_name, group_ordinal, group)
+            self._groups_by_category[group.group_category].append(group)
+            for unit in group.units:
+                self._ordinals[id(unit._section_unit)] = unit_ordinal
+                self._add(self._units['id'], unit.unit_id, unit_ordinal, unit)
+                self._add(self._units['name'], unit.unit_name, unit_ordinal, unit)
+                self._units_by_category[group.group_category].append(unit)
+                if unit.unit_index == 1 and unit.skill == 'Client':
+                    self._client_groups.append(group)
+                unit_ordinal += 1
+        self._built = True
+
+    def update(self, kind: str, attr: str, section: dict, old_value, new_value):
+        """Moves a group or unit from one key to another after its name or id changed"""
+        if not self._built:
+            return
+        ordinal = self._ordinals.get(id(section))
+        if ordinal is None:
+            # object added to the mission after the index was built
+            self.invalidate()
+            return
+        table = (self._groups if kind == 'group' else self._units)[attr]
+        obj = self._remove(table, old_value, ordinal)
+        if obj is None:
+            self.invalidate()
+            return
+        self._add(table, new_value, ordinal, obj)
+
+    def _check_built(self):
+        if not self._built:
+            self._build()
+
+    def _first(self, table: dict, key, coa_color: str = None):
+        for _, obj in table.get(key, ()):
+            if coa_color is None or obj.coa_color == coa_color:
+                return obj
+        return None
+
+    @staticmethod
+    def _filter(objects: list, coa_color: str = None) -> list:
+        if coa_color is None:
+            return list(objects)
+        return [obj for obj in objects if obj.coa_color == coa_color]
+
+    def group_by_id(self, group_id: int, coa_color: str = None) -> typing.Optional['Group']:
+        self._check_built()
+        return self._first(self._groups['id'], group_id, coa_color)
+
+    def group_by_name(self, group_name: str, coa_color: str = None) -> typing.Optional['Group']:
+        self._check_built()
+        return self._first(self._groups['name'], group_name, coa_color)
+
+    def unit_by_id(self, unit_id: int, coa_color: str = None) -> typing.Optional['BaseUnit']:
+        self._check_built()
+        return self._first(self._units['id'], unit_id, coa_color)
+
+    def unit_by_name(self, unit_name: str, coa_color: str = None) -> typing.Optional['BaseUnit']:
+        self._check_built()
+        return self._first(self._units['name'], unit_name, coa_color)
+
+    def groups_from_category(self, category: str, coa_color: str = None) -> typing.List['Group']:
+        self._check_built()
+        return self._filter(self._groups_by_category[category], coa_color)
+
+    def units_from_category(self, category: str, coa_color: str = None) -> typing.List['BaseUnit']:
+        self._check_built()
+        return self._filter(self._units_by_category[category], coa_color)
+
+    def client_groups(self, coa_color: str = None) -> typing.List['Group']:
+        self._check_built()
+        return self._filter(self._client_groups, coa_color)
+
+
+class IdAllocator:
+    """
+    Hands out new group and unit ids for a mission
+
+    The ids in use are scanned (and checked for duplicates) once, on first use; allocating an id is O(1) after that.
+    Ids that have been handed out are never handed out again, even if they end up unused.
+    """
+
+    kinds = ('group', 'unit')
+
+    def __init__(self, mission: 'Mission'):
+        self.mission = mission
+        self._used = None
+        self._next = {kind: 1 for kind in self.kinds}
+
+    def invalidate(self):
+        self._used = None
+
+    def _scan(self):
+        used = {kind: set() for kind in self.kinds}
+        for group in self.mission.groups:
+            if group.group_id in used['group']:
+                raise IndexError(group.group_name)
+            used['group'].add(group.group_id)
+            for unit in group.units:
+                if unit.unit_id in used['unit']:
+                    raise IndexError(unit.unit_name)
+                used['unit'].add(unit.unit_id)
+        for kind in self.kinds:
+            self._next[kind] = max(self._next[kind], max(used[kind], default=0) + 1)
+        self._used = used
+
+    def _check_scanned(self):
+        if self._used is None:
+            self._scan()
+
+    def update(self, kind: str, old_value: int, new_value: int):
+        """Keeps track of a group or unit id changed through its setter"""
+        if self._used is None:
+            return
+        used = self._used[kind]
+        if new_value in used or old_value not in used:
+            # let the next scan report the duplicate, or pick up whatever changed behind our back
+            self.invalidate()
+            return
+        used.discard(old_value)
+        used.add(new_value)
+        self._next[kind] = max(self._next[kind], new_value + 1)
+
+    def peek(self, kind: str) -> int:
+        """Returns the id that the next allocation will hand out, without allocating it"""
+        self._check_scanned()
+        return self._next[kind]
+
+    def reserve(self, kind: str, count: int = 1) -> range:
+        """Allocates a block of consecutive ids"""
+        valid_int.validate(count, 'count', exc=ValueError)
+        if count < 1:
+            raise ValueError('cannot reserve less than one id, got: {}'.format(count))
+        self._check_scanned()
+        start = self._next[kind]
+        self._next[kind] = start + count
+        return range(start, start + count)
+
 
 class BaseMissionObject(Logged):
     def __init__(self, mission_dict: dict, l10n: dict):
@@ -127,25 +339,13 @@ class BaseMissionObject(Logged):
 
     @property
     def next_group_id(self):
-        ids = set()
-        for group in chain(self.blue_coa.groups, self.red_coa.groups):
-            assert isinstance(group, Group)
-            id_ = group.group_id
-            if id_ in ids:
-                raise IndexError(group.group_name)
-            ids.add(id_)
-        return max(ids) + 1
+        """Next free group id of the mission (ids are unique across coalitions)"""
+        return self._mission.ids.peek('group')
 
     @property
     def next_unit_id(self):
-        ids = set()
-        for unit in chain(self.blue_coa.units, self.red_coa.units):
-            assert isinstance(unit, BaseUnit)
-            id_ = unit.unit_id
-            if id_ in ids:
-                raise IndexError(unit.unit_name)
-            ids.add(id_)
-        return max(ids) + 1
+        """Next free unit id of the mission (ids are unique across coalitions)"""
+        return self._mission.ids.peek('unit')
 
     @property
     def coalitions(self):
@@ -191,6 +391,10 @@ class BaseMissionObject(Logged):
         valid_str.validate(value, 'sortie name')
         self.l10n[self._sortie_name_key] = value
 
+    @property
+    def theatre(self):
+        return self.d['theatre']
+
 
 class Mission(BaseMissionObject):
     validator_start_time = Validator(
@@ -227,25 +431,151 @@ class Mission(BaseMissionObject):
     def __init__(self, mission_dict, l10n):
         super().__init__(mission_dict, l10n)
         self.weather = Weather(self.d, l10n)
-        self.blue_coa = Coalition(self.d, l10n, 'blue')
-        self.red_coa = Coalition(self.d, l10n, 'red')
+        self.blue_coa = Coalition(self.d, l10n, 'blue', self)
+        self.red_coa = Coalition(self.d, l10n, 'red', self)
         self.ground_control = GroundControl(self.d, l10n)
+        # Countries and their members cache their own section of the mission dict; bumping this generation makes
+        # them resolve it again
+        self._sections_generation = 0
+        self.index = MissionIndex(self)
+        self.ids = IdAllocator(self)
+        if _owning_mission(mission_dict) is None:
+            _OWNERS[id(mission_dict)] = self
 
     def __repr__(self):
         return 'Mission({})'.format(self.d)
 
+    def invalidate_index(self):
+        """
+        Must be called after groups, units or statics have been added to, or removed from, the mission dict directly
+
+        Country.add_group, Country.remove_group, Group.add_unit and Group.remove_unit call it themselves.
+        """
+        self._sections_generation += 1
+        self.index.invalidate()
+        self.ids.invalidate()
+        self._invalidate_owner()
+
+    def _invalidate_owner(self):
+        """Invalidates the Mission that owns the mission dict after a change made through this one, if it is another"""
+        owner = _owning_mission(self.d)
+        if owner is not None and owner is not self:
+            owner.invalidate_index()
+
+    @property
+    def next_group_id(self):
+        return self.ids.peek('group')
+
+    @property
+    def next_unit_id(self):
+        return self.ids.peek('unit')
+
+    def allocate_group_id(self) -> int:
+        return self.ids.reserve('group')[0]
+
+    def allocate_unit_id(self) -> int:
+        return self.ids.reserve('unit')[0]
+
+    def reserve_group_ids(self, count: int) -> range:
+        return self.ids.reserve('group', count)
+
+    def reserve_unit_ids(self, count: int) -> range:
+        return self.ids.reserve('unit', count)
+
+    def get_groups_from_category(self, category):
+        Mission.validator_group_category.validate(category, 'get_groups_from_category')
+        yield from self.index.groups_from_category(category)
+
+    def get_units_from_category(self, category):
+        Mission.validator_group_category.validate(category, 'get_units_from_category')
+        yield from self.index.units_from_category(category)
+
+    def get_group_by_id(self, group_id):
+        valid_positive_int.validate(group_id, 'get_group_by_id', exc=ValueError)
+        return self.index.group_by_id(group_id)
+
+    def get_clients_groups(self) -> typing.Generator['FlyingUnit', None, None]:
+        yield from self.index.client_groups()
+
+    def get_group_by_name(self, group_name):
+        valid_str.validate(group_name, 'get_group_by_name')
+        return self.index.group_by_name(group_name)
+
+    def get_unit_by_name(self, unit_name):
+        valid_str.validate(unit_name, 'get_unit_by_name')
+        return self.index.unit_by_name(unit_name)
+
+    def get_unit_by_id(self, unit_id):
+        valid_positive_int.validate(unit_id, 'get_unit_by_id')
+        return self.index.unit_by_id(unit_id)
+
     def farps(self) -> typing.Generator['Static', None, None]:
         for coa in [self.blue_coa, self.red_coa]:
             for farp in coa.farps:
                 yield farp
 
+    def get_units_positions(self) -> UnitsPositions:
+        """Returns the ids, positions, headings, coalitions and categories of all units as NumPy arrays"""
+        if numpy is None:
+            raise ImportError('numpy is required to work with arrays of unit positions')
+        ids, x, y, heading, coalition, category = [], [], [], [], [], []
+        for unit in self.units:
+            section = unit._section_unit
+            ids.append(section['unitId'])
+            x.append(section['x'])
+            y.append(section['y'])
+            heading.append(section['heading'])
+            coalition.append(unit.coa_color)
+            category.append(unit.group_category)
+        return UnitsPositions(
+            ids=numpy.array(ids, dtype=numpy.int64),
+            x=numpy.array(x, dtype=numpy.float64),
+            y=numpy.array(y, dtype=numpy.float64),
+            heading=numpy.array(heading, dtype=numpy.float64),
+            coalition=numpy.array(coalition, dtype=str),
+            category=numpy.array(category, dtype=str),
+        )
+
+    def set_units_positions(self, ids, x, y, heading=None):
+        """
+        Writes the positions (and optionally headings) of the units with the given ids back to the mission
+
+        Headings are stored as given, in radians like DCS writes them; any finite number is accepted, so the output of
+        get_units_positions() can always be written back.
+        """
+        if numpy is None:
+            raise ImportError('numpy is required to work with arrays of unit positions')
+        columns = [numpy.asarray(ids), numpy.asarray(x, dtype=numpy.float64), numpy.asarray(y, dtype=numpy.float64)]
+        if heading is not None:
+            columns.append(numpy.asarray(heading, dtype=numpy.float64))
+        if len({column.shape for column in columns}) != 1 or columns[0].ndim != 1:
+            raise ValueError('ids, positions and headings must be one-dimensional arrays of the same length')
+        if not all(numpy.isfinite(column).all() for column in columns[1:]):
+            raise ValueError('positions and headings must be finite numbers')
+        headings = columns[3].tolist() if heading is not None else None
+        # all ids are checked before anything is written
+        sections = []
+        for unit_id in columns[0].tolist():
+            unit = self.index.unit_by_id(unit_id)
+            if unit is None:
+                raise ValueError('unknown unit id: {}'.format(unit_id))
+            sections.append(unit._section_unit)
+        x, y = columns[1].tolist(), columns[2].tolist()
+        for i, section in enumerate(sections):
+            section['x'] = x[i]
+            section['y'] = y[i]
+            if headings is not None:
+                section['heading'] = headings[i]
+
 
 # noinspection PyProtectedMember
 class Coalition(BaseMissionObject):
-    def __init__(self, mission_dict, ln10, coa_color):
+    def __init__(self, mission_dict, ln10, coa_color, mission: 'Mission' = None):
         super().__init__(mission_dict, ln10)
         self.coa_color = coa_color
         self._countries = {}
+        # objects built straight from a mission dict use the Mission that owns it, if any
+        self._mission = mission if mission is not None else _mission_of(mission_dict, ln10)
 
     def __repr__(self):
         return 'Coalition({}, {})'.format(self._section_coalition, self.coa_color)
@@ -291,7 +621,7 @@ class Coalition(BaseMissionObject):
     def countries(self) -> typing.Generator['Country', None, None]:
         for k in self._section_country:
             if k not in self._countries.keys():
-                country = Country(self.d, self.l10n, self.coa_color, k)
+                country = Country(self.d, self.l10n, self.coa_color, k, self._mission)
                 self._countries[k] = country
                 self._countries_by_id[country.country_id] = country
                 self._countries_by_name[country.country_name] = country
@@ -346,10 +676,7 @@ class Coalition(BaseMissionObject):
 
     def get_groups_from_category(self, category) -> typing.Generator['Group', None, None]:
         Mission.validator_group_category.validate(category, 'get_groups_from_category')
-        for group in self.groups:
-            assert isinstance(group, Group)
-            if group.group_category == category:
-                yield group
+        yield from self._mission.index.groups_from_category(category, self.coa_color)
 
     @property
     def units(self) -> typing.Generator['BaseUnit', None, None]:
@@ -360,38 +687,23 @@ class Coalition(BaseMissionObject):
 
     def get_units_from_category(self, category) -> typing.Generator['BaseUnit', None, None]:
         Mission.validator_group_category.validate(category, 'group category')
-        for unit in self.units:
-            assert isinstance(unit, BaseUnit)
-            if unit.group_category == category:
-                yield unit
+        yield from self._mission.index.units_from_category(category, self.coa_color)
 
     def get_group_by_id(self, group_id) -> 'Group':
         valid_positive_int.validate(group_id, 'get_group_by_id')
-        for group in self.groups:
-            assert isinstance(group, Group)
-            if group.group_id == group_id:
-                return group
+        return self._mission.index.group_by_id(group_id, self.coa_color)
 
     def get_group_by_name(self, group_name) -> 'Group':
         valid_str.validate(group_name, 'get_group_by_name')
-        for group in self.groups:
-            assert isinstance(group, Group)
-            if group.group_name == group_name:
-                return group
+        return self._mission.index.group_by_name(group_name, self.coa_color)
 
     def get_unit_by_name(self, unit_name) -> 'BaseUnit':
         valid_str.validate(unit_name, 'get_unit_by_name')
-        for unit in self.units:
-            assert isinstance(unit, BaseUnit)
-            if unit.unit_name == unit_name:
-                return unit
+        return self._mission.index.unit_by_name(unit_name, self.coa_color)
 
     def get_unit_by_id(self, unit_id) -> 'BaseUnit':
         valid_positive_int.validate(unit_id, 'get_unit_by_id')
-        for unit in self.units:
-            assert isinstance(unit, BaseUnit)
-            if unit.unit_id == unit_id:
-                return unit
+        return self._mission.index.unit_by_id(unit_id, self.coa_color)
 
 
 class Trig(BaseMissionObject):
@@ -821,8 +1133,8 @@ class Weather(BaseMissionObject):
 
 # noinspection PyProtectedMember
 class Country(Coalition):
-    def __init__(self, mission_dict, l10n, coa_color, country_index):
-        super().__init__(mission_dict, l10n, coa_color)
+    def __init__(self, mission_dict, l10n, coa_color, country_index, mission: 'Mission' = None):
+        super().__init__(mission_dict, l10n, coa_color, mission)
         self.__groups = {
             'helicopter': {},
             'plane': {},
@@ -831,6 +1143,8 @@ class Country(Coalition):
         }
         self.country_index = country_index
         self.__static = {}
+        self._country_section = None
+        self._country_section_generation = -1
 
     def __repr__(self):
         return 'Country({}, {}, {})'.format(self._section_country, self.coa_color, self.country_index)
@@ -842,7 +1156,11 @@ class Country(Coalition):
 
     @property
     def _section_this_country(self):
-        return self._section_coalition['country'][self.country_index]
+        generation = self._mission._sections_generation
+        if self._country_section_generation != generation:
+            self._country_section = self._section_coalition['country'][self.country_index]
+            self._country_section_generation = generation
+        return self._country_section
 
     @property
     def country_id(self):
@@ -852,24 +1170,51 @@ class Country(Coalition):
     def country_name(self):
         return self._section_this_country['name']
 
+    def _group(self, group_category, group_index) -> 'Group':
+        if group_index not in self.__groups[group_category]:
+            self.__groups[group_category][group_index] = Group(
+                self.d, self.l10n, self.coa_color, self.country_index, group_category, group_index, country=self
+            )
+        return self.__groups[group_category][group_index]
+
     @property
     def groups(self) -> typing.Generator['Group', None, None]:
         for group_category in Mission.valid_group_categories:
             if group_category in self._section_this_country.keys():
                 for group_index in self._section_this_country[group_category]['group']:
-                    if group_index not in self.__groups[group_category]:
-                        self.__groups[group_category][group_index] = Group(self.d, self.l10n, self.coa_color,
-                                                                           self.country_index, group_category,
-                                                                           group_index)
-                    yield self.__groups[group_category][group_index]
+                    yield self._group(group_category, group_index)
+
+    def add_group(self, group_category: str, group_section: dict) -> 'Group':
+        """Adds a group at the end of this country; its units, ids and names (in l10n) must already be filled in"""
+        Mission.validator_group_category.validate(group_category, 'add_group')
+        if group_category not in self._section_this_country:
+            self._section_this_country[group_category] = {'group': {}}
+        groups = self._section_this_country[group_category]['group']
+        group_index = max(groups, default=0) + 1
+        groups[group_index] = group_section
+        self._mission.invalidate_index()
+        return self._group(group_category, group_index)
+
+    def remove_group(self, group: 'Group'):
+        """Removes a group from this country; the groups that came after it move up by one index"""
+        groups = self._section_this_country.get(group.group_category, {}).get('group', {})
+        if groups.get(group.group_index) is not group._section_group:
+            raise ValueError('group does not belong to this country: {}'.format(group.group_name))
+        sections = [groups[group_index] for group_index in sorted(groups) if group_index != group.group_index]
+        groups.clear()
+        groups.update(enumerate(sections, 1))
+        # wrappers are bound to an index, the ones after the removed group now point to another group
+        self.__groups[group.group_category].clear()
+        self._mission.invalidate_index()
 
     @property
     def statics(self) -> typing.Generator['Static', None, None]:
         if 'static' in self._section_this_country.keys():
             for static_index in self._section_this_country['static']['group']:
                 if static_index not in self.__static:
-                    self.__static[static_index] = Static(self.d, self.l10n, self.coa_color,
-                                                         self.country_index, static_index)
+                    self.__static[static_index] = Static(
+                        self.d, self.l10n, self.coa_color, self.country_index, static_index, country=self
+                    )
                 yield self.__static[static_index]
 
     def get_groups_from_category(self, category) -> typing.Generator['Group', None, None]:
@@ -918,10 +1263,116 @@ class Country(Coalition):
                 yield unit
 
 
-class Static(Country):
-    def __init__(self, mission_dict, l10n, coa_color, country_index, static_index):
-        super(Static, self).__init__(mission_dict, l10n, coa_color, country_index)
+class CountryLookups:
+    """Lookup helpers of the country an object belongs to, for the objects that are not a Country themselves"""
+    __slots__ = ()
+
+    @property
+    def _coalition(self) -> 'Coalition':
+        mission = self._country._mission
+        return mission.blue_coa if self._country.coa_color == 'blue' else mission.red_coa
+
+    def get_country_by_name(self, country_name) -> 'Country':
+        return self._coalition.get_country_by_name(country_name)
+
+    def get_country_by_id(self, country_id) -> 'Country':
+        return self._coalition.get_country_by_id(country_id)
+
+    def get_groups_from_category(self, category) -> typing.Generator['Group', None, None]:
+        return self._country.get_groups_from_category(category)
+
+    def get_units_from_category(self, category) -> typing.Generator['BaseUnit', None, None]:
+        return self._country.get_units_from_category(category)
+
+    def get_group_by_id(self, group_id) -> 'Group':
+        return self._country.get_group_by_id(group_id)
+
+    def get_group_by_name(self, group_name) -> 'Group':
+        return self._country.get_group_by_name(group_name)
+
+    def get_unit_by_id(self, unit_id) -> 'BaseUnit':
+        return self._country.get_unit_by_id(unit_id)
+
+    def get_unit_by_name(self, unit_name) -> 'BaseUnit':
+        return self._country.get_unit_by_name(unit_name)
+
+    def get_clients_groups(self) -> typing.Generator['Group', None, None]:
+        return self._country.get_clients_groups()
+
+    @property
+    def next_group_id(self) -> int:
+        return self._country.next_group_id
+
+    @property
+    def next_unit_id(self) -> int:
+        return self._country.next_unit_id
+
+
+class CountryMember(CountryLookups):
+    """
+    Base class for the objects (groups, units and statics) that belong to a country
+
+    Those are by far the most numerous objects of a mission, so they only hold a reference to the Country object
+    they belong to (which owns the mission dict and the l10n), and use __slots__. Objects created by their Country or
+    Group are given that Country; the other ones build their own, which uses the Mission that owns the mission dict.
+    """
+    __slots__ = ('_country',)
+
+    def __init__(self, mission_dict, l10n, coa_color, country_index, country: 'Country' = None):
+        self._country = country if country is not None else Country(mission_dict, l10n, coa_color, country_index)
+
+    @property
+    def d(self) -> dict:
+        return self._country.d
+
+    @property
+    def l10n(self) -> dict:
+        return self._country.l10n
+
+    @property
+    def coa_color(self) -> str:
+        return self._country.coa_color
+
+    @property
+    def country_index(self):
+        return self._country.country_index
+
+    @property
+    def country_id(self):
+        return self._country.country_id
+
+    @property
+    def country_name(self):
+        return self._country.country_name
+
+    @property
+    def _section_this_country(self):
+        return self._country._section_this_country
+
+    @property
+    def mission_start_time(self):
+        return self.d['start_time']
+
+    def _update_index(self, kind: str, attr: str, section: dict, old_value, new_value):
+        mission = self._country._mission
+        mission.index.update(kind, attr, section, old_value, new_value)
+        if attr == 'id':
+            mission.ids.update(kind, old_value, new_value)
+        mission._invalidate_owner()
+
+    def _invalidate_index(self):
+        self._country._mission.index.invalidate()
+        self._country._mission._invalidate_owner()
+
+
+class Static(CountryMember):
+    __slots__ = ('static_index', '_static_section', '_static_section_generation')
+
+    def __init__(self, mission_dict, l10n, coa_color, country_index, static_index, country: 'Country' = None):
+        super().__init__(mission_dict, l10n, coa_color, country_index, country)
         self.static_index = static_index
+        self._static_section = None
+        self._static_section_generation = -1
 
     @property
     def static_id(self):
@@ -934,7 +1385,11 @@ class Static(Country):
 
     @property
     def _section_static(self):
-        return self._section_this_country['static']['group'][self.static_index]
+        generation = self._country._mission._sections_generation
+        if self._static_section_generation != generation:
+            self._static_section = self._section_this_country['static']['group'][self.static_index]
+            self._static_section_generation = generation
+        return self._static_section
 
     @property
     def _static_name_key(self):
@@ -964,7 +1419,9 @@ class Static(Country):
 
 
 # noinspection PyProtectedMember
-class Group(Country):
+class Group(CountryMember):
+    __slots__ = ('group_category', 'group_index', '_group_route', '_units', '_group_section',
+                 '_group_section_generation')
     attribs = ('group_category', 'group_index', 'group_hidden', 'group_start_time', '_group_name_key')
 
     class Route:
@@ -995,18 +1452,15 @@ class Group(Country):
     validator_group_route = Validator(_type=Route, exc=ValueError, logger=LOGGER)
     units_class_enum = None
 
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index)
+    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index,
+                 country: 'Country' = None):
+        super().__init__(mission_dict, l10n, coa_color, country_index, country)
         self.group_category = group_category
         self.group_index = group_index
-        self.__group_route = None
-        self.__units = {}
-        self.units_class_enum = {
-            'helicopter': Helicopter,
-            'plane': Plane,
-            'ship': Ship,
-            'vehicle': Vehicle,
-        }
+        self._group_route = None
+        self._units = {}
+        self._group_section = None
+        self._group_section_generation = -1
 
     def __repr__(self):
         return 'Group({}, {}, {}, {}, {})'.format(self._section_group, self.coa_color, self.country_index,
@@ -1022,18 +1476,22 @@ class Group(Country):
     @property
     def group_route(self) -> 'Group.Route':
         #  TODO
-        if self.__group_route is None:
-            self.__group_route = Group.Route(self)
-        return self.__group_route
+        if self._group_route is None:
+            self._group_route = Group.Route(self)
+        return self._group_route
 
     @group_route.setter
     def group_route(self, value):
         self.validator_group_route.validate(value, 'group_route')
-        self.__group_route = value
+        self._group_route = value
 
     @property
     def _section_group(self):
-        return self._section_this_country[self.group_category]['group'][self.group_index]
+        generation = self._country._mission._sections_generation
+        if self._group_section_generation != generation:
+            self._group_section = self._section_this_country[self.group_category]['group'][self.group_index]
+            self._group_section_generation = generation
+        return self._group_section
 
     @property
     def _group_name_key(self):
@@ -1046,7 +1504,9 @@ class Group(Country):
     @group_name.setter
     def group_name(self, value):
         validator_group_or_unit_name.validate(value, 'group name')
+        old_value = self.group_name
         self.l10n[self._group_name_key] = value
+        self._update_index('group', 'name', self._section_group, old_value, value)
 
     @property
     def group_hidden(self):
@@ -1064,7 +1524,9 @@ class Group(Country):
     @group_id.setter
     def group_id(self, value):
         valid_int.validate(value, 'groupId')
+        old_value = self.group_id
         self._section_group['groupId'] = value
+        self._update_index('group', 'id', self._section_group, old_value, value)
 
     @property
     def group_start_delay(self):
@@ -1095,15 +1557,19 @@ class Group(Country):
         Mission.validator_start_date.validate(value, 'start_time_as_date')
         self.group_start_time = timegm(strptime(value, '%d/%m/%Y %H:%M:%S')) - EPOCH_DELTA
 
+    def _unit(self, unit_index) -> 'BaseUnit':
+        if unit_index not in self._units:
+            country = self._country
+            self._units[unit_index] = self.units_class_enum[self.group_category](
+                country.d, country.l10n, country.coa_color, country.country_index, self.group_category,
+                self.group_index, unit_index, group=self
+            )
+        return self._units[unit_index]
+
     @property
     def units(self):
         for unit_index in self._section_group['units']:
-            if unit_index not in self.__units.keys():
-                self.__units[unit_index] = self.units_class_enum[self.group_category](self.d, self.l10n, self.coa_color,
-                                                                                      self.country_index,
-                                                                                      self.group_category,
-                                                                                      self.group_index, unit_index)
-            yield self.__units[unit_index]
+            yield self._unit(unit_index)
 
     @property
     def first_unit(self) -> 'BaseUnit':
@@ -1128,14 +1594,29 @@ class Group(Country):
 
     def get_unit_by_index(self, unit_index):
         if unit_index in self._section_group['units'].keys():
-            if unit_index not in self.__units.keys():
-                self.__units[unit_index] = self.units_class_enum[self.group_category](self.d, self.l10n, self.coa_color,
-                                                                                      self.country_index,
-                                                                                      self.group_category,
-                                                                                      self.group_index, unit_index)
-            return self.__units[unit_index]
+            return self._unit(unit_index)
         return None
 
+    def add_unit(self, unit_section: dict) -> 'BaseUnit':
+        """Adds a unit at the end of this group; its id and name (in l10n) must already be filled in"""
+        units = self._section_group['units']
+        unit_index = max(units, default=0) + 1
+        units[unit_index] = unit_section
+        self._country._mission.invalidate_index()
+        return self.get_unit_by_index(unit_index)
+
+    def remove_unit(self, unit: 'BaseUnit'):
+        """Removes a unit from this group; the units that came after it move up by one index"""
+        units = self._section_group['units']
+        if units.get(unit.unit_index) is not unit._section_unit:
+            raise ValueError('unit does not belong to this group: {}'.format(unit.unit_name))
+        sections = [units[unit_index] for unit_index in sorted(units) if unit_index != unit.unit_index]
+        units.clear()
+        units.update(enumerate(sections, 1))
+        # wrappers are bound to an index, the ones after the removed unit now point to another unit
+        self._units.clear()
+        self._country._mission.invalidate_index()
+
     @property
     def group_is_client_group(self):
         # TODO create test
@@ -1150,14 +1631,22 @@ class Group(Country):
 
 # noinspection PyProtectedMember
 class BaseUnit(Group):
+    __slots__ = ('unit_index', '_unit_section', '_unit_section_generation')
     validator_skill = Validator(_type=str,
                                 _in_list=['Average', 'Good', 'High', 'Excellent', 'Random', 'Client', 'Player'],
                                 exc=ValueError, logger=LOGGER)
     validator_unit_types = Validator(_type=str, _in_list=[], exc=ValueError, logger=LOGGER)
 
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index)
+    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index,
+                 group: 'Group' = None):
+        # A unit exposes the properties of its group, and shares its units cache
+        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index,
+                         group._country if group is not None else None)
+        if group is not None:
+            self._units = group._units
         self.unit_index = unit_index
+        self._unit_section = None
+        self._unit_section_generation = -1
 
     def __repr__(self):
         return '{}({}, {}, {}, {}, {}, {})'.format(self.__class__.__name__, self._section_unit, self.coa_color,
@@ -1166,7 +1655,11 @@ class BaseUnit(Group):
 
     @property
     def _section_unit(self):
-        return self._section_group['units'][self.unit_index]
+        generation = self._country._mission._sections_generation
+        if self._unit_section_generation != generation:
+            self._unit_section = self._section_group['units'][self.unit_index]
+            self._unit_section_generation = generation
+        return self._unit_section
 
     @property
     def _unit_name_key(self):
@@ -1179,7 +1672,9 @@ class BaseUnit(Group):
     @unit_name.setter
     def unit_name(self, value):
         validator_group_or_unit_name.validate(value, 'unit name')
+        old_value = self.unit_name
         self.l10n[self._unit_name_key] = value
+        self._update_index('unit', 'name', self._section_unit, old_value, value)
 
     @property
     def skill(self):
@@ -1189,6 +1684,8 @@ class BaseUnit(Group):
     def skill(self, value):
         self.validator_skill.validate(value, 'unit skill')
         self._section_unit['skill'] = value
+        # the client groups depend on the skill of their first unit
+        self._invalidate_index()
 
     @property
     def speed(self):
@@ -1215,7 +1712,9 @@ class BaseUnit(Group):
     @unit_id.setter
     def unit_id(self, value):
         valid_int.validate(value, 'unitId')
+        old_value = self.unit_id
         self._section_unit['unitId'] = value
+        self._update_index('unit', 'id', self._section_unit, old_value, value)
 
     @property
     def unit_pos_x(self):
@@ -1268,6 +1767,7 @@ class BaseUnit(Group):
 
 
 class FlyingUnit(BaseUnit):
+    __slots__ = ()
     validator_board_number = Validator(_type=str, _regex=r'[0-9]{3}', exc=ValueError,
                                        logger=LOGGER)
 
@@ -1448,8 +1948,9 @@ class FlyingUnit(BaseUnit):
 
         @property
         def channels(self) -> typing.Generator[tuple, None, None]:
-            for k in self._section_channels:
-                yield (k, float(self._section_channels[k]))
+            section_channels = self._section_channels
+            for k in section_channels:
+                yield (k, float(section_channels[k]))
 
         def get_frequency(self, channel):
             valid_positive_int.validate(channel, 'get_frequency')
@@ -1477,9 +1978,6 @@ class FlyingUnit(BaseUnit):
                     'channel {} for radio {} in aircraft {}'.format(channel, self.radio_name,
                                                                     self.parent_unit.unit_name))
 
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index)
-
     @property
     def radio_presets(self) -> typing.Generator['FlyingUnit.RadioPresets', None, None]:
         if self.skill == 'Client' and self.unit_type in FlyingUnit.RadioPresets.radio_enum.keys():
@@ -1535,20 +2033,24 @@ class FlyingUnit(BaseUnit):
 
 
 class Helicopter(FlyingUnit):
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index)
+    __slots__ = ()
 
 
 class Plane(FlyingUnit):
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index)
+    __slots__ = ()
 
 
 class Vehicle(BaseUnit):
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index)
+    __slots__ = ()
 
 
 class Ship(BaseUnit):
-    def __init__(self, mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index):
-        super().__init__(mission_dict, l10n, coa_color, country_index, group_category, group_index, unit_index)
+    __slots__ = ()
+
+
+Group.units_class_enum = {
+    'helicopter': Helicopter,
+    'plane': Plane,
+    'ship': Ship,
+    'vehicle': Vehicle,
+}
@@ -14,6 +14,18 @@ class MissionTime:
     def mission_start_time(self):
         return self.moment.strftime('%d/%m/%Y %H:%M:%S')
 
+    def apply_to_miz(self, infile: str, outfile: str = None):
+
+        if outfile is None:
+            outfile = infile
+
+        # only the start time is changed, so the rest of the mission is neither decoded nor encoded again
+        with Miz(infile, lazy=True, in_memory=True) as miz:
+            miz.mission.mission_start_time_as_date = self.mission_start_time()
+            miz.zip(outfile)
+
+            return True
+
 
 if __name__ == '__main__':
     time = MissionTime(datetime.datetime.now())
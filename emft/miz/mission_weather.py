@@ -198,7 +198,7 @@ class MissionWeather:
         if outfile is None:
             outfile = infile
 
-        with Miz(infile) as miz:
+        with Miz(infile, lazy=True, in_memory=True) as miz:
             miz.mission.weather.wind_at_ground_level_dir = self.wind_at_ground_level_dir
             miz.mission.weather.wind_at_ground_level_speed = self.wind_at_ground_level_speed
             miz.mission.weather.wind_at2000_dir = self._deviate_direction(self.wind_dir, 40)
@@ -1,19 +1,73 @@
 ﻿# coding=utf-8
+import io
+import os
+import struct
 import tempfile
-from filecmp import dircmp
+import time
+import zlib
 from os.path import exists, join
-from zipfile import BadZipFile, ZipFile, ZipInfo
+from zipfile import BadZipFile, ZIP_DEFLATED, ZipFile, ZipInfo, sizeFileHeader, stringFileHeader, structFileHeader
 
 from emft.core.constant import ENCODING
 from emft.core.logging import make_logger
-from emft.core.path import Path
+from emft.core.mirror import mirror_dir
+from emft.core.path import Path, create_temp_file
 from emft.core.progress import Progress
 from emft.core.sltp import SLTP
 from emft.miz.mission import Mission
-from emft.resources.dummy_miz import dummy_miz
 
 LOGGER = make_logger('miz')
 
+# Members of a MIZ file that EMFT decodes or rewrites; in memory mode, they are the only ones read from the archive
+LUA_MEMBERS = ('mission', 'options', 'warehouses', 'l10n/DEFAULT/dictionary', 'l10n/DEFAULT/mapResource')
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _member_data_offset(source: ZipFile, info: ZipInfo) -> int:
+    """Returns the offset of the compressed data of a member, right after its local header"""
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(structFileHeader, source.fp.read(sizeFileHeader))
+    if header[0] != stringFileHeader:
+        raise BadZipFile('bad local header for member: {}'.format(info.filename))
+    # the last two fields of the local header are the lengths of the name and extra field that follow it
+    return info.header_offset + sizeFileHeader + header[-2] + header[-1]
+
+
+def _copy_member(source: ZipFile, info: ZipInfo, target: ZipFile):
+    """
+    Copies a member to another archive without decompressing it
+
+    The compressed data is copied as it is, under a header that keeps the name, date, attributes, compression method,
+    CRC and sizes of the source member. zipfile has no public API for this; the header and data are written the same
+    way ZipFile.write() writes directories.
+    """
+    new_info = ZipInfo(info.filename, date_time=info.date_time)
+    for attr in ('compress_type', 'create_system', 'external_attr', 'internal_attr', 'comment',
+                 'CRC', 'compress_size', 'file_size'):
+        setattr(new_info, attr, getattr(info, attr))
+    # CRC and sizes are written in the local header, so the data is not followed by a data descriptor
+    new_info.flag_bits = info.flag_bits & ~0x08
+    offset = _member_data_offset(source, info)
+    # noinspection PyProtectedMember
+    with target._lock:
+        if target._seekable:
+            target.fp.seek(target.start_dir)
+        new_info.header_offset = target.fp.tell()
+        target.fp.write(new_info.FileHeader())
+        source.fp.seek(offset)
+        remaining = info.compress_size
+        while remaining:
+            chunk = source.fp.read(min(remaining, COPY_CHUNK_SIZE))
+            if not chunk:
+                raise BadZipFile('truncated member: {}'.format(info.filename))
+            target.fp.write(chunk)
+            remaining -= len(chunk)
+        target.start_dir = target.fp.tell()
+        target.filelist.append(new_info)
+        target.NameToInfo[new_info.filename] = new_info
+        target._didModify = True
+
 
 # noinspection PyAbstractClass
 class MizPath(Path):
@@ -31,7 +85,8 @@ class MizPath(Path):
 
 
 class Miz:
-    def __init__(self, path_to_miz_file, temp_dir=None, keep_temp_dir: bool = False, overwrite: bool = False):
+    def __init__(self, path_to_miz_file, temp_dir=None, keep_temp_dir: bool = False, overwrite: bool = False,
+                 lazy: bool = False, in_memory: bool = False):
 
         self.miz_path = Path(path_to_miz_file)
 
@@ -51,10 +106,22 @@ class Miz:
 
         self.overwrite = overwrite
 
-        self.tmpdir = Path(tempfile.mkdtemp('EMFT_'))
-        LOGGER.debug('temporary directory: {}'.format(self.tmpdir.abspath()))
+        self.lazy = lazy
+
+        # In memory mode, the Lua members are read straight from the archive, and the other members are copied
+        # from the source archive to the output one; nothing is extracted to a temporary directory.
+        self.in_memory = in_memory
+
+        if in_memory:
+            self.tmpdir = None
+        else:
+            self.tmpdir = Path(tempfile.mkdtemp('EMFT_'))
+            LOGGER.debug('temporary directory: {}'.format(self.tmpdir.abspath()))
 
         self.zip_content = None
+        self._members = {}
+        # Size and modification time of the extracted files, as they were right after extraction
+        self._extracted_stats = {}
         self._mission = None
         self._mission_qual = None
         self._l10n = None
@@ -70,27 +137,30 @@ class Miz:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type:
-            LOGGER.error('there were error with this mission, keeping temp dir at "{}" and re-raising'.format(
-                self.tmpdir.abspath()))
+            if self.tmpdir:
+                LOGGER.error('there were error with this mission, keeping temp dir at "{}" and re-raising'.format(
+                    self.tmpdir.abspath()))
+            else:
+                LOGGER.error('there were error with this mission, re-raising')
             LOGGER.error('{}\n{}'.format(exc_type, exc_val))
             return False
         else:
             LOGGER.debug('closing Mission object context')
-            if not self.keep_temp_dir:
+            if self.tmpdir and not self.keep_temp_dir:
                 LOGGER.debug('removing temp dir: {}'.format(self.tmpdir.abspath()))
                 self.tmpdir.rmtree()
 
     @property
     def mission_file(self):
-        return self.tmpdir.joinpath('mission')
+        return self.tmpdir.joinpath('mission') if self.tmpdir else None
 
     @property
     def dictionary_file(self):
-        return self.tmpdir.joinpath('l10n', 'DEFAULT', 'dictionary')
+        return self.tmpdir.joinpath('l10n', 'DEFAULT', 'dictionary') if self.tmpdir else None
 
     @property
     def map_res_file(self):
-        return self.tmpdir.joinpath('l10n', 'DEFAULT', 'mapResource')
+        return self.tmpdir.joinpath('l10n', 'DEFAULT', 'mapResource') if self.tmpdir else None
 
     @property
     def mission(self) -> Mission:
@@ -123,36 +193,14 @@ class Miz:
 
         with Miz(miz_file_path, overwrite=True) as m:
 
-            def mirror_dir(src, dst):
-                LOGGER.debug('{} -> {}'.format(src, dst))
-                diff_ = dircmp(src, dst, ignore)
-                diff_list = diff_.left_only + diff_.diff_files
-                LOGGER.debug('differences: {}'.format(diff_list))
-                for x in diff_list:
-                    source = Path(diff_.left).joinpath(x)
-                    target = Path(diff_.right).joinpath(x)
-                    LOGGER.debug('looking at: {}'.format(x))
-                    if source.isdir():
-                        LOGGER.debug('isdir: {}'.format(x))
-                        if not target.exists():
-                            LOGGER.debug('creating: {}'.format(x))
-                            target.mkdir()
-                        mirror_dir(source, target)
-                    else:
-                        LOGGER.debug('copying: {}'.format(x))
-                        source.copy2(diff_.right)
-                for sub in diff_.subdirs.values():
-                    assert isinstance(sub, dircmp)
-                    mirror_dir(sub.left, sub.right)
-
             m._encode()
 
-            if skip_options_file:
-                ignore = ['options']
-            else:
-                ignore = []
+            report = mirror_dir(m.tmpdir, target_dir, ignore=['options'] if skip_options_file else [])
 
-            mirror_dir(m.tmpdir, target_dir)
+        LOGGER.info('re-ordered {}: {} file(s) copied ({} bytes), {} file(s) removed'.format(
+            miz_file_path, len(report.files_copied), report.bytes_copied, len(report.files_deleted)
+        ))
+        return report
 
     def _decode(self):
 
@@ -165,21 +213,19 @@ class Miz:
 
         Progress.set_label('Decoding map resource')
         LOGGER.debug('reading map resource file')
-        with open(self.map_res_file, encoding=ENCODING) as f:
-            self._map_res, self._map_res_qual = SLTP().decode(f.read())
+        map_res_text = self._read_text('l10n/DEFAULT/mapResource', self.map_res_file)
+        self._map_res, self._map_res_qual = SLTP().decode(map_res_text)
         Progress.set_value(1)
 
         Progress.set_label('Decoding dictionary file')
         LOGGER.debug('reading l10n file')
-        with open(self.dictionary_file, encoding=ENCODING) as f:
-            self._l10n, self._l10n_qual = SLTP().decode(f.read())
+        self._l10n, self._l10n_qual = SLTP().decode(self._read_text('l10n/DEFAULT/dictionary', self.dictionary_file))
         Progress.set_value(2)
 
         Progress.set_label('Decoding mission file')
         LOGGER.debug('reading mission file')
-        with open(self.mission_file, encoding=ENCODING) as f:
-            mission_data, self._mission_qual = SLTP().decode(f.read())
-            self._mission = Mission(mission_data, self._l10n)
+        mission_data, self._mission_qual = SLTP().decode(self._read_text('mission', self.mission_file), lazy=self.lazy)
+        self._mission = Mission(mission_data, self._l10n)
         Progress.set_value(3)
 
         LOGGER.debug('decoding done')
@@ -192,24 +238,39 @@ class Miz:
 
         Progress.set_label('Encoding map resource')
         LOGGER.debug('encoding map resource')
-        with open(self.map_res_file, mode='w', encoding=ENCODING) as f:
-            f.write(SLTP().encode(self._map_res, self._map_res_qual))
+        self._write_text('l10n/DEFAULT/mapResource', self.map_res_file, self._map_res, self._map_res_qual)
         Progress.set_value(1)
 
         Progress.set_label('Encoding l10n dictionary')
         LOGGER.debug('encoding l10n dictionary')
-        with open(self.dictionary_file, mode='w', encoding=ENCODING) as f:
-            f.write(SLTP().encode(self.l10n, self._l10n_qual))
+        self._write_text('l10n/DEFAULT/dictionary', self.dictionary_file, self.l10n, self._l10n_qual)
         Progress.set_value(2)
 
         Progress.set_label('Encoding mission dictionary')
         LOGGER.debug('encoding mission dictionary')
-        with open(self.mission_file, mode='w', encoding=ENCODING) as f:
-            f.write(SLTP().encode(self.mission.d, self._mission_qual))
+        self._write_text('mission', self.mission_file, self.mission.d, self._mission_qual)
         Progress.set_value(3)
 
         LOGGER.debug('encoding done')
 
+    def _read_text(self, member: str, file: Path) -> str:
+        if self.in_memory:
+            # Same newline translation as a file opened in text mode
+            return io.TextIOWrapper(io.BytesIO(self._members[member]), encoding=ENCODING).read()
+        with open(file, encoding=ENCODING) as f:
+            return f.read()
+
+    def _write_text(self, member: str, file: Path, table: dict, qualifier: str):
+        if self.in_memory:
+            buffer = io.BytesIO()
+            stream = io.TextIOWrapper(buffer, encoding=ENCODING)
+            SLTP().encode_to_stream(table, qualifier, stream)
+            stream.flush()
+            self._members[member] = buffer.getvalue()
+            return
+        with open(file, mode='w', encoding=ENCODING) as f:
+            SLTP().encode_to_stream(table, qualifier, f)
+
     def _check_extracted_content(self):
 
         for filename in self.zip_content:
@@ -225,17 +286,36 @@ class Miz:
             LOGGER.debug('unzipping item: {}'.format(item.filename))
 
             try:
-                zip_file.extract(item, self.tmpdir.abspath())
+                extracted = zip_file.extract(item, self.tmpdir.abspath())
             except:
                 LOGGER.error('failed to extract archive member: {}'.format(item.filename))
                 raise
 
+            # files are dated like their member, so that any later write changes their modification time
+            mtime = time.mktime(item.date_time + (0, 0, -1))
+            os.utime(extracted, (mtime, mtime))
+            stat = os.stat(extracted)
+            self._extracted_stats[item.filename] = stat.st_size, stat.st_mtime_ns
+
+    def _read_members_from_zip(self, zip_file):
+
+        self._members = {}
+
+        for member in LUA_MEMBERS:
+
+            if member not in self.zip_content:
+                LOGGER.error('missing file in miz: {}'.format(member))
+                raise FileNotFoundError(member)
+
+            LOGGER.debug('reading item: {}'.format(member))
+            self._members[member] = zip_file.read(member)
+
     def unzip(self, overwrite: bool = False):
 
         if self.zip_content and not overwrite:
-            raise FileExistsError(self.tmpdir.abspath())
+            raise FileExistsError(self.tmpdir.abspath() if self.tmpdir else self.miz_path.abspath())
 
-        LOGGER.debug('unzipping miz to temp dir')
+        LOGGER.debug('unzipping miz {}'.format('in memory' if self.in_memory else 'to temp dir'))
 
         try:
 
@@ -245,6 +325,11 @@ class Miz:
 
                 self.zip_content = [f.filename for f in zip_file.infolist()]
 
+                if self.in_memory:
+                    self._read_members_from_zip(zip_file)
+                    LOGGER.debug('all files have been found, miz successfully read')
+                    return
+
                 self._extract_files_from_zip(zip_file)
 
         except BadZipFile:
@@ -257,17 +342,7 @@ class Miz:
         LOGGER.debug('checking miz content')
 
         # noinspection PyTypeChecker
-        for miz_item in map(
-            join,
-            [self.tmpdir.abspath()],
-            [
-                'mission',
-                'options',
-                'warehouses',
-                'l10n/DEFAULT/dictionary',
-                'l10n/DEFAULT/mapResource'
-            ]
-        ):
+        for miz_item in map(join, [self.tmpdir.abspath()], LUA_MEMBERS):
 
             if not exists(miz_item):
                 LOGGER.error('missing file in miz: {}'.format(miz_item))
@@ -288,14 +363,65 @@ class Miz:
 
         LOGGER.debug('zipping mission to: {}'.format(destination))
 
-        with open(destination, mode='wb') as f:
-            f.write(dummy_miz)
+        # The source archive is still read while the new one is written; the latter is only moved to its
+        # destination once complete, which also allows overwriting the source MIZ file
+        temp_destination = create_temp_file(suffix='.miz', prefix='EMFT_', create_in_dir=destination.dirname())
 
-        with ZipFile(destination, mode='w', compression=8) as _z:
+        try:
+            with ZipFile(self.miz_path.abspath()) as source, \
+                    ZipFile(temp_destination, mode='w', compression=ZIP_DEFLATED) as _z:
 
-            for f in self.zip_content:
-                abs_path = self.tmpdir.joinpath(f).abspath()
-                LOGGER.debug('injecting in zip file: {}'.format(abs_path))
-                _z.write(abs_path, arcname=f)
+                for f in self.zip_content:
+
+                    info = source.getinfo(f)
+
+                    if self._member_unchanged(f, info):
+                        LOGGER.debug('copying from source miz: {}'.format(f))
+                        _copy_member(source, info, _z)
+
+                    elif self.in_memory:
+                        LOGGER.debug('injecting in zip file: {}'.format(f))
+                        _z.writestr(f, self._members[f])
+
+                    else:
+                        abs_path = self.tmpdir.joinpath(f).abspath()
+                        LOGGER.debug('injecting in zip file: {}'.format(abs_path))
+                        # only the Lua members are deflated again; other resources keep their compression method
+                        _z.write(abs_path, arcname=f,
+                                 compress_type=ZIP_DEFLATED if f in LUA_MEMBERS else info.compress_type)
+
+            os.replace(temp_destination, destination)
+
+        finally:
+            if temp_destination.exists():
+                temp_destination.remove()
 
         return destination
+
+    def _member_unchanged(self, member: str, info: ZipInfo) -> bool:
+
+        if self.in_memory:
+            if member not in self._members:
+                return True
+            data = self._members[member]
+            return len(data) == info.file_size and zlib.crc32(data) == info.CRC
+
+        if info.is_dir():
+            return True
+
+        abs_path = self.tmpdir.joinpath(member).abspath()
+        stat = os.stat(abs_path)
+
+        if stat.st_size != info.file_size:
+            return False
+
+        # files that were not touched since they were extracted do not need to be read again
+        if self._extracted_stats.get(member) == (stat.st_size, stat.st_mtime_ns):
+            return True
+
+        crc = 0
+        with open(abs_path, mode='rb') as stream:
+            for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+                crc = zlib.crc32(chunk, crc)
+
+        return crc == info.CRC
@@ -1,33 +1,208 @@
 # coding=utf-8
 
+import base64
 import math
-import pickle
-from collections import namedtuple
+import sys
+import types
+import typing
+from array import array
+from collections import defaultdict, namedtuple
+from collections.abc import Mapping
 
-# noinspection PyProtectedMember
-from emft.miz._parking_spots import parkings
 from emft.miz.mission import Static
 
 ParkingSpot = namedtuple('ParkingSpot', 'airport spot')
-parkings = pickle.loads(parkings)
+
+# A unit is only matched to a spot closer than this (in meters)
+MAX_DISTANCE = 50
+
+DEFAULT_THEATRE = 'Caucasus'
+
+# Version of the format of emft/miz/_parking_spots.py, see encode_theatre
+DATA_VERSION = 1
+
+
+class SpotIndex:
+    """
+    Uniform grid over parking spots
+
+    Cells are as large as the matching distance, so a lookup only ever has to look at the 9 cells around a position.
+    When several spots are at the same distance, the one that was added first wins.
+    """
+
+    def __init__(self, cell_size: float = MAX_DISTANCE):
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._ordinal = 0
+
+    def _cell(self, x: float, y: float) -> typing.Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def add(self, airport: str, spot, position: typing.Tuple[float, float]):
+        x, y = position
+        self._cells[self._cell(x, y)].append((self._ordinal, x, y, ParkingSpot(airport=airport, spot=spot)))
+        self._ordinal += 1
+
+    def remove(self, airport: str, spot, position: typing.Tuple[float, float]):
+        cell = self._cell(*position)
+        entries = [entry for entry in self._cells.get(cell, ()) if entry[3] != (airport, spot)]
+        if entries:
+            self._cells[cell] = entries
+        else:
+            self._cells.pop(cell, None)
+
+    def _nearest(self, position, max_distance):
+        x, y = position
+        cell_x, cell_y = self._cell(x, y)
+        reach = int(math.ceil(max_distance / self.cell_size))
+        best = None
+        for i in range(cell_x - reach, cell_x + reach + 1):
+            for j in range(cell_y - reach, cell_y + reach + 1):
+                for ordinal, spot_x, spot_y, spot in self._cells.get((i, j), ()):
+                    dist = math.hypot(x - spot_x, y - spot_y)
+                    if dist < max_distance and (best is None or (dist, ordinal) < best[:2]):
+                        best = (dist, ordinal, spot)
+        return best
+
+    def nearest(self, position: typing.Tuple[float, float],
+                max_distance: float = MAX_DISTANCE) -> typing.Optional[ParkingSpot]:
+        """Returns the closest spot strictly within max_distance of position, or None"""
+        best = self._nearest(position, max_distance)
+        return best[2] if best else None
+
+
+def _pack(values: array) -> str:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _unpack(typecode: str, data: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_theatre(parkings: dict) -> tuple:
+    """
+    Packs the parking spots of a theatre ({airport: {spot: (x, y)}}) for emft/miz/_parking_spots.py
+
+    The result is the tuple of airport names, followed by three little-endian arrays (encoded in base 64) that hold,
+    for each spot: the index of its airport (uint16), its number (uint16), and its x and y coordinates (float32).
+    """
+    airports = tuple(parkings)
+    airport_indexes, spots, coordinates = array('H'), array('H'), array('f')
+    for airport_index, airport in enumerate(airports):
+        for spot, (x, y) in parkings[airport].items():
+            airport_indexes.append(airport_index)
+            spots.append(spot)
+            coordinates.extend((x, y))
+    return airports, _pack(airport_indexes), _pack(spots), _pack(coordinates)
+
+
+def decode_theatre(data: tuple) -> dict:
+    airports, airport_indexes, spots, coordinates = data
+    airport_indexes, spots = _unpack('H', airport_indexes), _unpack('H', spots)
+    coordinates = _unpack('f', coordinates).tolist()
+    parkings = {airport: {} for airport in airports}
+    for i, (airport_index, spot) in enumerate(zip(airport_indexes, spots)):
+        parkings[airports[airport_index]][spot] = (coordinates[2 * i], coordinates[2 * i + 1])
+    return parkings
+
+
+_THEATRES = {}
+_FARPS = {}
+_FARPS_INDEX = SpotIndex()
+
+
+def _data() -> dict:
+    # noinspection PyProtectedMember
+    from emft.miz._parking_spots import THEATRES, VERSION
+    if VERSION != DATA_VERSION:
+        raise RuntimeError('unknown parking spots data version: {}'.format(VERSION))
+    return THEATRES
+
+
+def theatres() -> typing.List[str]:
+    return sorted(_data())
+
+
+def _load(theatre: str) -> typing.Tuple[dict, SpotIndex]:
+    if theatre not in _THEATRES:
+        data = _data()
+        if theatre not in data:
+            raise ValueError('no parking spots for theatre: {}'.format(theatre))
+        parkings = decode_theatre(data[theatre])
+        index = SpotIndex()
+        for airport in parkings:
+            for spot, position in parkings[airport].items():
+                index.add(airport, spot, position)
+        parkings['FARP'] = _FARPS
+        _THEATRES[theatre] = parkings, index
+    return _THEATRES[theatre]
+
+
+def get_parkings(theatre: str = DEFAULT_THEATRE) -> dict:
+    """Returns the parking spots of a theatre, as {airport: {spot: (x, y)}}; the table is loaded on first use"""
+    return _load(theatre)[0]
+
+
+class _DefaultTheatreParkings(Mapping):
+    """
+    Read-only view of the parking spots of the default theatre, as returned by get_parkings(); loaded on first access
+
+    Lookups go through the spot index of the theatre, which changes made to the table would bypass; FARPs are
+    registered with add_farp.
+    """
+
+    def __getitem__(self, airport):
+        return types.MappingProxyType(get_parkings()[airport])
+
+    def __iter__(self):
+        return iter(get_parkings())
+
+    def __len__(self):
+        return len(get_parkings())
+
+    def __repr__(self):
+        return repr(get_parkings())
+
+
+parkings = _DefaultTheatreParkings()
 
 
 def clear_farps():
-    parkings['FARP'] = {}
+    for name, position in _FARPS.items():
+        _FARPS_INDEX.remove('FARP', name, position)
+    _FARPS.clear()
 
 
 def add_farp(farp: Static):
-    parkings['FARP'][farp.static_name] = farp.static_position
-
-
-def unit_pos_to_spot(unit_pos) -> ParkingSpot:
-    min_ = 50
-    res = None
-    for airport in parkings:
-        for spot in parkings[airport]:
-            spot_pos = parkings[airport][spot]
-            dist = math.hypot(unit_pos[0] - spot_pos[0], unit_pos[1] - spot_pos[1])
-            if dist < min_:
-                min_ = dist
-                res = ParkingSpot(airport=airport, spot=spot)
-    return res
+    name, position = farp.static_name, farp.static_position
+    if name in _FARPS:
+        _FARPS_INDEX.remove('FARP', name, _FARPS[name])
+    _FARPS[name] = position
+    _FARPS_INDEX.add('FARP', name, position)
+
+
+def units_pos_to_spots(units_pos: typing.Iterable,
+                       theatre: str = DEFAULT_THEATRE) -> typing.List[typing.Optional[ParkingSpot]]:
+    """Batch version of unit_pos_to_spot"""
+    _, index = _load(theatre)
+    result = []
+    for unit_pos in units_pos:
+        best = index._nearest(unit_pos, MAX_DISTANCE)
+        if _FARPS:
+            farp = _FARPS_INDEX._nearest(unit_pos, MAX_DISTANCE)
+            # airports win ties against FARPs
+            if farp is not None and (best is None or farp[0] < best[0]):
+                best = farp
+        result.append(best[2] if best else None)
+    return result
+
+
+def unit_pos_to_spot(unit_pos, theatre: str = DEFAULT_THEATRE) -> typing.Optional[ParkingSpot]:
+    return units_pos_to_spots([unit_pos], theatre)[0]
@@ -1,13 +1,28 @@
 # coding=utf-8
+"""
+Generates emft/miz/_parking_spots.py
 
+Every group of the MIZ files given must sit on a parking spot, and be named "<airport>#<spot number>". Spots are
+stored under the theatre of their mission; theatres that are already in the output file and that are not ingested
+again are kept as they are.
+"""
+
+import os
+import runpy
+import typing
 from collections import defaultdict
 
 import click
 
+from emft.miz.parking_spots import DATA_VERSION, decode_theatre, encode_theatre
 
-@click.command()
-@click.argument('miz_path', type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
-def main(miz_path):
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_parking_spots.py')
+
+# Length of the chunks the packed arrays are split into in the generated module
+CHUNK_SIZE = 100
+
+
+def read_miz(miz_path: str) -> typing.Tuple[str, dict]:
     from emft.miz.miz import Miz
     with Miz(miz_path) as m:
         mis = m.mission
@@ -15,25 +30,61 @@ def main(miz_path):
     result = defaultdict(dict)
     for unit in mis.units:
         airport, spot = unit.group_name.split('#')
-        spot = int(spot)
-        # print(airport, int(spot), unit.unit_position)
-        result[airport][spot] = unit.unit_position
+        result[airport][int(spot)] = unit.unit_position
+    return mis.theatre, dict(result)
+
 
-    import pickle
-    with open('_parking_spots.py', mode='w') as f:
-        f.write('parkings = {}\n'.format(pickle.dumps(result)))
+def read_module(path: str) -> dict:
+    module = runpy.run_path(path)
+    if module.get('VERSION') != DATA_VERSION:
+        raise ValueError('unknown parking spots data version in {}: {}'.format(path, module.get('VERSION')))
+    return {theatre: decode_theatre(data) for theatre, data in module['THEATRES'].items()}
 
-        # # print(out)
-        # import src.miz.out
-        # with open('out.py') as f:
-        #     res = pickle.loads(src.miz.out.parkings)
 
-        # print(res)
+def write_module(theatres: dict, path: str):
+    lines = [
+        '# coding=utf-8',
+        '# Generated by emft.miz.parse_parking_spots, do not edit; see emft.miz.parking_spots.encode_theatre',
+        '',
+        'VERSION = {}'.format(DATA_VERSION),
+        '',
+        'THEATRES = {',
+    ]
+    for theatre in sorted(theatres):
+        airports, *arrays = encode_theatre(theatres[theatre])
+        lines.append('    {!r}: ('.format(theatre))
+        lines.append('        (')
+        lines.extend('            {!r},'.format(airport) for airport in airports)
+        lines.append('        ),')
+        for packed in arrays:
+            chunks = [packed[i:i + CHUNK_SIZE] for i in range(0, len(packed), CHUNK_SIZE)] or ['']
+            lines.append('        (')
+            lines.extend('            {!r}'.format(chunk) for chunk in chunks)
+            lines.append('        ),')
+        lines.append('    ),')
+    lines.append('}')
+    with open(path, mode='w', encoding='utf8', newline='\n') as stream:
+        stream.write('\n'.join(lines) + '\n')
 
-        # for k in result:
-        #     parkings[k] = result[k]
-        #
-        # parkings.write()
+
+@click.command()
+@click.argument('miz_paths', nargs=-1, required=True,
+                type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True))
+@click.option('-o', '--output', default=OUTPUT, show_default=True, type=click.Path(dir_okay=False, writable=True),
+              help='Module to write the parking spots to')
+def main(miz_paths, output):
+    theatres = read_module(output) if os.path.exists(output) else {}
+    ingested = set()
+    for miz_path in miz_paths:
+        theatre, parkings = read_miz(miz_path)
+        if theatre not in ingested:
+            theatres[theatre] = {}
+            ingested.add(theatre)
+        theatres[theatre].update(parkings)
+        click.echo('{}: {} parking spot(s) at {} airport(s) in {}'.format(
+            miz_path, sum(len(x) for x in parkings.values()), len(parkings), theatre
+        ))
+    write_module(theatres, output)
 
 
 if __name__ == '__main__':
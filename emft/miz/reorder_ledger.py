@@ -0,0 +1,83 @@
+# coding=utf-8
+"""
+Keeps track of the MIZ files that have been reordered, so that reordering an unchanged file again is a no-op
+
+Along with the MIZ file, each entry records the digest of the files that were mirrored onto the output folder (see
+emft.core.mirror), so that a reorder is done again if any of them was edited or removed since.
+"""
+import json
+import os
+import tempfile
+
+from emft.__version__ import __version__
+from emft.core import constant
+from emft.core.logging import make_logger
+from emft.core.mirror import mirror_digest
+from emft.core.path import Path
+
+LOGGER = make_logger(__name__)
+
+LEDGER_VERSION = 2
+
+
+class ReorderLedger:
+    def __init__(self, path: str = None):
+        self.path = Path(path or constant.PATH_REORDER_LEDGER_FILE).abspath()
+        self._entries = self._read()
+
+    def _read(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding='utf8') as stream:
+                data = json.load(stream)
+            if data.get('version') != LEDGER_VERSION:
+                raise ValueError('unknown ledger version: {}'.format(data.get('version')))
+            return data['entries']
+        except (ValueError, KeyError, AttributeError):
+            LOGGER.warning('discarding unreadable reorder ledger: {}'.format(self.path))
+            return {}
+
+    def _write(self):
+        fd, temp_path = tempfile.mkstemp(prefix='.EMFT_', suffix='.json', dir=self.path.dirname())
+        try:
+            with os.fdopen(fd, mode='w', encoding='utf8') as stream:
+                json.dump({'version': LEDGER_VERSION, 'entries': self._entries}, stream, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def make_entry(miz_file_path: str, output_folder: str, skip_options_file: bool) -> dict:
+        """Builds the ledger entry describing the reorder of a MIZ file, as it is right now"""
+        miz_file = Path(miz_file_path).abspath()
+        return {
+            'source': str(miz_file),
+            'size': miz_file.getsize(),
+            'crc32': miz_file.crc32(),
+            'output_folder': str(Path(output_folder).abspath()),
+            'skip_options_file': bool(skip_options_file),
+            'emft_version': __version__,
+        }
+
+    @staticmethod
+    def _key(entry: dict) -> str:
+        return '{} -> {}'.format(os.path.normcase(entry['source']), os.path.normcase(entry['output_folder']))
+
+    def is_up_to_date(self, entry: dict) -> bool:
+        """Returns True if the exact same reorder has already been done and its output is still untouched"""
+        recorded = dict(self._entries.get(self._key(entry), {}))
+        digest = recorded.pop('mirror', None)
+        if digest is None or recorded != entry:
+            return False
+        return mirror_digest(entry['output_folder']) == digest
+
+    def record(self, entry: dict):
+        """Records a reorder; to be called once the output folder has been written"""
+        self._entries[self._key(entry)] = dict(entry, mirror=mirror_digest(entry['output_folder']))
+        self._write()
+
+    def forget(self, entry: dict):
+        if self._entries.pop(self._key(entry), None) is not None:
+            self._write()
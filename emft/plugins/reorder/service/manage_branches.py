@@ -2,7 +2,7 @@
 
 from emft.config import Config
 from emft.core.providers.github import GHSession
-from emft.core.threadpool import ThreadPool
+from emft.core.threadpool import get_executor
 from emft.plugins.reorder.finder import FindBranch, FindProfile
 from emft.plugins.reorder.service import ConvertUrl
 from emft.plugins.reorder.value import Branch, Branches, BranchesModelContainer
@@ -11,7 +11,6 @@ from emft.plugins.reorder.value import Branch, Branches, BranchesModelContainer
 class ManageBranches:
     _GH_SESSION = None
     _WATCHERS = []
-    _POOL = ThreadPool(1, 'ManageBranches', _daemon=True)
 
     @staticmethod
     def watch_branch_change(func: callable):
@@ -57,7 +56,7 @@ class ManageBranches:
         def task_callback(*_):
             ManageBranches.notify_watchers()
 
-        ManageBranches._POOL.queue_task(
+        get_executor('ManageBranches').queue_task(
             ManageBranches._refresh_gh_branches,
             _task_callback=task_callback
         )
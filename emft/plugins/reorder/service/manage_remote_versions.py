@@ -7,7 +7,7 @@ from emft.core.logging import make_logger
 from emft.core.path import Path
 from emft.core.progress import Progress
 from emft.core.providers.appveyor import AVSession
-from emft.core.threadpool import ThreadPool
+from emft.core.threadpool import PRIORITY_HIGH, PRIORITY_LOW, get_executor
 from emft.gui.base import box_question
 from emft.plugins.reorder.finder import FindBranch, FindProfile, FindRemoteVersion
 from emft.plugins.reorder.service import ConvertUrl
@@ -18,7 +18,6 @@ LOGGER = make_logger(__name__)
 
 class ManageRemoteVersions:
     _WATCHERS = []
-    _POOL = ThreadPool(1, 'ManageRemoteVersion', _daemon=True)
 
     @staticmethod
     def watch_remote_version_change(func: callable):
@@ -71,10 +70,11 @@ class ManageRemoteVersions:
         branch = FindBranch.get_active_branch()
 
         if branch:
-            ManageRemoteVersions._POOL.queue_task(
+            get_executor('ManageRemoteVersion').queue_task(
                 ManageRemoteVersions._get_latest_remote_version,
                 kwargs=dict(branch=branch.name),
                 _task_callback=task_callback,
+                _priority=PRIORITY_LOW,
             )
 
         else:
@@ -98,7 +98,7 @@ class ManageRemoteVersions:
                 if not box_question(ui_parent, 'Local file already exists; do you want to overwrite?'):
                     return
 
-            ManageRemoteVersions._POOL.queue_task(
+            get_executor('ManageRemoteVersion').queue_task(
                 downloader.download,
                 kwargs=dict(
                     url=latest.download_url,
@@ -106,4 +106,5 @@ class ManageRemoteVersions:
                     file_size=latest.remote_file_size,
                 ),
                 _task_callback=task_callback,
+                _priority=PRIORITY_HIGH,
             )
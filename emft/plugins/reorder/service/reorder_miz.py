@@ -2,17 +2,16 @@
 from emft.config import Config
 from emft.core.logging import make_logger
 from emft.core.path import Path
-from emft.core.threadpool import ThreadPool
+from emft.core.threadpool import get_executor
 from emft.gui.main_ui_interface import I
 from emft.miz import Miz
+from emft.miz.reorder_ledger import ReorderLedger
 from emft.plugins.reorder.finder import FindOutputFolder, FindProfile, FindRemoteVersion
 
 LOGGER = make_logger(__name__)
 
 
 class ReorderMiz:
-    _POOL = ThreadPool(1, 'reorder', _daemon=True)
-
     @staticmethod
     def _on_reorder_error(miz_file):
         # noinspection PyCallByClass
@@ -42,6 +41,7 @@ class ReorderMiz:
             miz_file_path=str(miz_file.abspath()),
             output_folder_path=output_folder,
             skip_option_file=Config().skip_options_file,
+            force=True,
         )
 
     @staticmethod
@@ -73,18 +73,35 @@ class ReorderMiz:
             skip_option_file=Config().skip_options_file,
         )
 
+    @staticmethod
+    def _reorder(
+        miz_file_path: str,
+        output_folder_path: str,
+        skip_option_file: bool,
+        force: bool
+    ):
+        ledger = ReorderLedger()
+        entry = ReorderLedger.make_entry(miz_file_path, output_folder_path, skip_option_file)
+        if not force and ledger.is_up_to_date(entry):
+            LOGGER.info(f'MIZ file has not changed since it was last reordered, skipping: {miz_file_path}')
+            return
+        Miz.reorder(miz_file_path, output_folder_path, skip_option_file)
+        ledger.record(entry)
+
     @staticmethod
     def reorder_miz_file(
         miz_file_path: str,
         output_folder_path: str,
-        skip_option_file: bool
+        skip_option_file: bool,
+        force: bool = False
     ):
-        ReorderMiz._POOL.queue_task(
-            task=Miz.reorder,
+        get_executor('reorder').queue_task(
+            task=ReorderMiz._reorder,
             kwargs=dict(
                 miz_file_path=miz_file_path,
-                target_dir=output_folder_path,
-                skip_options_file=skip_option_file
+                output_folder_path=output_folder_path,
+                skip_option_file=skip_option_file,
+                force=force,
             ),
             _err_callback=ReorderMiz._on_reorder_error,
             _err_args=[miz_file_path],
@@ -10,7 +10,7 @@ from emft.core import downloader, nice_exit
 from emft.core.logging import make_logger
 from emft.core.properties import WatchedProperty
 from emft.core.providers.appveyor import AVBuild, AVSession  # noqa: F401
-from emft.core.threadpool import ThreadPool
+from emft.core.threadpool import get_executor
 from emft.updater import channel
 from .customspec import CustomSpec
 from .customversion import CustomVersion
@@ -95,7 +95,6 @@ class Updater(Machine):
 
         self._channel = channel
         self._av_user, self._av_repo = av_user, av_repo
-        self._pool = ThreadPool(_num_threads=1, _basename='updater', _daemon=True)
 
         self._auto_update = False
         try:
@@ -238,7 +237,7 @@ class Updater(Machine):
 
         LOGGER.debug('start collection')
         self._auto_update = event.kwargs.get('auto_update', False)
-        self._pool.queue_task(
+        get_executor('updater').queue_task(
             task=self._collect_releases_in_the_background,
             kwargs=dict(
                 _av_user=self._av_user,
@@ -269,7 +268,7 @@ class Updater(Machine):
 
             for artifact in AVSession().get_artifacts(job_id):
                 if artifact.name == 'hexdigest':
-                    self._pool.queue_task(
+                    get_executor('updater').queue_task(
                         task=_get_hexdigest,
                         _task_callback=_set_hexdigest,
                     )
@@ -298,7 +297,7 @@ class Updater(Machine):
 
         if self._asset:
             LOGGER.debug(f'from: {event.event.name}: downloading latest asset')
-            self._pool.queue_task(
+            get_executor('updater').queue_task(
                 task=_download_in_the_background,
                 kwargs=dict(
                     url=self.asset.url,
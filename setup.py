@@ -87,6 +87,12 @@ setup_requires = [
     'pytest-runner',
 ]
 
+# Optional dependencies: compiled Lua parser picked up by emft.core.sltp, NumPy for the bulk unit positions API
+extras_require = {
+    'lupa': ['lupa'],
+    'numpy': ['numpy'],
+}
+
 entry_points = '''
 [console_scripts]
 emft=emft.main:main
@@ -109,6 +115,7 @@ if __name__ == '__main__':
         packages=['emft'],
         include_package_data=True,
         install_requires=install_requires,
+        extras_require=extras_require,
         entry_points=entry_points,
         tests_require=test_requires,
         use_scm_version=True,
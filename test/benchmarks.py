@@ -0,0 +1,212 @@
+# coding=utf-8
+"""
+Timing and memory benchmarks
+
+They are not part of the test suite (their results depend on the machine); run them from the root of the repository:
+
+    python -m test.benchmarks [name ...]
+"""
+
+import glob
+import importlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from collections import defaultdict
+from itertools import chain
+from unittest import mock
+
+from natsort import natsorted
+
+from emft.core import sltp as sltp_module
+from emft.core.sltp import NUMBERS, SLTP
+from emft.core.threadpool import ThreadPool
+from emft.miz.miz import Miz
+from emft.miz.mission import Mission
+
+BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_files')
+TEST_MIZ_FILES = [x for x in glob.glob(os.path.join(BASE_PATH, '*.miz')) if 'bad_zip_file' not in x]
+TEST_FILES_DIR_LONG = os.path.join(BASE_PATH, 'sltp', 'long')
+
+ENCODING = 'iso8859_15'
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _read_miz_members(miz_file):
+    with zipfile.ZipFile(miz_file) as zip_file:
+        for member in ('mission', 'l10n/DEFAULT/dictionary', 'l10n/DEFAULT/mapResource'):
+            if member in zip_file.namelist():
+                yield member, zip_file.read(member).decode(ENCODING).replace('\r\n', '\n')
+
+
+def _natsorted_keys(keys, as_str=False):
+    return natsorted(keys, key=str) if as_str else natsorted(keys)
+
+
+@benchmark
+def sorted_keys():
+    data = [data for miz_file in TEST_MIZ_FILES for _, data in _read_miz_members(miz_file)]
+
+    def _run():
+        start = time.perf_counter()
+        for text in data:
+            decoded, qualifier = SLTP().decode(text)
+            SLTP().encode(decoded, qualifier)
+        return time.perf_counter() - start
+
+    fast = _run()
+    with mock.patch.object(sltp_module, 'sorted_keys', _natsorted_keys):
+        reference = _run()
+    print('decode/encode of {} members: {:.3f}s (natsort: {:.3f}s)'.format(len(data), fast, reference))
+
+
+def _read_long_files():
+    for test_file in sorted(os.listdir(TEST_FILES_DIR_LONG)):
+        with open(os.path.join(TEST_FILES_DIR_LONG, test_file), encoding=ENCODING) as f:
+            yield test_file, f.read()
+
+
+@benchmark
+def numbers_memory():
+    for test_file, data in _read_long_files():
+        for numbers in NUMBERS:
+            tracemalloc.start()
+            start = time.perf_counter()
+            decoded, qualifier = SLTP(numbers=numbers).decode(data)
+            SLTP().encode(decoded, qualifier)
+            elapsed = time.perf_counter() - start
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del decoded
+            print('{}: {} numbers: {:.3f}s, {} KiB'.format(test_file, numbers, elapsed, memory // 1024))
+
+
+@benchmark
+def encode_to_stream_memory():
+    for test_file, data in _read_long_files():
+        decoded, qualifier = SLTP().decode(data)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracemalloc.start()
+            start = time.perf_counter()
+            with open(os.path.join(tmpdir, 'out'), mode='w', encoding=ENCODING) as f:
+                SLTP().encode_to_stream(decoded, qualifier, f)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print('{}: {} KiB of text encoded in {:.3f}s, peak memory {} KiB'.format(
+            test_file, len(data) // 1024, elapsed, peak // 1024))
+
+
+@benchmark
+def encode_inline_arrays():
+    table = {
+        'route': {'points': {x: {'x': x * 1.5, 'y': -x * 2.5, 'pylons': [x, x + 1, x + 2]} for x in range(1, 20000)}},
+        'arrays': [[x, x * 0.5] for x in range(100000)],
+    }
+    start = time.perf_counter()
+    encoded = SLTP().encode(table, 'mission = ')
+    elapsed = time.perf_counter() - start
+    print('encoded {} KiB in {:.3f}s'.format(len(encoded) // 1024, elapsed))
+
+
+@benchmark
+def iterate_mission_objects():
+    for test_file in ('all_objects.miz', 'TRMT_2.4.0.miz'):
+        with Miz(os.path.join(BASE_PATH, test_file), in_memory=True) as miz:
+            mission_dict, l10n = miz.mission.d, miz.l10n
+        start = time.perf_counter()
+        for _ in range(20):
+            list(Mission(mission_dict, l10n).units)
+        elapsed = (time.perf_counter() - start) / 20
+        tracemalloc.start()
+        mission = Mission(mission_dict, l10n)
+        objects = list(chain(mission.groups, mission.units))
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print('{}: {} groups and units iterated in {:.2f}ms, {} KiB'.format(
+            test_file, len(objects), elapsed * 1000, memory // 1024))
+
+
+@benchmark
+def threadpool_latency():
+    """Time between queueing a task on an idle pool and the task starting (the pool used to poll every 100 ms)"""
+    pool = ThreadPool(4, 'benchmark', True)
+    latencies = []
+    for _ in range(50):
+        started = threading.Event()
+        queued = time.perf_counter()
+        pool.queue_task(lambda: latencies.append(time.perf_counter() - queued) or started.set())
+        started.wait(5)
+        time.sleep(0.005)
+    pool.join_all()
+    latencies.sort()
+    print('queue->start latency: p50 {:.3f}ms, max {:.3f}ms'.format(latencies[25] * 1000, latencies[-1] * 1000))
+
+
+def _fresh_import(name: str):
+    sys.modules.pop(name, None)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    return module, time.perf_counter() - start
+
+
+@benchmark
+def parking_spots_import():
+    """Cost of the parking spots data, against the pickle literal module that was loaded when importing emft.miz"""
+    from emft.miz import parking_spots
+    theatre = parking_spots.DEFAULT_THEATRE
+    parkings = {airport: spots for airport, spots in parking_spots.get_parkings(theatre).items() if airport != 'FARP'}
+    data_module = sys.modules['emft.miz._parking_spots']
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # the format of emft/miz/_parking_spots.py before spots were packed per theatre
+        pickled_module = os.path.join(tmpdir, '_pickled_parking_spots.py')
+        with open(pickled_module, mode='w') as stream:
+            stream.write('parkings = {!r}\n'.format(pickle.dumps(defaultdict(dict, parkings), protocol=3)))
+        importlib.invalidate_caches()
+        sys.path.insert(0, tmpdir)
+        old, new = [], []
+        try:
+            # the first round compiles the modules
+            for _ in range(21):
+                module, imported = _fresh_import('_pickled_parking_spots')
+                start = time.perf_counter()
+                pickle.loads(module.parkings)
+                old.append(imported + time.perf_counter() - start)
+                parking_spots._THEATRES.clear()
+                _, imported = _fresh_import('emft.miz._parking_spots')
+                start = time.perf_counter()
+                parking_spots.get_parkings(theatre)
+                new.append((imported, time.perf_counter() - start))
+        finally:
+            sys.path.remove(tmpdir)
+            sys.modules.pop('_pickled_parking_spots', None)
+            sys.modules['emft.miz._parking_spots'] = data_module
+        pickled_size = os.path.getsize(pickled_module)
+    print('pickle literal ({} KiB): {:.2f}ms when importing emft.miz'.format(pickled_size // 1024, min(old[1:]) * 1000))
+    imported, loaded = min(new[1:], key=sum)
+    print('packed ({} KiB): nothing when importing emft.miz; on first use of {}: {:.2f}ms to import the data, '
+          '{:.2f}ms to decode and index it'.format(os.path.getsize(data_module.__file__) // 1024, theatre,
+                                                     imported * 1000, loaded * 1000))
+
+
+def main(names):
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise SystemExit('unknown benchmark: {} (available: {})'.format(name, ', '.join(BENCHMARKS)))
+        print('{}:'.format(name))
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
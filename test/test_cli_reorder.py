@@ -0,0 +1,120 @@
+# coding=utf-8
+
+import json
+import multiprocessing
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from emft import main as main_module
+from emft.cli.reorder import _find_miz_files, reorder
+from emft.core import threadpool
+from emft.core.mirror import mirror_dir
+from emft.core.path import Path
+from emft.miz.reorder_ledger import ReorderLedger
+
+if os.path.exists('./test_files'):
+    BASE_PATH = os.path.abspath('./test_files')
+elif os.path.exists('./test/test_files'):
+    BASE_PATH = os.path.abspath('./test/test_files')
+else:
+    raise RuntimeError('cannot find test files')
+
+TEST_FILE = os.path.join(BASE_PATH, 'TRG_KA50.miz')
+BAD_ZIP_FILE = os.path.join(BASE_PATH, 'bad_zip_file.miz')
+MISSING_FILE = os.path.join(BASE_PATH, 'missing_files.miz')
+
+
+@pytest.fixture()
+def source_dir(tmpdir):
+    source = Path(str(tmpdir)).joinpath('source')
+    source.makedirs()
+    for miz_file in (TEST_FILE, BAD_ZIP_FILE, MISSING_FILE):
+        Path(miz_file).copy2(source)
+    source.joinpath('not_a_miz.txt').write_text('')
+    yield source
+
+
+def test_find_miz_files(source_dir):
+    expected = sorted(str(source_dir.joinpath(x)) for x in ('TRG_KA50.miz', 'bad_zip_file.miz', 'missing_files.miz'))
+    assert _find_miz_files(str(source_dir)) == expected
+    assert _find_miz_files(str(source_dir.joinpath('*.miz'))) == expected
+    assert _find_miz_files(str(source_dir.joinpath('TRG_*'))) == [str(source_dir.joinpath('TRG_KA50.miz'))]
+    assert _find_miz_files(str(source_dir.joinpath('nope'))) == []
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_summary(source_dir, tmpdir, jobs):
+    output_dir = str(tmpdir.join('output'))
+    result = CliRunner().invoke(reorder, [str(source_dir.joinpath('*_file*.miz')), output_dir, '-s', '-j', jobs])
+    assert result.exit_code == 1
+    summary = json.loads(result.output)
+    assert summary['total'] == 2
+    assert summary['failed'] == 2
+    assert summary['success'] == 0
+    assert [x['from'] for x in summary['files']] == [
+        str(source_dir.joinpath('bad_zip_file.miz')), str(source_dir.joinpath('missing_files.miz'))
+    ]
+    assert [x['to'] for x in summary['files']] == [
+        os.path.join(output_dir, 'bad_zip_file'), os.path.join(output_dir, 'missing_files')
+    ]
+    for file_result in summary['files']:
+        assert file_result['duration'] >= 0
+
+
+def test_reorder(source_dir, tmpdir):
+    output_dir = str(tmpdir.join('output'))
+    result = CliRunner().invoke(reorder, [str(source_dir.joinpath('TRG_KA50.miz')), output_dir])
+    assert result.exit_code == 0
+    summary = json.loads(result.output)
+    assert summary['success'] == 1
+    assert summary['files'][0]['files_copied'] > 0
+    assert Path(output_dir).joinpath('TRG_KA50', 'mission').exists()
+
+
+def test_duplicate_names(source_dir, tmpdir):
+    sub_dir = source_dir.joinpath('sub')
+    sub_dir.makedirs()
+    Path(TEST_FILE).copy2(sub_dir)
+    result = CliRunner().invoke(reorder, [str(source_dir.joinpath('**', 'TRG_KA50.miz')), str(tmpdir.join('output'))])
+    assert result.exit_code == 2
+
+
+def test_skip_unchanged(source_dir, tmpdir):
+    output_dir = str(tmpdir.join('output'))
+    miz_file = str(source_dir.joinpath('bad_zip_file.miz'))
+    target_dir = os.path.join(output_dir, 'bad_zip_file')
+    tmpdir.join('mirrored', 'mission').write('mission', ensure=True)
+    mirror_dir(str(tmpdir.join('mirrored')), target_dir)
+    ReorderLedger().record(ReorderLedger.make_entry(miz_file, target_dir, False))
+
+    result = CliRunner().invoke(reorder, [miz_file, output_dir])
+    assert result.exit_code == 0
+    summary = json.loads(result.output)
+    assert summary['skipped'] == 1
+    assert summary['files'][0]['status'] == 'skipped'
+
+    result = CliRunner().invoke(reorder, [miz_file, output_dir, '--force'])
+    assert result.exit_code == 1
+    assert json.loads(result.output)['files'][0]['status'] == 'failed'
+
+    result = CliRunner().invoke(reorder, [miz_file, output_dir, '--skip-options-file'])
+    assert json.loads(result.output)['files'][0]['status'] == 'failed'
+
+
+def test_entry_point_is_headless(monkeypatch, source_dir, tmpdir):
+    calls = []
+    monkeypatch.setattr(multiprocessing, 'freeze_support', lambda: calls.append('freeze_support'))
+    monkeypatch.setattr(threadpool, 'register_sentry', lambda *_, **__: None)
+
+    def _log_file_locked(*_):
+        raise PermissionError()
+
+    monkeypatch.setattr(main_module, '_setup_logger', _log_file_locked)
+    monkeypatch.setattr(main_module, '_another_instance_is_running', lambda: pytest.fail('message box shown'))
+    result = CliRunner().invoke(main_module.main, ['reorder', str(source_dir.joinpath('TRG_KA50.miz')),
+                                                   str(tmpdir.join('output'))])
+    assert result.exit_code == 1
+    assert 'another instance of EMFT is already running' in result.output
+    assert calls == ['freeze_support']
@@ -2,15 +2,28 @@
 """
 Tests for Mission objects
 """
+import copy
+import datetime
+import gc
 import os
+import shutil
+import struct
+import time
+import tracemalloc
+import weakref
+import zlib
+from itertools import chain
 from time import sleep
-from zipfile import BadZipFile
+from zipfile import BadZipFile, ZipFile, sizeFileHeader, structFileHeader
 
 import pytest
 
 from emft.core.constant import ENCODING
 from emft.core.path import Path
-from emft.miz.mission import BaseUnit, Coalition, Country, EPOCH_DELTA, FlyingUnit, Group, Mission
+from emft.core.sltp import SLTP
+from emft.miz import mission as mission_module, mission_time
+from emft.miz.mission import BaseUnit, Coalition, Country, EPOCH_DELTA, FlyingUnit, Group, Helicopter, \
+    Mission, Static
 from emft.miz.miz import Miz as Miz
 
 if os.path.exists('./test_files'):
@@ -173,6 +186,29 @@ class TestMizBasics:
                 t2 = _f.read()
             assert t1 == t2
 
+    def test_lazy_decode(self):
+        with Miz(TEST_FILE) as miz, Miz(TEST_FILE, lazy=True) as lazy_miz:
+            assert not lazy_miz.mission.d.is_loaded('coalition')
+            assert miz.mission.weather == lazy_miz.mission.weather
+            assert not lazy_miz.mission.d.is_loaded('coalition')
+            assert miz.mission.d == lazy_miz.mission.d
+
+    def test_mission_time_is_applied_lazily(self, monkeypatch, tmpdir):
+        opened = []
+
+        class _Miz(Miz):
+            def __enter__(self):
+                opened.append(self)
+                return super().__enter__()
+
+        monkeypatch.setattr(mission_time, 'Miz', _Miz)
+        out_file = str(tmpdir.join('out.miz'))
+        assert mission_time.MissionTime(datetime.datetime(2017, 6, 1, 12, 30)).apply_to_miz(TEST_FILE, out_file)
+        assert not opened[0].mission.d.is_loaded('coalition')
+        with Miz(TEST_FILE, in_memory=True) as source, Miz(out_file, in_memory=True) as output:
+            assert output.mission.mission_start_time_as_date == '01/06/2017 12:30:00'
+            assert output.mission.d['coalition'] == source.mission.d['coalition']
+
     def test_is_unzipped(self):
         mis = Miz(TEST_FILE)
         assert not mis.zip_content
@@ -189,6 +225,115 @@ class TestMizBasics:
         with pytest.raises(BadZipFile):
             mis.unzip()
 
+    def test_in_memory_decode(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            assert miz.tmpdir is None
+            assert miz.mission_file is None
+            with ZipFile(TEST_FILE) as zip_file:
+                mission_text = zip_file.read('mission').decode(ENCODING).replace('\r\n', '\n')
+            assert miz.mission.d == SLTP().decode(mission_text)[0]
+            assert miz.zip_content
+
+    def test_in_memory_zip(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            miz.mission.weather.cloud_density = 4
+            miz.zip(OUT_FILE)
+        with Miz(OUT_FILE, in_memory=True) as miz2:
+            assert miz2.mission.weather.cloud_density == 4
+            assert miz.mission.d == miz2.mission.d
+        with ZipFile(TEST_FILE) as source, ZipFile(OUT_FILE) as output:
+            assert source.namelist() == output.namelist()
+            for name in source.namelist():
+                if name not in ('mission', 'l10n/DEFAULT/dictionary', 'l10n/DEFAULT/mapResource'):
+                    assert source.read(name) == output.read(name)
+
+    def test_in_memory_zip_overwrite_source(self):
+        Path(TEST_FILE).copy2(OUT_FILE)
+        with Miz(OUT_FILE, in_memory=True) as miz:
+            miz.mission.weather.cloud_density = 4
+            miz.zip(OUT_FILE)
+        with Miz(OUT_FILE, in_memory=True) as miz:
+            assert miz.mission.weather.cloud_density == 4
+        assert [x for x in os.listdir(BASE_PATH) if x.endswith('.miz') and x.startswith('EMFT_')] == []
+
+    @pytest.mark.parametrize('in_memory', [True, False])
+    def test_zip_copies_unchanged_members(self, in_memory):
+        with Miz(TEST_FILE, in_memory=in_memory) as miz:
+            miz.mission.weather.cloud_density = 4
+            miz.zip(OUT_FILE)
+        with ZipFile(TEST_FILE) as source, ZipFile(OUT_FILE) as output:
+            assert output.testzip() is None
+            for name in ('warehouses', 'options'):
+                source_info, output_info = source.getinfo(name), output.getinfo(name)
+                assert source_info.CRC == output_info.CRC
+                assert source_info.compress_type == output_info.compress_type
+                assert source_info.date_time == output_info.date_time
+                assert source.read(name) == output.read(name)
+            assert source.getinfo('mission').CRC != output.getinfo('mission').CRC
+        with Miz(OUT_FILE, in_memory=True) as miz:
+            assert miz.mission.weather.cloud_density == 4
+
+    @staticmethod
+    def _raw_data(path, info):
+        with open(path, mode='rb') as stream:
+            stream.seek(info.header_offset)
+            header = struct.unpack(structFileHeader, stream.read(sizeFileHeader))
+            stream.seek(header[-2] + header[-1], os.SEEK_CUR)
+            return stream.read(info.compress_size)
+
+    @pytest.mark.parametrize('in_memory', [True, False])
+    def test_zip_copies_compressed_data(self, in_memory, tmpdir):
+        out_file = str(tmpdir.join('out.miz'))
+        with Miz(LARGE_FILE, in_memory=in_memory) as miz:
+            miz.mission.weather.cloud_density = 4
+            miz.zip(out_file)
+        with ZipFile(LARGE_FILE) as source, ZipFile(out_file) as output:
+            assert output.testzip() is None
+            for source_info in source.infolist():
+                output_info = output.getinfo(source_info.filename)
+                if source_info.filename in ('mission', 'l10n/DEFAULT/dictionary', 'l10n/DEFAULT/mapResource'):
+                    continue
+                assert output_info.compress_size == source_info.compress_size
+                assert output_info.compress_type == source_info.compress_type
+                assert self._raw_data(out_file, output_info) == self._raw_data(LARGE_FILE, source_info)
+
+    def test_member_unchanged_checks_stats_before_crc(self, monkeypatch):
+        crc32 = zlib.crc32
+        crc_calls = []
+        monkeypatch.setattr(zlib, 'crc32', lambda *args: crc_calls.append(args) or crc32(*args))
+        miz = Miz(TEST_FILE)
+        try:
+            with ZipFile(TEST_FILE) as zip_file:
+                miz._extract_files_from_zip(zip_file)
+                options, warehouses = zip_file.getinfo('options'), zip_file.getinfo('warehouses')
+            assert miz._member_unchanged('options', options)
+            assert crc_calls == []
+            os.utime(miz.tmpdir.joinpath('options').abspath())
+            assert miz._member_unchanged('options', options)
+            assert crc_calls
+            with open(miz.tmpdir.joinpath('warehouses').abspath(), mode='r+b') as stream:
+                data = stream.read()
+                stream.seek(0)
+                stream.write(data.replace(b'=', b' ', 1))
+            assert not miz._member_unchanged('warehouses', warehouses)
+        finally:
+            shutil.rmtree(miz.tmpdir.abspath())
+
+    def test_reorder_only_copies_changes(self, tmpdir):
+        target_dir = str(tmpdir.join('reorder'))
+        report = Miz.reorder(TEST_FILE, target_dir, skip_options_file=True)
+        assert 'mission' in report.files_copied
+        assert 'options' not in report.files_copied
+        report = Miz.reorder(TEST_FILE, target_dir, skip_options_file=True)
+        assert report.files_copied == []
+        assert report.bytes_copied == 0
+
+    def test_in_memory_missing_file_in_miz(self):
+        with pytest.raises(FileNotFoundError):
+            Miz(MISSING_FILE, in_memory=True).unzip()
+        with pytest.raises(BadZipFile):
+            Miz(BAD_ZIP_FILE, in_memory=True).unzip()
+
     def test_temp_dir_cleaning(self):
         mis = Miz(TEST_FILE)
         mis.unzip()
@@ -821,6 +966,46 @@ class TestMizValues:
             with Miz(DUPLICATE_GROUP_ID) as miz:
                 _ = miz.mission.next_group_id
 
+    def test_allocate_ids(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            assert miz.mission.allocate_group_id() == 37
+            assert miz.mission.allocate_group_id() == 38
+            assert miz.mission.reserve_group_ids(10) == range(39, 49)
+            assert miz.mission.next_group_id == 49
+            assert miz.mission.allocate_unit_id() == 37
+            assert miz.mission.reserve_unit_ids(3) == range(38, 41)
+            with pytest.raises(ValueError):
+                miz.mission.reserve_unit_ids(0)
+
+    def test_allocated_ids_follow_setters(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            miz.mission.get_group_by_id(1).group_id = 100
+            assert miz.mission.next_group_id == 101
+            miz.mission.get_unit_by_id(1).unit_id = 200
+            assert miz.mission.allocate_unit_id() == 201
+            unit = miz.mission.get_unit_by_id(2)
+            unit.unit_id = 200
+            with pytest.raises(IndexError):
+                _ = miz.mission.next_unit_id
+            unit.unit_id = 2
+            assert miz.mission.next_unit_id == 202
+
+    def test_next_ids_from_any_object(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            mission = miz.mission
+            group = mission.get_group_by_name('etcher')
+            country = group._country
+            for obj in (mission, mission.blue_coa, mission.red_coa, country, group, group.first_unit):
+                assert (obj.next_group_id, obj.next_unit_id) == (37, 37)
+            assert mission.allocate_group_id() == 37
+            assert (mission.red_coa.next_group_id, country.next_unit_id) == (38, 37)
+            group_section = copy.deepcopy(group._section_group)
+            group_section['groupId'] = 500
+            for unit_id, unit_section in enumerate(group_section['units'].values(), 600):
+                unit_section['unitId'] = unit_id
+            country.add_group(group.group_category, group_section)
+            assert (mission.blue_coa.next_group_id, group.next_unit_id) == (501, 600 + len(group_section['units']))
+
     def test_get_group_by_name(self, miz):
         group = miz.mission.get_group_by_name('etcher')
         assert isinstance(group, Group)
@@ -832,3 +1017,253 @@ class TestMizValues:
         assert isinstance(unit, BaseUnit)
         assert unit.unit_id == 1
         assert miz.mission.get_unit_by_name('le_caribou_puissant') is None
+
+
+class TestMissionIndex:
+    @pytest.fixture()
+    def mission(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            yield miz.mission
+
+    def test_same_results_as_linear_scans(self, mission):
+        for group in mission.groups:
+            assert mission.get_group_by_id(group.group_id) is group
+            assert mission.get_group_by_name(group.group_name) is group
+            assert mission.blue_coa.get_group_by_id(group.group_id) is (group if group.coa_color == 'blue' else None)
+        for unit in mission.units:
+            assert mission.get_unit_by_id(unit.unit_id) is unit
+            assert mission.get_unit_by_name(unit.unit_name) is unit
+            assert mission.red_coa.get_unit_by_name(unit.unit_name) is (unit if unit.coa_color == 'red' else None)
+        for category in Mission.valid_group_categories:
+            assert list(mission.get_groups_from_category(category)) == [
+                x for x in mission.groups if x.group_category == category
+            ]
+            assert list(mission.blue_coa.get_units_from_category(category)) == [
+                x for x in mission.blue_coa.units if x.group_category == category
+            ]
+        assert list(mission.get_clients_groups()) == [x for x in mission.groups if x.group_is_client_group]
+
+    def test_rename(self, mission):
+        group = mission.get_group_by_name('etcher')
+        group.group_name = 'etcher_renamed'
+        assert mission.get_group_by_name('etcher') is None
+        assert mission.get_group_by_name('etcher_renamed') is group
+        unit = mission.get_unit_by_name('etcher')
+        unit.unit_name = 'etcher_renamed'
+        assert mission.get_unit_by_name('etcher') is None
+        assert mission.blue_coa.get_unit_by_name('etcher_renamed') is unit
+
+    def test_re_id(self, mission):
+        group = mission.get_group_by_id(1)
+        unit = mission.get_unit_by_id(1)
+        group.group_id, unit.unit_id = 1000, 1000
+        assert mission.get_group_by_id(1) is None
+        assert mission.get_unit_by_id(1) is None
+        assert mission.get_group_by_id(1000) is group
+        assert mission.get_unit_by_id(1000) is unit
+
+    def test_duplicate_names(self, mission):
+        first, second = list(mission.red_coa.groups)[:2]
+        second.group_name = 'duplicate'
+        first.group_name = 'duplicate'
+        assert mission.get_group_by_name('duplicate') is first
+        first.group_name = 'first_renamed'
+        assert mission.get_group_by_name('duplicate') is second
+
+    def test_client_groups_follow_skill(self, mission):
+        clients = list(mission.get_clients_groups())
+        group = clients[0]
+        group.first_unit.skill = 'High'
+        assert group not in list(mission.get_clients_groups())
+        group.first_unit.skill = 'Client'
+        assert list(mission.get_clients_groups()) == clients
+
+    def test_invalidate(self, mission):
+        group = mission.get_group_by_name('etcher')
+        group._section_group['groupId'] = 1000
+        assert mission.get_group_by_id(1000) is None
+        mission.invalidate_index()
+        assert mission.get_group_by_id(1000) is group
+
+    def test_invalidate_is_per_mission(self, mission):
+        other = Mission(mission.d, mission.l10n)
+        group = other.get_group_by_name('etcher')
+        section = group._section_group
+        mission.invalidate_index()
+        assert group._group_section_generation == other._sections_generation
+        other.invalidate_index()
+        assert group._group_section_generation != other._sections_generation
+        assert group._section_group is section
+        assert group._group_section_generation == other._sections_generation
+
+    def test_changes_reach_the_owning_mission(self, mission):
+        etcher = mission.get_group_by_name('etcher')
+        group = Group(mission.d, mission.l10n, etcher.coa_color, etcher.country_index, etcher.group_category,
+                      etcher.group_index)
+        assert group._country._mission is mission
+        group.group_name = 'etcher_renamed'
+        assert mission.get_group_by_name('etcher_renamed').group_id == etcher.group_id
+        assert Coalition(mission.d, mission.l10n, 'red')._mission is mission
+
+        other = Mission(mission.d, mission.l10n)
+        other.get_unit_by_name('etcher').unit_name = 'etcher_unit_renamed'
+        assert mission.get_unit_by_name('etcher_unit_renamed').unit_id == etcher.first_unit.unit_id
+        other.get_unit_by_id(etcher.first_unit.unit_id).unit_id = 1000
+        assert mission.next_unit_id == 1001
+        assert mission.get_unit_by_id(1000).unit_name == 'etcher_unit_renamed'
+
+    def test_add_and_remove_groups_and_units(self, mission):
+        country = mission.get_group_by_name('etcher')._country
+        group_section = copy.deepcopy(mission.get_group_by_name('gal')._section_group)
+        group_section['name'], group_section['groupId'] = 'DictKey_GroupName_new', mission.allocate_group_id()
+        group_section['units'][1]['name'], group_section['units'][1]['unitId'] = 'DictKey_UnitName_new', 1000
+        mission.l10n.update({'DictKey_GroupName_new': 'new_group', 'DictKey_UnitName_new': 'new_unit'})
+        group = country.add_group('helicopter', group_section)
+        assert (group.group_category, group.group_index) == ('helicopter', 4)
+        assert mission.get_group_by_name('new_group') is group
+        assert mission.blue_coa.get_unit_by_id(1000) is group.first_unit
+        assert mission.next_unit_id == 1001
+
+        unit_section = dict(group_section['units'][1], name='DictKey_UnitName_new2', unitId=1001)
+        mission.l10n['DictKey_UnitName_new2'] = 'new_unit_2'
+        unit = group.add_unit(unit_section)
+        assert unit.unit_index == 2
+        assert mission.get_unit_by_name('new_unit_2') is unit
+        group.remove_unit(group.first_unit)
+        assert mission.get_unit_by_id(1000) is None
+        assert mission.get_unit_by_id(1001).unit_index == 1
+
+        country.remove_group(mission.get_group_by_name('gal'))
+        assert mission.get_group_by_name('gal') is None
+        assert mission.get_group_by_name('gilles').group_index == 2
+        assert mission.get_group_by_name('new_group').group_index == 3
+        assert [x.group_name for x in country.groups][:3] == ['etcher', 'gilles', 'new_group']
+        with pytest.raises(ValueError):
+            country.remove_group(mission.red_coa.groups.__next__())
+
+    def test_missions_are_freed(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            mission = Mission(miz.mission.d, miz.l10n)
+        assert mission.blue_coa.get_group_by_name('etcher') is not None
+        ref = weakref.ref(mission)
+        del mission
+        gc.collect()
+        assert ref() is None
+
+
+class TestMissionWrappers:
+    def test_slots(self):
+        with Miz(ALL_OBJECTS, in_memory=True) as miz:
+            for obj in chain(miz.mission.groups, miz.mission.units, miz.mission.blue_coa.statics):
+                assert not hasattr(obj, '__dict__')
+                assert isinstance(obj.country_name, str)
+                assert obj.coa_color in ('blue', 'red')
+            for unit in miz.mission.units:
+                group = miz.mission.get_group_by_id(unit.group_id)
+                assert unit.group_name == group.group_name
+                assert list(unit.units) == list(group.units)
+
+    def test_sections_are_cached_until_invalidated(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            mission = miz.mission
+            unit = mission.get_unit_by_id(1)
+            group_section = unit._section_group
+            assert unit._section_unit is group_section['units'][1]
+            new_section = dict(group_section['units'][1])
+            new_section['unitId'] = 1000
+            group_section['units'][1] = new_section
+            assert unit.unit_id == 1
+            mission.invalidate_index()
+            assert unit.unit_id == 1000
+            assert unit._section_unit is new_section
+            assert mission.get_unit_by_id(1000) is unit
+
+    def test_country_lookups(self):
+        with Miz(ALL_OBJECTS, in_memory=True) as miz:
+            mission = miz.mission
+            group = mission.get_group_by_name('New Helicopter Group')
+            unit = group.first_unit
+            static = next(mission.blue_coa.statics)
+            for obj in (group, unit, static):
+                assert obj.get_country_by_name('USA') is group._country
+                assert obj.get_group_by_name('New Ship Group') is mission.get_group_by_name('New Ship Group')
+                assert obj.get_group_by_id(1) is mission.get_group_by_id(1)
+                assert list(obj.get_units_from_category('plane')) == list(mission.get_units_from_category('plane'))
+                assert list(obj.get_clients_groups()) == list(mission.blue_coa.get_clients_groups())
+            assert static.get_unit_by_name(unit.unit_name) is unit
+            assert group.get_unit_by_id(unit.unit_id) is unit
+
+    def test_standalone_objects(self):
+        with Miz(ALL_OBJECTS, in_memory=True) as miz:
+            mission = miz.mission
+            group = mission.get_group_by_name('New Helicopter Group')
+            unit = group.first_unit
+            args = (mission.d, mission.l10n, group.coa_color, group.country_index)
+            standalone_group = Group(*args, group.group_category, group.group_index)
+            assert standalone_group == group
+            assert standalone_group.group_name == group.group_name
+            standalone_unit = Helicopter(*args, group.group_category, group.group_index, unit.unit_index)
+            assert standalone_unit == unit
+            assert standalone_unit.get_unit_by_name(unit.unit_name) == unit
+            static = next(mission.blue_coa.statics)
+            assert Static(*args, static.static_index).static_name == 'New Static Object'
+
+
+needs_numpy = pytest.mark.skipif(mission_module.numpy is None, reason='numpy is not installed')
+
+
+@needs_numpy
+class TestUnitsPositions:
+    @pytest.fixture()
+    def mission(self):
+        with Miz(TEST_FILE, in_memory=True) as miz:
+            yield miz.mission
+
+    def test_get(self, mission):
+        positions = mission.get_units_positions()
+        units = list(mission.units)
+        assert positions.ids.tolist() == [unit.unit_id for unit in units]
+        assert positions.x.tolist() == [unit.unit_pos_x for unit in units]
+        assert positions.y.tolist() == [unit.unit_pos_y for unit in units]
+        assert positions.heading.tolist() == [unit.heading for unit in units]
+        assert positions.coalition.tolist() == [unit.coa_color for unit in units]
+        assert positions.category.tolist() == [unit.group_category for unit in units]
+
+    def test_set(self, mission):
+        positions = mission.get_units_positions()
+        blue = positions.coalition == 'blue'
+        mission.set_units_positions(positions.ids[blue], positions.x[blue] + 1000, positions.y[blue] - 1000)
+        for unit_id, x, y in zip(positions.ids.tolist(), positions.x.tolist(), positions.y.tolist()):
+            unit = mission.get_unit_by_id(unit_id)
+            if unit.coa_color == 'blue':
+                assert unit.unit_position == (x + 1000, y - 1000)
+            else:
+                assert unit.unit_position == (x, y)
+        mission.set_units_positions(positions.ids, positions.x, positions.y, positions.heading + 0.5)
+        assert mission.get_units_positions().heading.tolist() == (positions.heading + 0.5).tolist()
+
+    def test_round_trip(self, tmpdir):
+        out_file = str(tmpdir.join('out.miz'))
+        with Miz(LARGE_FILE, in_memory=True) as miz:
+            positions = miz.mission.get_units_positions()
+            assert any(heading != int(heading) for heading in positions.heading.tolist())
+            miz.mission.set_units_positions(positions.ids, positions.x + 1, positions.y, positions.heading)
+            moved = miz.mission.get_units_positions()
+            assert moved.x.tolist() == (positions.x + 1).tolist()
+            assert moved.heading.tolist() == positions.heading.tolist()
+            miz.zip(out_file)
+        with Miz(out_file, in_memory=True) as miz:
+            assert miz.mission.get_units_positions().heading.tolist() == positions.heading.tolist()
+
+    def test_set_errors(self, mission):
+        positions = mission.get_units_positions()
+        with pytest.raises(ValueError):
+            mission.set_units_positions(positions.ids, positions.x[1:], positions.y)
+        with pytest.raises(ValueError):
+            mission.set_units_positions(positions.ids[:1], [float('nan')], [0])
+        with pytest.raises(ValueError):
+            mission.set_units_positions([positions.ids[0], 1000], [0, 0], [0, 0])
+        with pytest.raises(ValueError):
+            mission.set_units_positions(positions.ids, positions.x, positions.y,
+                                        [0] * (len(positions.ids) - 1) + [float('inf')])
+        assert mission.get_unit_by_id(int(positions.ids[0])).unit_pos_x == positions.x[0]
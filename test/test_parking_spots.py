@@ -0,0 +1,122 @@
+# coding=utf-8
+
+import math
+import random
+from collections import namedtuple
+
+import pytest
+from click.testing import CliRunner
+
+from emft.miz import parking_spots, parse_parking_spots
+from emft.miz.parking_spots import ParkingSpot, SpotIndex
+
+Farp = namedtuple('Farp', 'static_name static_position')
+
+
+def _brute_force(unit_pos):
+    min_ = parking_spots.MAX_DISTANCE
+    res = None
+    parkings = parking_spots.get_parkings()
+    for airport in parkings:
+        for spot in parkings[airport]:
+            spot_pos = parkings[airport][spot]
+            dist = math.hypot(unit_pos[0] - spot_pos[0], unit_pos[1] - spot_pos[1])
+            if dist < min_:
+                min_ = dist
+                res = ParkingSpot(airport=airport, spot=spot)
+    return res
+
+
+@pytest.fixture(autouse=True)
+def farps():
+    parking_spots.clear_farps()
+    yield
+    parking_spots.clear_farps()
+
+
+def _positions():
+    rand = random.Random(0)
+    for airport in parking_spots.get_parkings().values():
+        for x, y in airport.values():
+            yield x, y
+            yield x + rand.uniform(-60, 60), y + rand.uniform(-60, 60)
+    yield 0, 0
+
+
+def test_same_result_as_brute_force():
+    positions = list(_positions())
+    assert len(positions) > 500
+    expected = [_brute_force(position) for position in positions]
+    assert [parking_spots.unit_pos_to_spot(position) for position in positions] == expected
+    assert parking_spots.units_pos_to_spots(positions) == expected
+    assert parking_spots.unit_pos_to_spot((0, 0)) is None
+
+
+def test_farps():
+    parking_spots.add_farp(Farp('farp_1', (1000, 1000)))
+    parking_spots.add_farp(Farp('farp_2', (2000, 2000)))
+    assert parking_spots.unit_pos_to_spot((1010, 990)) == ParkingSpot('FARP', 'farp_1')
+    parking_spots.add_farp(Farp('farp_1', (5000, 5000)))
+    assert parking_spots.unit_pos_to_spot((1010, 990)) is None
+    assert parking_spots.unit_pos_to_spot((5000, 5000)) == ParkingSpot('FARP', 'farp_1')
+    parking_spots.clear_farps()
+    assert parking_spots.units_pos_to_spots([(5000, 5000), (2000, 2000)]) == [None, None]
+
+
+def test_spot_index_ties_and_cell_borders():
+    index = SpotIndex(cell_size=10)
+    index.add('a', 1, (9.9, 0))
+    index.add('b', 1, (10.1, 0))
+    assert index.nearest((10, 0), max_distance=10) == ParkingSpot('a', 1)
+    assert index.nearest((-9, 0), max_distance=25) == ParkingSpot('a', 1)
+    assert index.nearest((30, 0), max_distance=10) is None
+    index.remove('a', 1, (9.9, 0))
+    assert index.nearest((10, 0), max_distance=10) == ParkingSpot('b', 1)
+
+
+def test_theatres():
+    assert parking_spots.DEFAULT_THEATRE in parking_spots.theatres()
+    with pytest.raises(ValueError):
+        parking_spots.get_parkings('Nowhere')
+
+
+def test_lazy_parkings_alias():
+    from emft.miz import parkings
+    assert parkings is parking_spots.parkings
+    assert dict(parkings) == parking_spots.get_parkings(parking_spots.DEFAULT_THEATRE)
+    assert 'FARP' in parkings and len(parkings) > 1
+    parking_spots.add_farp(Farp('farp_1', (1000, 1000)))
+    assert parkings['FARP'] == {'farp_1': (1000, 1000)}
+    with pytest.raises(TypeError):
+        parkings['FARP'] = {}
+    with pytest.raises(TypeError):
+        del parkings['FARP']
+    with pytest.raises(TypeError):
+        parkings['FARP']['farp_2'] = (2000, 2000)
+    assert parking_spots.unit_pos_to_spot((2000, 2000)) is None
+
+
+def test_encode_decode():
+    parkings = {'Kobuleti': {1: (-317948.3125, 636639.625), 65535: (0.5, -1)}, 'Empty': {}}
+    encoded = parking_spots.encode_theatre(parkings)
+    assert all(isinstance(x, str) for x in encoded[1:])
+    assert parking_spots.decode_theatre(encoded) == parkings
+
+
+def test_generate(tmpdir, monkeypatch):
+    output = str(tmpdir.join('_parking_spots.py'))
+    caucasus = {'Kobuleti': {1: (-317948.3125, 636639.625)}}
+    nevada = {'Nellis': {1: (-399428.59375, -17983.59375)}, 'Creech': {2: (-359925.5, -75233.125)}}
+    monkeypatch.setattr(parse_parking_spots, 'read_miz', lambda path: {
+        'caucasus.miz': ('Caucasus', caucasus),
+        'nellis.miz': ('Nevada', {'Nellis': nevada['Nellis']}),
+        'creech.miz': ('Nevada', {'Creech': nevada['Creech']}),
+    }[path])
+    for miz_file in ('caucasus.miz', 'nellis.miz', 'creech.miz'):
+        tmpdir.join(miz_file).write('')
+    with tmpdir.as_cwd():
+        result = CliRunner().invoke(parse_parking_spots.main, ['caucasus.miz', 'nellis.miz', '-o', output])
+        assert result.exit_code == 0, result.output
+        result = CliRunner().invoke(parse_parking_spots.main, ['creech.miz', '-o', output])
+        assert result.exit_code == 0, result.output
+    assert parse_parking_spots.read_module(output) == {'Caucasus': caucasus, 'Nevada': {'Creech': nevada['Creech']}}
@@ -0,0 +1,90 @@
+# coding=utf-8
+
+import os
+
+import pytest
+
+from emft.core.mirror import mirror_dir
+from emft.core.path import Path
+from emft.miz.reorder_ledger import ReorderLedger
+
+if os.path.exists('./test_files'):
+    BASE_PATH = os.path.abspath('./test_files')
+elif os.path.exists('./test/test_files'):
+    BASE_PATH = os.path.abspath('./test/test_files')
+else:
+    raise RuntimeError('cannot find test files')
+
+TEST_FILE = os.path.join(BASE_PATH, 'TRG_KA50.miz')
+
+
+def test_entry():
+    entry = ReorderLedger.make_entry(TEST_FILE, './output', True)
+    assert entry['source'] == str(Path(TEST_FILE).abspath())
+    assert entry['size'] == Path(TEST_FILE).getsize()
+    assert entry['crc32'] == Path(TEST_FILE).crc32()
+    assert entry['output_folder'] == str(Path('./output').abspath())
+    assert entry['skip_options_file'] is True
+    assert 'emft_version' in entry
+
+
+def _mirror(source, output):
+    os.makedirs(source, exist_ok=True)
+    with open(os.path.join(source, 'mission'), mode='w') as stream:
+        stream.write('mission')
+    mirror_dir(source, output)
+
+
+def test_up_to_date(tmpdir):
+    miz_file = Path(TEST_FILE).copy2(str(tmpdir))
+    output = Path(str(tmpdir)).joinpath('output')
+    ledger = ReorderLedger()
+    entry = ReorderLedger.make_entry(miz_file, output, False)
+    assert not ledger.is_up_to_date(entry)
+    ledger.record(entry)
+    # output folder does not exist
+    assert not ledger.is_up_to_date(entry)
+    _mirror(str(tmpdir.join('source')), output)
+    ledger.record(entry)
+    assert ledger.is_up_to_date(entry)
+    assert ReorderLedger().is_up_to_date(entry)
+    assert not ledger.is_up_to_date(ReorderLedger.make_entry(miz_file, output, True))
+    with open(miz_file, mode='ab') as stream:
+        stream.write(b'\0')
+    assert not ledger.is_up_to_date(ReorderLedger.make_entry(miz_file, output, False))
+    ledger.forget(entry)
+    assert not ReorderLedger().is_up_to_date(entry)
+
+
+@pytest.mark.parametrize('change', ['edit', 'remove', 'other_mirror'])
+def test_changed_output(tmpdir, change):
+    output = str(tmpdir.join('output'))
+    _mirror(str(tmpdir.join('source')), output)
+    ledger = ReorderLedger()
+    entry = ReorderLedger.make_entry(TEST_FILE, output, False)
+    ledger.record(entry)
+    assert ledger.is_up_to_date(entry)
+    mission = os.path.join(output, 'mission')
+    if change == 'edit':
+        with open(mission, mode='w') as stream:
+            stream.write('edited')
+    elif change == 'remove':
+        os.remove(mission)
+    else:
+        with open(str(tmpdir.join('source', 'mission')), mode='w') as stream:
+            stream.write('another mission')
+        mirror_dir(str(tmpdir.join('source')), output)
+    assert not ledger.is_up_to_date(entry)
+
+
+def test_corrupt_ledger(tmpdir):
+    path = str(tmpdir.join('ledger'))
+    with open(path, mode='w') as stream:
+        stream.write('{')
+    ledger = ReorderLedger(path)
+    output = str(tmpdir.join('output'))
+    _mirror(str(tmpdir.join('source')), output)
+    entry = ReorderLedger.make_entry(TEST_FILE, output, False)
+    assert not ledger.is_up_to_date(entry)
+    ledger.record(entry)
+    assert ReorderLedger(path).is_up_to_date(entry)
@@ -1,11 +1,20 @@
 # coding=utf-8
 
+import glob
+import io
 import os
+import pickle
+import time
+import zipfile
 
 import datadiff
+import mpmath
 import pytest
+from natsort import natsorted
 
-from emft.core.sltp import SLTP, SLTPParsingError
+from emft.core import sltp as sltp_module
+from emft.core.sltp import DecimalLiteral, DecodeCache, ENGINES, ENGINE_LEGACY, ENGINE_LUPA, ENGINE_SCANNER, LazyTable, \
+    NUMBERS_DECIMAL, NUMBERS_MPMATH, SLTP, SLTPParsingError, sorted_keys
 
 if os.path.exists('./test_files'):
     BASE_PATH = os.path.abspath('./test_files/sltp')
@@ -18,6 +27,10 @@ TEST_FILES_DIR = os.path.join(BASE_PATH, 'pass')
 TEST_FILES_DIR_FAIL = os.path.join(BASE_PATH, 'fail')
 TEST_FILES_DIR_DIFF = os.path.join(BASE_PATH, 'diff')
 TEST_FILES_DIR_LONG = os.path.join(BASE_PATH, 'long')
+TEST_MIZ_FILES = [
+    x for x in glob.glob(os.path.join(os.path.dirname(BASE_PATH), '*.miz'))
+    if 'bad_zip_file' not in x
+]
 
 ENCODING = 'iso8859_15'
 
@@ -45,8 +58,8 @@ def _assert_different(input_, output):
         pytest.fail('resulting dicts should be different')
 
 
-def _do_test(test_file, compare_func):
-    parser = SLTP()
+def _do_test(test_file, compare_func, engine=ENGINE_SCANNER):
+    parser = SLTP(engine)
     with open(test_file, encoding=ENCODING) as f:
         data = f.read()
     decoded_data, qualifier = parser.decode(data)
@@ -60,27 +73,433 @@ def _do_test(test_file, compare_func):
     compare_func(input_, output)
 
 
+@pytest.mark.parametrize('engine', ENGINES)
 @pytest.mark.parametrize('test_file', os.listdir(TEST_FILES_DIR))
-def test_encode_decode_files(test_file):
+def test_encode_decode_files(test_file, engine):
     test_file = os.path.join(TEST_FILES_DIR, test_file)
-    _do_test(test_file, _assert_same)
+    _do_test(test_file, _assert_same, engine)
 
 
 @pytest.mark.long
+@pytest.mark.parametrize('engine', ENGINES)
 @pytest.mark.parametrize('test_file', os.listdir(TEST_FILES_DIR_LONG))
-def test_encode_decode_files_long(test_file):
+def test_encode_decode_files_long(test_file, engine):
     test_file = os.path.join(TEST_FILES_DIR_LONG, test_file)
-    _do_test(test_file, _assert_same)
+    _do_test(test_file, _assert_same, engine)
 
 
+@pytest.mark.parametrize('engine', ENGINES)
 @pytest.mark.parametrize('test_file', os.listdir(TEST_FILES_DIR_FAIL))
-def test_encode_decode_files_fail(test_file):
+def test_encode_decode_files_fail(test_file, engine):
     test_file = os.path.join(TEST_FILES_DIR_FAIL, test_file)
     with pytest.raises(SLTPParsingError):
-        _do_test(test_file, _assert_same)
+        _do_test(test_file, _assert_same, engine)
 
 
+@pytest.mark.parametrize('engine', ENGINES)
 @pytest.mark.parametrize('test_file', os.listdir(TEST_FILES_DIR_DIFF))
-def test_encode_decode_files_diff(test_file):
+def test_encode_decode_files_diff(test_file, engine):
     test_file = os.path.join(TEST_FILES_DIR_DIFF, test_file)
-    _do_test(test_file, _assert_different)
+    _do_test(test_file, _assert_different, engine)
+
+
+@pytest.mark.parametrize(
+    'test_file',
+    [os.path.join(TEST_FILES_DIR, x) for x in os.listdir(TEST_FILES_DIR)] +
+    [os.path.join(TEST_FILES_DIR_DIFF, x) for x in os.listdir(TEST_FILES_DIR_DIFF)]
+)
+def test_engines_agree(test_file):
+    with open(test_file, encoding=ENCODING) as f:
+        data = f.read()
+    assert SLTP(ENGINE_LEGACY).decode(data) == SLTP(ENGINE_SCANNER).decode(data)
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    [
+        ('mission = \n{\n}', {}),
+        ('mission = \n{\n    [1] = 1,\n    [2] = -2.5,\n    [3] = 0x1F,\n}', {1: 1, 2: -2.5, 3: 31}),
+        ('mission = \n{\n    ["a"] = true,\n    ["b"] = False,\n    ["c"] = nil,\n}', {'a': True, 'b': False, 'c': None}),
+        ('mission = \n{\n    ["a"] = "quote \\" -- not a comment",\n} -- end of mission', {'a': 'quote " -- not a comment'}),
+        ('mission = \n{\n    ["a"] = "multi\\\nline",\n}', {'a': 'multi\\\nline'}),
+        ('mission = \n{\n    ["a"] = \'single\',\n    ["b"] = { "x", "y" },\n}', {'a': 'single', 'b': ['x', 'y']}),
+    ]
+)
+def test_scanner_values(text, expected):
+    result, qualifier = SLTP(ENGINE_SCANNER).decode(text)
+    assert qualifier == 'mission = '
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        'mission = \n{\n    ["a"] = 1.,\n}',
+        'mission = \n{\n    ["a"] = 1e5,\n}',
+        'mission = \n{\n    ["a"] = -,\n}',
+        'mission = \n{\n    ["a"] = "unterminated,\n}',
+        'mission = \n{\n    ["a"] = 1,\n',
+        'mission = \n{\n    ["a"] = ?,\n}',
+    ]
+)
+def test_scanner_errors(text):
+    with pytest.raises(SLTPParsingError):
+        SLTP(ENGINE_SCANNER).decode(text)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        SLTP('some_engine')
+
+
+LAZY_MISSION = '''mission =
+{
+    ["date"] =
+    {
+        ["Day"] = 1,
+        ["Year"] = 2011,
+    }, -- end of ["date"]
+    ["sortie"] = "DictKey_sortie_4",
+    ["weather"] =
+    {
+        ["qnh"] = 760,
+        ["name"] = "Winter, clean sky",
+    }, -- end of ["weather"]
+} -- end of mission
+'''
+
+
+def test_lazy_decode():
+    decoded, qualifier = SLTP().decode(LAZY_MISSION, lazy=True)
+    assert isinstance(decoded, LazyTable)
+    assert list(decoded.keys()) == ['date', 'sortie', 'weather']
+    assert not any(decoded.is_loaded(key) for key in decoded)
+    assert decoded['weather']['qnh'] == 760
+    assert decoded.is_loaded('weather')
+    assert not decoded.is_loaded('date')
+    assert decoded == SLTP().decode(LAZY_MISSION)[0]
+    assert decoded.is_loaded('date')
+
+
+def test_lazy_encode_untouched_entries():
+    decoded, qualifier = SLTP().decode(LAZY_MISSION, lazy=True)
+    assert decoded.raw_entry('sortie') == '    ["sortie"] = "DictKey_sortie_4"'
+    decoded['weather']['qnh'] = 750
+    expected, _ = SLTP().decode(LAZY_MISSION)
+    expected['weather']['qnh'] = 750
+    assert decoded.raw_entry('weather') is None
+    assert not decoded.is_loaded('date')
+    assert SLTP().encode(decoded, qualifier) == SLTP().encode(expected, qualifier)
+    assert not decoded.is_loaded('date')
+
+
+def test_lazy_decode_fallback():
+    text = LAZY_MISSION.replace('    ["sortie"] = "DictKey_sortie_4",', '    ["sortie"] = "DictKey_sortie_4" ["oops"]')
+    decoded, _ = SLTP().decode(text, lazy=True)
+    assert isinstance(decoded, LazyTable)
+    assert decoded['sortie'] == SLTP().decode(text)[0]['sortie']
+    assert decoded == SLTP().decode(text)[0]
+
+
+@pytest.mark.long
+@pytest.mark.parametrize('test_file', os.listdir(TEST_FILES_DIR_LONG))
+def test_lazy_encode_decode_files_long(test_file):
+    with open(os.path.join(TEST_FILES_DIR_LONG, test_file), encoding=ENCODING) as f:
+        data = f.read()
+    decoded, qualifier = SLTP().decode(data, lazy=True)
+    assert SLTP().encode(decoded, qualifier) == data
+    assert decoded == SLTP().decode(data)[0]
+
+
+@pytest.mark.parametrize(
+    'keys',
+    [
+        [],
+        [3, 1, 2, 10, 20],
+        [-1, 3, 0, 10],
+        ['b', 'a', 'a10', 'a2', 'A1', 'x_1_y', 'x_10_y', 'x_9_y', '', '10', '9'],
+        ['unit é', 'unit e', 'unit 2', 'unit ²'],
+        [1, 'a', 2.5, True],
+    ]
+)
+def test_sorted_keys(keys):
+    assert sorted_keys(keys) == natsorted(keys)
+    assert sorted_keys(keys, as_str=True) == natsorted(keys, key=str)
+
+
+def _read_miz_members(miz_file):
+    with zipfile.ZipFile(miz_file) as zip_file:
+        for member in ('mission', 'l10n/DEFAULT/dictionary', 'l10n/DEFAULT/mapResource'):
+            if member in zip_file.namelist():
+                yield member, zip_file.read(member).decode(ENCODING).replace('\r\n', '\n')
+
+
+@pytest.mark.parametrize('miz_file', TEST_MIZ_FILES, ids=os.path.basename)
+def test_sorted_keys_same_output_as_natsort(miz_file, monkeypatch):
+    for member, data in _read_miz_members(miz_file):
+        decoded, qualifier = SLTP().decode(data)
+        encoded = SLTP().encode(decoded, qualifier)
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                sltp_module, 'sorted_keys',
+                lambda keys, as_str=False: natsorted(keys, key=str) if as_str else natsorted(keys)
+            )
+            reference, _ = SLTP().decode(data)
+            assert SLTP().encode(reference, qualifier) == encoded, member
+        assert list(reference) == list(decoded)
+
+
+@pytest.mark.parametrize('literal', ['0.1', '1.50', '-2.5', '1e+05', '-0.0', '42.000000000000000001', '1234.56789012345678'])
+def test_decimal_literal(literal):
+    number = DecimalLiteral(literal)
+    assert isinstance(number, float)
+    assert number == float(literal)
+    assert str(number) == number.literal == literal
+    assert '{}'.format(number) == literal
+    assert pickle.loads(pickle.dumps(number)).literal == literal
+    assert type(number + 1) is float
+
+
+def test_numbers():
+    text = 'mission = \n{\n    [1] = 1.50,\n    [2] = 0.1,\n    [3] = 2,\n} -- end of mission\n'
+    decoded, qualifier = SLTP().decode(text)
+    assert [type(x) for x in decoded.values()] == [DecimalLiteral, DecimalLiteral, int]
+    assert SLTP().encode(decoded, qualifier) == text
+    decoded, qualifier = SLTP(numbers=NUMBERS_MPMATH).decode(text)
+    assert [type(x) for x in decoded.values()] == [mpmath.mpf, mpmath.mpf, int]
+    assert decoded == {1: 1.5, 2: 0.1, 3: 2}
+    with pytest.raises(ValueError):
+        SLTP(numbers='some_numbers')
+
+
+@pytest.mark.parametrize('miz_file', TEST_MIZ_FILES, ids=os.path.basename)
+def test_numbers_same_output_as_mpmath(miz_file):
+    for member, data in _read_miz_members(miz_file):
+        decoded, qualifier = SLTP(numbers=NUMBERS_DECIMAL).decode(data)
+        reference, _ = SLTP(numbers=NUMBERS_MPMATH).decode(data)
+        assert decoded == reference, member
+        assert SLTP().encode(decoded, qualifier) == SLTP().encode(reference, qualifier), member
+
+
+@pytest.mark.parametrize('miz_file', TEST_MIZ_FILES, ids=os.path.basename)
+def test_encode_to_stream(miz_file, tmpdir):
+    for member, data in _read_miz_members(miz_file):
+        decoded, qualifier = SLTP().decode(data)
+        stream = io.StringIO()
+        SLTP().encode_to_stream(decoded, qualifier, stream)
+        assert stream.getvalue() == SLTP().encode(decoded, qualifier)
+        out_file = str(tmpdir.join('out'))
+        with open(out_file, mode='w', encoding=ENCODING) as f:
+            SLTP().encode_to_stream(decoded, qualifier, f)
+        with open(out_file, encoding=ENCODING) as f:
+            assert f.read() == stream.getvalue()
+
+
+def test_encode_to_stream_lazy():
+    decoded, qualifier = SLTP().decode(LAZY_MISSION, lazy=True)
+    stream = io.StringIO()
+    SLTP().encode_to_stream(decoded, qualifier, stream)
+    assert stream.getvalue() == LAZY_MISSION
+    assert not any(decoded.is_loaded(key) for key in decoded)
+
+
+@pytest.mark.parametrize(
+    'array, inline',
+    [
+        ([], True),
+        ([1, 2, 3], True),
+        ([1.5, DecimalLiteral('0.10'), mpmath.mpf('2.5'), True], True),
+        (['short', 'strings'], True),
+        (['a much longer string'], False),
+        ([[1, 2]], False),
+        ([{'x': 1}], False),
+        ([None], False),
+    ]
+)
+def test_inline_array(array, inline):
+    assert sltp_module._is_inline_array(array) is inline
+    assert sltp_module._is_inline_array(tuple(array)) is inline
+
+
+def test_encode_inline_arrays():
+    points = [1, DecimalLiteral('2.50'), -3]
+    table = {'points': points, 'nested': [points, [4, 5]], 'strings': ['a', 'a much longer string']}
+    encoded = SLTP().encode(table, 'mission = ')
+    assert encoded == """mission = 
+{
+    ["nested"] =
+    {
+        {1,2.50,-3,},
+        {4,5,},
+    },
+    ["points"] ={1,2.50,-3,},
+    ["strings"] =
+    {
+        "a",
+        "a much longer string",
+    },
+} -- end of mission
+"""  # noqa: W291
+    assert SLTP().decode(encoded)[0] == table
+
+
+@pytest.mark.parametrize('depth', [1, 2, 5])
+def test_encode_nested_numeric_arrays(depth):
+    array = [[x, x + 0.5, -x] for x in range(50)]
+    for _ in range(depth - 1):
+        array = [array, [1, 2]]
+    table = {'array': array}
+    decoded, _ = SLTP().decode(SLTP().encode(table, 'mission = '))
+    assert decoded == table
+
+
+ALL_SLTP_FILES = [
+    os.path.join(BASE_PATH, folder, file)
+    for folder in sorted(os.listdir(BASE_PATH))
+    for file in sorted(os.listdir(os.path.join(BASE_PATH, folder)))
+]
+needs_lupa = pytest.mark.skipif(ENGINE_LUPA not in ENGINES, reason='lupa is not installed')
+
+
+def _decode_or_error(engine, data):
+    try:
+        return SLTP(engine).decode(data)
+    except SLTPParsingError as exc:
+        return type(exc)
+
+
+@needs_lupa
+@pytest.mark.parametrize('test_file', ALL_SLTP_FILES, ids=lambda x: os.path.relpath(x, BASE_PATH))
+def test_lupa_conformance(test_file):
+    with open(test_file, encoding=ENCODING) as f:
+        data = f.read()
+    decoded = _decode_or_error(ENGINE_LUPA, data)
+    reference = _decode_or_error(ENGINE_SCANNER, data)
+    assert decoded == reference
+    if isinstance(decoded, tuple):
+        assert list(decoded[0]) == list(reference[0])
+        assert SLTP().encode(*decoded) == SLTP().encode(*reference)
+
+
+def test_default_engine():
+    assert SLTP().engine == (ENGINE_LUPA if ENGINE_LUPA in ENGINES else ENGINE_SCANNER)
+
+
+@needs_lupa
+@pytest.mark.parametrize(
+    'text, supported',
+    [
+        ('mission = \n{\n    ["a"] = "x -- \\"y\\"\\\nz\\\\",\n    [1] = {\n    }, -- end of [1]\n}', True),
+        ('mission = \n{\n    ["a"] = true,\n    ["b"] = false,\n    ["c"] = -150000.0,\n}', True),
+        ('mission = \n{\n    ["a"] = -9223372036854775807,\n    [9223372036854775807] = 1,\n}', True),
+        ('mission = \n{\n    ["a"] = nil,\n}', False),
+        ('mission = \n{\n    ["a"] = False,\n}', False),
+        ('mission = \n{\n    ["a"] = e,\n}', False),
+        ('mission = \n{\n    ["a"] = { "x", "y" },\n}', False),
+        ('mission = \n{\n    [1.5] = 1,\n}', False),
+        ('mission = \n{\n    ["a"] = \'x\',\n}', False),
+        ('mission = \n{\n    ["a"] = [[x]],\n}', False),
+        ('mission = \n{\n    ["a"] = "tab\\t",\n}', False),
+        ('mission = \n{\n    ["a"] = 1,\n} {}', False),
+        ('mission = \n{\n    ["a"] = 1.50,\n}', False),
+        ('mission = \n{\n    ["a"] = 007,\n}', False),
+        ('mission = \n{\n    ["a"] = 1e5,\n}', False),
+        ('mission = \n{\n    ["a"] = -1.5e+05,\n}', False),
+        ('mission = \n{\n    ["a"] = 9223372036854775808,\n}', False),
+        ('mission = \n{\n    ["a"] = -9223372036854775808,\n}', False),
+        ('mission = \n{\n    [18446744073709551616] = 1,\n}', False),
+    ]
+)
+def test_lupa_fallback(text, supported):
+    qualifier_end = sltp_module.RE_QUALIFIER.match(text).end()
+    assert (sltp_module._decode_with_lupa(SLTP(), text, qualifier_end) is not None) is supported
+    assert _decode_or_error(ENGINE_LUPA, text) == _decode_or_error(ENGINE_SCANNER, text)
+
+
+def test_decode_cache(tmpdir):
+    cache = DecodeCache(str(tmpdir))
+    decoded, qualifier = SLTP(cache=cache).decode(LAZY_MISSION)
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'evictions': 0, 'entries': 1, 'size': cache.stats()['size']}
+    cached, cached_qualifier = SLTP(cache=cache).decode(LAZY_MISSION)
+    assert (cached, cached_qualifier) == (decoded, qualifier)
+    assert cached is not decoded
+    assert (cache.hits, cache.misses) == (1, 1)
+    cached['date']['Day'] = 2
+    assert SLTP(cache=cache).decode(LAZY_MISSION)[0]['date']['Day'] == 1
+    SLTP(cache=cache).decode(LAZY_MISSION.replace('760', '750'))
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.stats()['entries'] == 2
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+
+
+def test_decode_cache_numbers(tmpdir):
+    cache = DecodeCache(str(tmpdir))
+    text = 'mission = \n{\n    [1] = 1.5,\n}'
+    assert isinstance(SLTP(cache=cache).decode(text)[0][1], DecimalLiteral)
+    assert isinstance(SLTP(cache=cache, numbers=NUMBERS_MPMATH).decode(text)[0][1], mpmath.mpf)
+    assert cache.misses == 2
+
+
+def test_decode_cache_lazy_and_errors(tmpdir):
+    cache = DecodeCache(str(tmpdir))
+    assert isinstance(SLTP(cache=cache).decode(LAZY_MISSION, lazy=True)[0], LazyTable)
+    with pytest.raises(SLTPParsingError):
+        SLTP(cache=cache).decode('mission = \n{\n    ["a"] = ?,\n}')
+    assert cache.stats()['entries'] == 0
+
+
+def test_decode_cache_eviction(tmpdir):
+    cache = DecodeCache(str(tmpdir))
+    texts = [LAZY_MISSION.replace('760', str(700 + x)) for x in range(5)]
+    for age, text in enumerate(reversed(texts)):
+        SLTP(cache=cache).decode(text)
+        entry_path = cache._entry_path(text, NUMBERS_DECIMAL)
+        os.utime(entry_path, (time.time() - 100 - age, time.time() - 100 - age))
+    entry_size = cache.stats()['size'] // 5
+    cache.max_size = entry_size * 3
+    # texts[0] is the oldest entry, using it makes texts[1] the least recently used one
+    SLTP(cache=cache).decode(texts[0])
+    SLTP(cache=cache).decode(LAZY_MISSION)
+    assert cache.evictions == 3
+    assert cache.stats()['entries'] == 3
+    hits = cache.hits
+    SLTP(cache=cache).decode(texts[0])
+    SLTP(cache=cache).decode(texts[4])
+    assert cache.hits == hits + 2
+    SLTP(cache=cache).decode(texts[1])
+    assert cache.hits == hits + 2
+
+
+def test_decode_cache_corrupt_entry(tmpdir):
+    cache = DecodeCache(str(tmpdir))
+    SLTP(cache=cache).decode(LAZY_MISSION)
+    for entry in tmpdir.listdir():
+        entry.write_binary(b'garbage')
+    assert SLTP(cache=cache).decode(LAZY_MISSION) == SLTP().decode(LAZY_MISSION)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_decode_cache_entries_removed_by_another_process(tmpdir, monkeypatch):
+    cache = DecodeCache(str(tmpdir))
+    SLTP(cache=cache).decode(LAZY_MISSION)
+    scandir = os.scandir
+
+    def _scandir_then_remove(path):
+        entries = list(scandir(path))
+        for entry in entries:
+            os.remove(entry.path)
+        return iter(entries)
+
+    monkeypatch.setattr(os, 'scandir', _scandir_then_remove)
+    assert cache.stats()['entries'] == 0
+    SLTP(cache=cache).decode(LAZY_MISSION.replace('760', '761'))
+    assert cache.evictions == 0
+
+
+def test_decode_cache_module_wide(tmpdir, monkeypatch):
+    cache = DecodeCache(str(tmpdir))
+    monkeypatch.setattr(sltp_module, 'DECODE_CACHE', cache)
+    SLTP().decode(LAZY_MISSION)
+    SLTP().decode(LAZY_MISSION)
+    assert (cache.hits, cache.misses) == (1, 1)
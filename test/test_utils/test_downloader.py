@@ -1,4 +1,8 @@
 # coding=utf-8
+import hashlib
+import os
+import tracemalloc
+
 import pytest
 
 from emft.core.downloader import Downloader, get_hash
@@ -53,3 +57,74 @@ def test_wrong_url(tmpdir):
     dest = create_temp_file(create_in_dir=str(tmpdir))
     success = Downloader(NOPE, dest, hexdigest='wrong_digest').download()
     assert not success
+
+
+class FakeResponse:
+    """Serves size bytes of generated data, without holding them in memory"""
+
+    def __init__(self, size):
+        self.size = size
+        self.position = 0
+        self.headers = {'Content-Length': str(size)}
+
+    def read(self, amount):
+        amount = min(amount, self.size - self.position)
+        self.position += amount
+        return b'x' * amount
+
+
+@pytest.fixture()
+def fake_response(monkeypatch):
+    def _fake_response(size):
+        monkeypatch.setattr(Downloader, '_create_response', lambda self: FakeResponse(size))
+
+    yield _fake_response
+
+
+def _md5(size):
+    return hashlib.md5(b'x' * size).hexdigest()
+
+
+def test_download_to_memory(tmpdir, fake_response):
+    fake_response(100000)
+    dest = create_temp_file(create_in_dir=str(tmpdir))
+    downloader = Downloader('url', dest, hexdigest=_md5(100000), block_size=1000)
+    assert downloader.download(in_memory=True) is True
+    assert isinstance(downloader.file_binary_data, bytearray)
+    assert downloader.file_binary_data == b'x' * 100000
+    assert get_hash(downloader.file_binary_data) == _md5(100000)
+    assert dest.bytes() == b'x' * 100000
+
+
+@pytest.mark.parametrize('hexdigest', [None, _md5(100000)])
+def test_download_to_file(tmpdir, fake_response, hexdigest):
+    fake_response(100000)
+    progress = []
+    dest = create_temp_file(create_in_dir=str(tmpdir))
+    assert Downloader('url', dest, hexdigest=hexdigest, progress_hooks=[progress.append]).download() is True
+    assert dest.bytes() == b'x' * 100000
+    assert progress[-1]['status'] == 'finished'
+    assert progress[-1]['downloaded'] == 100000
+    assert os.listdir(str(tmpdir)) == [os.path.basename(dest)]
+
+
+def test_download_to_file_wrong_hash(tmpdir, fake_response):
+    fake_response(1000)
+    dest = create_temp_file(create_in_dir=str(tmpdir))
+    assert Downloader('url', dest, hexdigest='wrong_digest').download() is False
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_download_to_file_bounded_memory(tmpdir, fake_response):
+    size = 64 * 1024 * 1024
+    fake_response(size)
+    dest = create_temp_file(create_in_dir=str(tmpdir))
+    tracemalloc.start()
+    try:
+        assert Downloader('url', dest).download() is True
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert os.path.getsize(dest) == size
+    # blocks grow up to 4 MB
+    assert peak < size / 4
@@ -0,0 +1,121 @@
+# coding=utf-8
+
+import os
+
+import pytest
+
+from emft.core import constant, mirror
+from emft.core.mirror import Manifest, manifest_path, mirror_dir
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, mode='w') as stream:
+        stream.write(content)
+
+
+def _read(path):
+    with open(path) as stream:
+        return stream.read()
+
+
+@pytest.fixture()
+def src():
+    _write('./src/mission', 'mission')
+    _write('./src/options', 'options')
+    _write('./src/l10n/DEFAULT/dictionary', 'dictionary')
+    yield os.path.abspath('./src')
+
+
+def test_first_mirror(src):
+    report = mirror_dir(src, './dst')
+    assert sorted(report.files_copied) == ['l10n/DEFAULT/dictionary', 'mission', 'options']
+    assert report.bytes_copied == len('mission') + len('options') + len('dictionary')
+    assert _read('./dst/l10n/DEFAULT/dictionary') == 'dictionary'
+    assert manifest_path('./dst').exists()
+    assert os.path.dirname(manifest_path('./dst')) == os.path.abspath(constant.PATH_MIRROR_MANIFESTS_DIR)
+    assert manifest_path('./dst') != manifest_path('./src')
+    assert sorted(os.listdir('.')) == sorted(['dst', 'src', constant.PATH_MIRROR_MANIFESTS_DIR])
+
+
+@pytest.fixture()
+def hashed(monkeypatch):
+    hashed_files = []
+    original_hash_file = mirror.hash_file
+
+    def _hash_file(path):
+        hashed_files.append(os.path.abspath(path))
+        return original_hash_file(path)
+
+    monkeypatch.setattr(mirror, 'hash_file', _hash_file)
+    yield hashed_files
+
+
+def test_unchanged_files_are_not_copied_nor_read(src, hashed):
+    mirror_dir(src, './dst')
+    _write('./src/mission', 'changed mission')
+    del hashed[:]
+    report = mirror_dir(src, './dst')
+    assert report.files_copied == ['mission']
+    assert report.files_unchanged == 2
+    assert report.bytes_copied == len('changed mission')
+    assert hashed == [os.path.join(src, 'mission')]
+    assert _read('./dst/mission') == 'changed mission'
+
+
+def test_touched_source_is_hashed_again(src, hashed):
+    mirror_dir(src, './dst')
+    stat = os.stat('./src/options')
+    _write('./src/options', 'OPTIONS')
+    os.utime('./src/options', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    del hashed[:]
+    report = mirror_dir(src, './dst')
+    assert report.files_copied == ['options']
+    assert hashed == [os.path.join(src, 'options')]
+    assert _read('./dst/options') == 'OPTIONS'
+
+
+def test_deletions(src):
+    _write('./dst/.git/HEAD', 'ref')
+    _write('./dst/README', 'readme')
+    mirror_dir(src, './dst')
+    os.remove('./src/l10n/DEFAULT/dictionary')
+    report = mirror_dir(src, './dst')
+    assert report.files_deleted == ['l10n/DEFAULT/dictionary']
+    assert not os.path.exists('./dst/l10n')
+    assert _read('./dst/.git/HEAD') == 'ref'
+    assert _read('./dst/README') == 'readme'
+
+
+def test_ignore(src):
+    report = mirror_dir(src, './dst', ignore=['options'])
+    assert 'options' not in report.files_copied
+    assert not os.path.exists('./dst/options')
+    mirror_dir(src, './dst')
+    report = mirror_dir(src, './dst', ignore=['options'])
+    assert report.files_deleted == []
+    assert os.path.exists('./dst/options')
+
+
+def test_modified_target_is_restored(src):
+    mirror_dir(src, './dst')
+    _write('./dst/mission', 'edited by hand')
+    report = mirror_dir(src, './dst')
+    assert report.files_copied == ['mission']
+    assert _read('./dst/mission') == 'mission'
+
+
+def test_existing_identical_target_is_not_copied(src):
+    _write('./dst/mission', 'mission')
+    report = mirror_dir(src, './dst')
+    assert 'mission' not in report.files_copied
+    assert report.files_unchanged == 1
+
+
+def test_corrupt_manifest(src):
+    mirror_dir(src, './dst')
+    _write(str(manifest_path('./dst')), 'not json')
+    assert Manifest.load(manifest_path('./dst')).entries == {}
+    report = mirror_dir(src, './dst')
+    assert report.files_copied == []
+    assert report.files_unchanged == 3
@@ -1,11 +1,16 @@
 # coding=utf-8
 
+import contextlib
+import queue
+import threading
 import time
 
 import pytest
 from hypothesis import example, given, strategies as st
 
-from emft.core.threadpool import ThreadPool
+from emft.core import threadpool
+from emft.core.threadpool import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, ThreadPool, configure_executor, \
+    executors_metrics, format_executors_stats, get_executor, get_process_executor, shutdown_executors
 
 
 def sleep(t=0.1):
@@ -51,3 +56,226 @@ def test_queue_task():
     p.join_all()
     time.sleep(0.1)
     assert p.all_done()
+
+
+def test_idle_threads_exit_immediately():
+    p = ThreadPool(10, 'test_idle', False)
+    threads = list(p.threads)
+    start = time.perf_counter()
+    p.join_all()
+    assert time.perf_counter() - start < 1
+    assert not any(t.is_alive() for t in threads)
+
+
+def test_join_waits_for_running_tasks():
+    p = ThreadPool(2, 'test', False)
+    result = []
+    for i in range(4):
+        p.queue_task(lambda x: sleep(0.05) or result.append(x), [i])
+    p.join_all()
+    assert sorted(result) == [0, 1, 2, 3]
+
+
+def test_tasks_run_in_order():
+    p = ThreadPool(1, 'test', True)
+    result = []
+    for i in range(100):
+        p.queue_task(result.append, [i])
+    p.join_all()
+    assert result == list(range(100))
+
+
+def _block(p):
+    """Keeps the only thread of a pool busy until the returned event is set"""
+    gate, running = threading.Event(), threading.Event()
+    p.queue_task(lambda: running.set() or gate.wait(5))
+    assert running.wait(5)
+    return gate
+
+
+def test_submit():
+    p = ThreadPool(2, 'test', True)
+    assert p.submit(lambda x, y: x + y, [1], dict(y=2)).result(5) == 3
+    future = p.submit(lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        future.result(5)
+    p.join_all()
+    assert p.all_done()
+
+
+def test_priorities():
+    p = ThreadPool(1, 'test', True)
+    gate = _block(p)
+    result = []
+    for i, priority in enumerate([PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_HIGH]):
+        p.submit(result.append, [(priority, i)], priority=priority)
+    p.queue_task(result.append, [(PRIORITY_HIGH, 5)], _priority=PRIORITY_HIGH)
+    gate.set()
+    p.join_all()
+    assert result == [(0, 2), (0, 4), (0, 5), (10, 1), (10, 3), (20, 0)]
+
+
+def test_cancel():
+    p = ThreadPool(1, 'test', True)
+    gate = _block(p)
+    result = []
+    futures = [p.submit(result.append, [i]) for i in range(3)]
+    assert futures[1].cancel()
+    assert len(p.tasks) == 2
+    gate.set()
+    futures[2].result(5)
+    assert result == [0, 2]
+    assert not futures[2].cancel()
+    p.join_all()
+    assert p.all_done()
+
+
+def test_bounded_queue():
+    p = ThreadPool(1, 'test', True, _max_queue_size=2)
+    gate = _block(p)
+    p.submit(sleep, [0])
+    p.queue_task(sleep, [0])
+    with pytest.raises(queue.Full):
+        p.submit(sleep, [0], block=False)
+    with pytest.raises(queue.Full):
+        p.submit(sleep, [0], timeout=0.05)
+
+    threading.Timer(0.1, gate.set).start()
+    start = time.perf_counter()
+    p.submit(sleep, [0], timeout=5).result(5)
+    assert time.perf_counter() - start >= 0.05
+    p.join_all()
+
+
+def _square(x):
+    return x * x
+
+
+@pytest.fixture()
+def executors():
+    yield
+    shutdown_executors()
+
+
+def test_executors_registry(executors):
+    configure_executor('test_registry', num_threads=3, daemon=False)
+    assert 'test_registry' not in executors_metrics()
+    executor = get_executor('test_registry')
+    assert executor is get_executor('test_registry')
+    assert executor.get_thread_count() == 3
+    assert not executor.is_daemon
+    configure_executor('test_registry', num_threads=2)
+    assert executor.get_thread_count() == 2
+    assert get_executor('test_default').get_thread_count() == 1
+
+    gate = _block(get_executor('test_default'))
+    get_executor('test_default').submit(sleep, [0])
+    metrics = executors_metrics()
+    assert metrics['test_default']['queue_depth'] == 1
+    assert metrics['test_default']['active_workers'] == 1
+    gate.set()
+    get_executor('test_default').join_all()
+    metrics = executors_metrics()['test_default']
+    assert metrics['tasks_completed'] == 2
+    assert metrics['active_workers'] == 0
+    assert metrics['task_time_max'] <= metrics['task_time_total']
+
+
+def test_process_executor(executors):
+    assert list(get_process_executor(2).map(_square, range(4))) == [0, 1, 4, 9]
+    assert get_process_executor() is get_process_executor(2)
+    assert executors_metrics()['process'] == {'max_workers': 2}
+
+
+def _fail():
+    raise ValueError('nope')
+
+
+def test_task_stats():
+    p = ThreadPool(1, 'test', True)
+    gate = _block(p)
+    futures = [p.submit(sleep, [0.01]) for _ in range(4)]
+    futures.append(p.submit(_fail))
+    futures.append(p.submit(sleep, [0]))
+    assert futures[-1].cancel()
+    gate.set()
+    p.join_all()
+
+    stats = p.task_stats()
+    assert stats['sleep']['count'] == 5
+    assert stats['sleep']['cancelled'] == 1
+    assert stats['sleep']['errors'] == 0
+    assert 0.01 <= stats['sleep']['run_p50'] <= stats['sleep']['run_p95']
+    assert stats['sleep']['wait_p95'] >= stats['sleep']['wait_p50'] > 0
+    assert stats['sleep']['throughput'] > 0
+    assert stats['_fail']['errors'] == 1
+    assert stats[None]['count'] == 7
+    assert stats[None]['cancelled'] == 1
+    assert p.metrics()['tasks_completed'] == 6
+
+
+def test_task_history_is_bounded(monkeypatch):
+    monkeypatch.setattr(threadpool, 'TASK_HISTORY_SIZE', 10)
+    p = ThreadPool(1, 'test', True)
+    for _ in range(20):
+        p.queue_task(sleep, [0])
+    p.join_all()
+    assert len(p.task_history) == 10
+    assert p.task_stats()[None]['count'] == 10
+
+
+def test_percentile():
+    assert threadpool._percentile([], 50) is None
+    assert threadpool._percentile([1], 95) == 1
+    values = list(range(1, 101))
+    assert threadpool._percentile(values, 50) == 50
+    assert threadpool._percentile(values, 95) == 95
+
+
+class Sentry:
+    context = contextlib.suppress()
+
+    def __init__(self):
+        self.crumbs = []
+        self.exceptions = []
+
+    def add_crumb(self, message, category, level):
+        self.crumbs.append((message, category, level))
+
+    def captureException(self, exc_info):  # noqa: N802
+        self.exceptions.append(exc_info[0])
+
+
+def test_breadcrumbs():
+    sentry = Sentry()
+    threadpool.register_sentry(sentry, task_breadcrumbs=True)
+    try:
+        p = ThreadPool(1, 'test_crumbs', True)
+        p.submit(sleep, [0]).result(5)
+        p.submit(_fail).exception(5)
+        p.join_all()
+    finally:
+        threadpool.register_sentry(None)
+    assert [(x[1], x[2]) for x in sentry.crumbs] == [('threadpool', 'debug'), ('threadpool', 'error')]
+    assert sentry.crumbs[0][0].startswith('test_crumbs: sleep success')
+
+
+def test_submit_failures_are_reported(caplog):
+    sentry = Sentry()
+    threadpool.register_sentry(sentry)
+    try:
+        p = ThreadPool(1, 'test_report', True)
+        assert isinstance(p.submit(_fail).exception(5), ValueError)
+        p.join_all()
+    finally:
+        threadpool.register_sentry(None)
+    assert sentry.exceptions == [ValueError]
+    assert not sentry.crumbs
+    assert any('caught error in worker thread' in record.getMessage() for record in caplog.records)
+
+
+def test_format_executors_stats(executors):
+    get_executor('test_format').submit(sleep, [0]).result(5)
+    lines = format_executors_stats()
+    assert 'test_format: 1 thread(s), 0 queued, 0 running' in lines
+    assert any(line.startswith('    sleep: 1 task(s), 0 error(s)') for line in lines)